@@ -11,6 +11,7 @@ sys.path.insert(0, project_root)
 
 # Import the Base after adding project root to path
 from models import Base
+from config import DB_URL
 
 # this is the Alembic Config object
 config = context.config
@@ -19,6 +20,9 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+# Las migraciones usan la misma base que la API (driver síncrono)
+config.set_main_option("sqlalchemy.url", DB_URL)
+
 target_metadata = Base.metadata
 
 def run_migrations_offline() -> None:
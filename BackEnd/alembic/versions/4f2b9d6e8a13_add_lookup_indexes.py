@@ -0,0 +1,60 @@
+"""add lookup indexes
+
+Revision ID: 4f2b9d6e8a13
+Revises: 8e4a6c2d1f90
+Create Date: 2026-10-18 15:02:44.118305
+
+Duplicated rows are removed before the unique keys are created (the oldest
+row is kept). If any tournament score was duplicated, run
+``python standings.py`` afterwards to rebuild the standings.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f2b9d6e8a13'
+down_revision: Union[str, None] = '8e4a6c2d1f90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        'DELETE FROM "tournamentScores" WHERE id NOT IN '
+        '(SELECT MIN(id) FROM "tournamentScores" GROUP BY tournament_id, player_id)'
+    )
+    op.create_index('uq_tournamentScores_tournament_player', 'tournamentScores',
+                    ['tournament_id', 'player_id'], unique=True)
+    op.create_index('ix_matches_tournament_status', 'matches', ['tournament_id', 'status'])
+    op.create_index('ix_matches_tournament_phase', 'matches', ['tournament_id', 'phase'])
+
+    # SQLite no puede añadir una clave primaria: batch recrea la tabla
+    op.execute(
+        'DELETE FROM "tournamentsPlayers" WHERE tournament_id IS NULL OR player_id IS NULL '
+        'OR rowid NOT IN (SELECT MIN(rowid) FROM "tournamentsPlayers" GROUP BY tournament_id, player_id)'
+    )
+    with op.batch_alter_table('tournamentsPlayers', recreate='always') as batch_op:
+        batch_op.alter_column('tournament_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.alter_column('player_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_primary_key('pk_tournamentsPlayers', ['tournament_id', 'player_id'])
+    op.create_index('ix_tournamentsPlayers_player_id', 'tournamentsPlayers', ['player_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tournamentsPlayers_player_id', table_name='tournamentsPlayers')
+    # SQLite no refleja el nombre de la clave primaria: se recrea con la definición anterior
+    previous = sa.Table(
+        'tournamentsPlayers', sa.MetaData(),
+        sa.Column('tournament_id', sa.Integer(), sa.ForeignKey('tournament.id')),
+        sa.Column('player_id', sa.Integer(), sa.ForeignKey('players.id')),
+    )
+    with op.batch_alter_table('tournamentsPlayers', copy_from=previous, recreate='always'):
+        pass
+    op.drop_index('ix_matches_tournament_phase', table_name='matches')
+    op.drop_index('ix_matches_tournament_status', table_name='matches')
+    op.drop_index('uq_tournamentScores_tournament_player', table_name='tournamentScores')
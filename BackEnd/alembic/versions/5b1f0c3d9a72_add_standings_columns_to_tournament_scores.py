@@ -0,0 +1,40 @@
+"""add standings columns to tournament scores
+
+Revision ID: 5b1f0c3d9a72
+Revises: 27f076abf8d4
+Create Date: 2026-10-18 10:12:41.318204
+
+Existing results are not replayed here; run ``python standings.py`` once
+after upgrading to backfill wins/draws/losses, Buchholz and positions.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1f0c3d9a72'
+down_revision: Union[str, None] = '27f076abf8d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('tournamentScores') as batch_op:
+        batch_op.add_column(sa.Column('wins', sa.Integer(), server_default='0', nullable=True))
+        batch_op.add_column(sa.Column('draws', sa.Integer(), server_default='0', nullable=True))
+        batch_op.add_column(sa.Column('losses', sa.Integer(), server_default='0', nullable=True))
+        batch_op.add_column(sa.Column('buchholz', sa.Integer(), server_default='0', nullable=True))
+        batch_op.add_column(sa.Column('position', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('tournamentScores') as batch_op:
+        batch_op.drop_column('position')
+        batch_op.drop_column('buchholz')
+        batch_op.drop_column('losses')
+        batch_op.drop_column('draws')
+        batch_op.drop_column('wins')
@@ -0,0 +1,30 @@
+"""add version to tournament
+
+Revision ID: 8e4a6c2d1f90
+Revises: 5b1f0c3d9a72
+Create Date: 2026-10-18 14:40:07.512930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4a6c2d1f90'
+down_revision: Union[str, None] = '5b1f0c3d9a72'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('tournament') as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('tournament') as batch_op:
+        batch_op.drop_column('version')
@@ -0,0 +1,38 @@
+"""add idempotency keys
+
+Revision ID: a2c4e6f8b1d3
+Revises: f1b3d5e7a9c2
+Create Date: 2026-10-18 21:04:18.662950
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2c4e6f8b1d3'
+down_revision: Union[str, None] = 'f1b3d5e7a9c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'idempotencyKeys',
+        sa.Column('key', sa.String(length=128), nullable=False),
+        sa.Column('request', sa.String(length=255), nullable=False),
+        sa.Column('status_code', sa.Integer(), nullable=True),
+        sa.Column('body', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('key'),
+    )
+    op.create_index('ix_idempotencyKeys_created_at', 'idempotencyKeys', ['created_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_idempotencyKeys_created_at', table_name='idempotencyKeys')
+    op.drop_table('idempotencyKeys')
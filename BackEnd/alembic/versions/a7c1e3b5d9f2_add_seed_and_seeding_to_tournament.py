@@ -0,0 +1,34 @@
+"""add seed and seeding to tournament
+
+Revision ID: a7c1e3b5d9f2
+Revises: 4f2b9d6e8a13
+Create Date: 2026-10-18 15:41:26.730114
+
+Existing tournaments keep seed NULL; one is drawn and stored the first time
+their matches are generated.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c1e3b5d9f2'
+down_revision: Union[str, None] = '4f2b9d6e8a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('tournament') as batch_op:
+        batch_op.add_column(sa.Column('seed', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('seeding', sa.String(length=20), server_default='random', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('tournament') as batch_op:
+        batch_op.drop_column('seeding')
+        batch_op.drop_column('seed')
@@ -0,0 +1,42 @@
+"""add player stats
+
+Revision ID: b8f4e6a1c3d5
+Revises: e5a9b2c4d6f8
+Create Date: 2026-10-18 17:48:09.215736
+
+The table starts empty; run ``python playerStats.py`` afterwards to fill it
+from the existing matches and finished tournaments.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8f4e6a1c3d5'
+down_revision: Union[str, None] = 'e5a9b2c4d6f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'playerStats',
+        sa.Column('player_id', sa.Integer(), nullable=False),
+        sa.Column('wins', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('draws', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('losses', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('tournaments_played', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('first_places', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('second_places', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('third_places', sa.Integer(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['player_id'], ['players.id']),
+        sa.PrimaryKeyConstraint('player_id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('playerStats')
@@ -0,0 +1,37 @@
+"""add bracket links to matches
+
+Revision ID: c3d8f1a2b7e4
+Revises: a7c1e3b5d9f2
+Create Date: 2026-10-18 16:20:37.402915
+
+Elimination tournaments generated before this revision keep both columns
+NULL and still get their next round from POST /tournament/{id}/next-phase.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d8f1a2b7e4'
+down_revision: Union[str, None] = 'a7c1e3b5d9f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('matches') as batch_op:
+        batch_op.add_column(sa.Column('bracket_slot', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('next_match_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_matches_next_match_id_matches', 'matches',
+                                    ['next_match_id'], ['id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('matches') as batch_op:
+        batch_op.drop_constraint('fk_matches_next_match_id_matches', type_='foreignkey')
+        batch_op.drop_column('next_match_id')
+        batch_op.drop_column('bracket_slot')
@@ -0,0 +1,28 @@
+"""add player name index
+
+Revision ID: d4e6f8a0b2c1
+Revises: b8f4e6a1c3d5
+Create Date: 2026-10-18 19:12:37.504188
+
+Roster imports look players up by exact name.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e6f8a0b2c1'
+down_revision: Union[str, None] = 'b8f4e6a1c3d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_players_name', 'players', ['name'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_players_name', table_name='players')
@@ -0,0 +1,32 @@
+"""add rating to players
+
+Revision ID: e5a9b2c4d6f8
+Revises: c3d8f1a2b7e4
+Create Date: 2026-10-18 17:05:12.584301
+
+Every player starts at 1500; run ``python rating.py`` afterwards to rate
+the existing match history.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a9b2c4d6f8'
+down_revision: Union[str, None] = 'c3d8f1a2b7e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('players') as batch_op:
+        batch_op.add_column(sa.Column('rating', sa.Float(), server_default='1500', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('players') as batch_op:
+        batch_op.drop_column('rating')
@@ -0,0 +1,53 @@
+"""add jobs
+
+Revision ID: f1b3d5e7a9c2
+Revises: d4e6f8a0b2c1
+Create Date: 2026-10-18 20:26:51.730412
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b3d5e7a9c2'
+down_revision: Union[str, None] = 'd4e6f8a0b2c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'jobs',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('kind', sa.String(length=32), nullable=False),
+        sa.Column('tournament_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('progress', sa.Integer(), nullable=False),
+        sa.Column('stage', sa.String(length=32), nullable=True),
+        sa.Column('result', sa.Text(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('error_status', sa.Integer(), nullable=True),
+        sa.Column('idempotency_key', sa.String(length=128), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('idempotency_key'),
+    )
+    op.create_index('ix_jobs_id', 'jobs', ['id'])
+    op.create_index('ix_jobs_status', 'jobs', ['status', 'id'])
+    op.create_index('uq_jobs_active', 'jobs', ['kind', 'tournament_id'], unique=True,
+                    sqlite_where=sa.text("status IN ('queued', 'running')"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_jobs_active', table_name='jobs')
+    op.drop_index('ix_jobs_status', table_name='jobs')
+    op.drop_index('ix_jobs_id', table_name='jobs')
+    op.drop_table('jobs')
@@ -0,0 +1,87 @@
+"""Check-in benchmark: one request per player versus a streamed roster import.
+
+For each roster size, creates and registers the players of a fresh tournament
+the old way (POST /player plus POST /tournament/{id}/player/{player}, two
+round trips per player) and with a single CSV upload to
+POST /tournament/{id}/import, sent in small chunks, and counts the SQL
+statements of each. Both end with the same roster and standings.
+
+Usage (from BackEnd/):
+    python benchmarks/bulkImport.py --sizes 100 600 5000
+"""
+import argparse
+import asyncio
+import time
+
+import common
+from sqlalchemy import event, func, select  # noqa: E402
+
+from main import app  # noqa: E402
+from models import Players, SessionLocal  # noqa: E402
+
+CHUNK = 4096
+
+
+class Counter:
+    def __init__(self):
+        self.statements = 0
+
+    def __call__(self, *args):
+        self.statements += 1
+
+
+async def perRequest(client, tournament_id: int, names, firstId: int) -> None:
+    # Único cliente: los jugadores reciben ids consecutivos
+    for name in names:
+        await client.post("/player", json={"name": name})
+    for player_id in range(firstId, firstId + len(names)):
+        await client.post(f"/tournament/{tournament_id}/player/{player_id}")
+
+
+async def imported(client, tournament_id: int, names) -> dict:
+    body = ("name\n" + "".join(f"{name}\n" for name in names)).encode()
+
+    async def chunks():
+        for start in range(0, len(body), CHUNK):
+            yield body[start:start + CHUNK]
+
+    res = await client.post(f"/tournament/{tournament_id}/import", content=chunks(),
+                            headers={"content-type": "text/csv"})
+    res.raise_for_status()
+    return res.json()
+
+
+async def timed(call, *args):
+    counter = Counter()
+    event.listen(common.engine.sync_engine, "before_cursor_execute", counter)
+    start = time.perf_counter()
+    result = await call(*args)
+    elapsed = time.perf_counter() - start
+    event.remove(common.engine.sync_engine, "before_cursor_execute", counter)
+    return elapsed, counter.statements, result
+
+
+async def main(args):
+    print(f"{'players':>8} {'requests s':>11} {'req sql':>8} {'import s':>9} {'imp sql':>8} {'speedup':>8}")
+    async with common.asgiClient(app) as client:
+        for run, size in enumerate(args.sizes):
+            tids = []
+            for kind in ("per-request", "import"):
+                res = await client.post("/tournament", json={"name": f"{kind} {size}", "type": "swiss"})
+                tids.append(res.json()["id"])
+            async with SessionLocal() as db:
+                firstId = (await db.scalar(select(func.max(Players.id))) or 0) + 1
+            oldS, oldSql, _ = await timed(perRequest, client, tids[0],
+                                          [f"Old {run}-{i}" for i in range(size)], firstId)
+            newS, newSql, report = await timed(imported, client, tids[1],
+                                               [f"New {run}-{i}" for i in range(size)])
+            assert report["registered"] == size and not report["errors"], report
+            print(f"{size:>8} {oldS:>11.2f} {oldSql:>8} {newS:>9.2f} {newSql:>8} {oldS / newS:>7.1f}x")
+    await common.engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 600, 5000])
+    common.createSchema()
+    asyncio.run(main(parser.parse_args()))
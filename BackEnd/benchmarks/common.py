@@ -0,0 +1,100 @@
+"""Shared setup for the benchmark scripts.
+
+Importing this module points DB_URL at a fresh temporary SQLite file and puts
+BackEnd/ on sys.path, so it must be imported before models/main.
+"""
+import asyncio
+import math
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime
+from typing import List
+
+_tmpdir = tempfile.mkdtemp(prefix="magic-bench-")
+os.environ.setdefault("DB_URL", f"sqlite:///{os.path.join(_tmpdir, 'bench.sqlite')}")
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import httpx  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from models import (Matches, Players, SessionLocal, Tournament, TournamentScores,  # noqa: E402
+                    engine, init_db, tournamentsPlayers)
+
+# Filas por INSERT al generar datos
+GENERATE_CHUNK = 5000
+
+
+def createSchema() -> None:
+    """Create the tables and release the connections opened on this event loop"""
+    async def _create():
+        await init_db()
+        await engine.dispose()
+    asyncio.run(_create())
+
+
+def asgiClient(app) -> httpx.AsyncClient:
+    """In-process HTTP client that talks to the ASGI app without a socket"""
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+
+
+async def seed(client: httpx.AsyncClient, players: int, tournaments: int,
+               tournament_type: str = "roundRobin") -> None:
+    """Create players and tournaments through the API, spreading players across tournaments"""
+    for i in range(players):
+        await client.post("/player", json={"name": f"Player {i}"})
+    for t in range(tournaments):
+        await client.post("/tournament", json={"name": f"Tournament {t}", "type": tournament_type})
+        for p in range(1 + t, players + 1, tournaments):
+            await client.post(f"/tournament/{t + 1}/player/{p}")
+
+
+async def generateData(players: int, tournaments: int, matches: int, roster: int = 32,
+                       seed: int = 1) -> None:
+    """Bulk insert players, tournaments with `roster` registered players each, and
+    `matches` finished matches spread over them, without going through the API.
+
+    Scores rows exist for every registration but their counters stay at zero.
+    """
+    rng = random.Random(seed)
+    now = datetime.now()
+    types = ("roundRobin", "elimination", "swiss")
+    roster = min(roster, players)
+
+    async def bulk(table, rows):
+        for start in range(0, len(rows), GENERATE_CHUNK):
+            await db.execute(insert(table), rows[start:start + GENERATE_CHUNK])
+
+    async with SessionLocal() as db:
+        await bulk(Players, [{"name": f"Player {i}", "creationDate": now, "personalScore": 0}
+                             for i in range(1, players + 1)])
+        await bulk(Tournament, [{"name": f"Tournament {t}", "type": types[t % 3], "creationDate": now,
+                                 "status": False, "currentPhase": 1, "seed": t}
+                                for t in range(1, tournaments + 1)])
+        rosters = {t: rng.sample(range(1, players + 1), roster) for t in range(1, tournaments + 1)}
+        await bulk(tournamentsPlayers, [{"tournament_id": t, "player_id": p}
+                                        for t, ids in rosters.items() for p in ids])
+        await bulk(TournamentScores, [{"tournament_id": t, "player_id": p, "score": 0}
+                                      for t, ids in rosters.items() for p in ids])
+        rows = []
+        for i in range(matches):
+            t = i % tournaments + 1
+            p1, p2 = rng.sample(rosters[t], 2)
+            draw = rng.random() < 0.1
+            rows.append({"tournament_id": t, "player1_id": p1, "player2_id": p2,
+                         "win": -1 if draw else rng.choice((p1, p2)), "status": True,
+                         "draw": draw, "phase": i // tournaments + 1})
+        await bulk(Matches, rows)
+        await db.commit()
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
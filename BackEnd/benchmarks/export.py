@@ -0,0 +1,98 @@
+"""Export benchmark: throughput and peak memory of GET /export/matches by history size.
+
+Generates players and tournaments (common.generateData), then for each size
+adds finished matches to the temporary SQLite database until it holds that
+many and downloads the whole NDJSON or CSV export from the ASGI app, dropping
+each chunk as it arrives (httpx's ASGITransport would keep the whole body).
+Reports rows per second and the peak resident memory of the process, which
+should not grow with the history.
+
+Usage (from BackEnd/):
+    python benchmarks/export.py --matches 10000 100000 1000000 --format csv
+"""
+import argparse
+import asyncio
+import os
+import random
+import resource
+import sqlite3
+import time
+
+import common
+
+from main import app  # noqa: E402
+
+
+def addMatches(count: int, players: int, tournaments: int, rng: random.Random) -> None:
+    path = os.environ["DB_URL"].replace("sqlite:///", "", 1)
+
+    def rows():
+        # Generador: la carga tampoco debe subir el pico de memoria medido
+        for _ in range(count):
+            p1, p2 = rng.sample(range(1, players + 1), 2)
+            yield rng.randrange(1, tournaments + 1), p1, p2, rng.choice((p1, p2))
+
+    with sqlite3.connect(path) as conn:
+        conn.executemany(
+            "INSERT INTO matches (tournament_id, player1_id, player2_id, win, status, draw, phase) "
+            "VALUES (?, ?, ?, ?, 1, 0, 1)", rows())
+
+
+async def download(fmt: str):
+    """Call the endpoint like a server would and count what it sends"""
+    sent = {"lines": 0, "size": 0, "status": None}
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+             "scheme": "http", "path": "/export/matches", "raw_path": b"/export/matches",
+             "query_string": f"format={fmt}".encode(), "root_path": "", "headers": [],
+             "client": ("bench", 1), "server": ("bench", 80)}
+
+    requested = asyncio.Event()
+
+    async def receive():
+        # Primero la petición; después el cliente sigue conectado hasta el final
+        if requested.is_set():
+            await asyncio.Event().wait()
+        requested.set()
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            sent["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            sent["lines"] += message.get("body", b"").count(b"\n")
+            sent["size"] += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    assert sent["status"] == 200, sent
+    return sent["lines"], sent["size"]
+
+
+async def main(args):
+    print(f"{'matches':>9} {'seconds':>8} {'rows/s':>9} {'MB sent':>8} {'peak RSS MB':>12}")
+    rng = random.Random(args.seed)
+    await common.generateData(args.players, args.tournaments, 0, seed=args.seed)
+    loaded = 0
+    for target in sorted(args.matches):
+        # El historial crece de forma acumulada entre tamaños
+        addMatches(target - loaded, args.players, args.tournaments, rng)
+        loaded = target
+        start = time.perf_counter()
+        lines, size = await download(args.format)
+        elapsed = time.perf_counter() - start
+        # Máximo del proceso (KB en Linux): solo sube si la exportación crece con el historial
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        rows = lines - (args.format == "csv")
+        assert rows == target, (rows, target)
+        print(f"{target:>9} {elapsed:>8.2f} {rows / elapsed:>9.0f} {size / 2 ** 20:>8.1f} {peak:>12.1f}")
+    await common.engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--matches", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--tournaments", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1)
+    common.createSchema()
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,190 @@
+"""Benchmark harness: full tournament scenarios at several concurrency levels.
+
+Generates players, tournaments and finished matches straight into a
+temporary SQLite database (common.generateData), then every virtual user
+plays whole tournaments through the real endpoints of main.py over an
+in-process ASGI client: create, register, generate_matches, results with
+setWinner, next-phase, finish, plus the reads a spectator would make.
+Latency is recorded per endpoint and the report is written as JSON, so two
+commits can be compared with --baseline.
+
+Usage (from BackEnd/):
+    python benchmarks/harness.py --concurrency 1 4 16 --json after.json
+    python benchmarks/harness.py --concurrency 1 4 16 --baseline before.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+import common
+
+from main import app
+
+TYPES = ("elimination", "swiss", "roundRobin")
+
+
+class Recorder:
+    """Latency samples (ms) and error count per endpoint"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def call(self, client, op: str, method: str, url: str, **kwargs):
+        start = time.perf_counter()
+        res = await client.request(method, url, **kwargs)
+        self.samples[op].append((time.perf_counter() - start) * 1000)
+        if res.status_code >= 400:
+            self.errors[op] += 1
+        return res
+
+    def report(self) -> Dict[str, dict]:
+        return {
+            op: {
+                "count": len(samples),
+                "errors": self.errors[op],
+                "mean_ms": sum(samples) / len(samples),
+                "p50_ms": common.percentile(samples, 50),
+                "p90_ms": common.percentile(samples, 90),
+                "p99_ms": common.percentile(samples, 99),
+                "max_ms": max(samples),
+            }
+            for op, samples in sorted(self.samples.items())
+        }
+
+
+async def playTournament(client, rec: Recorder, rng: random.Random, players: int, size: int, kind: str):
+    res = await rec.call(client, "POST /tournament", "POST", "/tournament",
+                         json={"name": f"Bench {kind}", "type": kind, "seed": rng.randrange(1, 2 ** 31)})
+    tid = res.json()["id"]
+    roster = rng.sample(range(1, players + 1), size)
+    for pid in roster:
+        await rec.call(client, "POST /tournament/{id}/player/{pid}", "POST", f"/tournament/{tid}/player/{pid}")
+    await rec.call(client, "POST /tournament/{id}/generate_matches", "POST", f"/tournament/{tid}/generate_matches")
+
+    while True:
+        tournament = (await rec.call(client, "GET /tournament/{id}", "GET", f"/tournament/{tid}")).json()
+        pending = [m for m in tournament["matches"]
+                   if not m["status"] and m["player1_id"] and m["player2_id"]]
+        if pending:
+            phase = min(m["phase"] for m in pending)
+            for match in (m for m in pending if m["phase"] == phase):
+                await rec.call(client, "GET /match/{id}", "GET", f"/match/{match['id']}")
+                winner = rng.choice((match["player1_id"], match["player2_id"]))
+                draw = "true" if kind != "elimination" and rng.random() < 0.1 else "false"
+                await rec.call(client, "POST /match/{id}/{winner}/{draw}", "POST",
+                               f"/match/{match['id']}/{winner}/{draw}")
+            await rec.call(client, "GET /tournament/{id}/standings", "GET", f"/tournament/{tid}/standings")
+            if kind == "roundRobin":
+                continue
+        if kind == "roundRobin":
+            break
+        res = await rec.call(client, "POST /tournament/{id}/next-phase", "POST", f"/tournament/{tid}/next-phase")
+        if "No es posible" in res.text or res.status_code >= 400:
+            break
+
+    await rec.call(client, "POST /tournament/{id}/finish", "POST", f"/tournament/{tid}/finish")
+    for pid in roster[:4]:
+        await rec.call(client, "GET /player/{id}", "GET", f"/player/{pid}")
+        await rec.call(client, "GET /player/{id}/stats", "GET", f"/player/{pid}/stats")
+
+
+async def user(client, rec: Recorder, seed: int, args) -> None:
+    rng = random.Random(seed)
+    for event in range(args.events):
+        await playTournament(client, rec, rng, args.players, args.size, TYPES[(seed + event) % len(TYPES)])
+
+
+async def run(client, concurrency: int, args) -> dict:
+    rec = Recorder()
+    start = time.perf_counter()
+    await asyncio.gather(*(user(client, rec, concurrency * 1000 + u, args) for u in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    operations = rec.report()
+    requests = sum(op["count"] for op in operations.values())
+    return {
+        "concurrency": concurrency,
+        "tournaments": concurrency * args.events,
+        "requests": requests,
+        "seconds": elapsed,
+        "rps": requests / elapsed,
+        "errors": sum(op["errors"] for op in operations.values()),
+        "operations": operations,
+    }
+
+
+def gitCommit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def printRun(r: dict, baseline: dict = None) -> None:
+    print(f"\nconcurrency {r['concurrency']}: {r['requests']} requests in {r['seconds']:.2f}s, "
+          f"{r['rps']:.1f} req/s, {r['errors']} errors"
+          + (f" (baseline {baseline['rps']:.1f} req/s)" if baseline else ""))
+    print(f"{'endpoint':<42} {'count':>6} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}"
+          + (f" {'p50 x':>7} {'p99 x':>7}" if baseline else ""))
+    for op, s in r["operations"].items():
+        line = f"{op:<42} {s['count']:>6} {s['p50_ms']:>8.1f} {s['p99_ms']:>8.1f} {s['errors']:>7}"
+        old = baseline["operations"].get(op) if baseline else None
+        if old:
+            # Más de 1: más lento que la referencia
+            line += f" {s['p50_ms'] / old['p50_ms']:>7.2f} {s['p99_ms'] / old['p99_ms']:>7.2f}"
+        print(line)
+
+
+async def main(args):
+    start = time.perf_counter()
+    await common.generateData(args.players, args.tournaments, args.matches, seed=args.seed)
+    generated = time.perf_counter() - start
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {r["concurrency"]: r for r in json.load(f)["runs"]}
+
+    runs = []
+    async with common.asgiClient(app) as client:
+        for concurrency in args.concurrency:
+            r = await run(client, concurrency, args)
+            runs.append(r)
+            printRun(r, baseline.get(concurrency))
+    await common.engine.dispose()
+
+    report = {
+        "config": vars(args),
+        "environment": {"commit": gitCommit(), "python": platform.python_version(),
+                        "platform": platform.platform()},
+        "data": {"players": args.players, "tournaments": args.tournaments,
+                 "matches": args.matches, "generate_seconds": generated},
+        "runs": runs,
+    }
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=1000, help="players generated")
+    parser.add_argument("--tournaments", type=int, default=100, help="tournaments generated")
+    parser.add_argument("--matches", type=int, default=20000, help="finished matches generated")
+    parser.add_argument("--size", type=int, default=16, help="players per scenario tournament")
+    parser.add_argument("--events", type=int, default=2, help="tournaments played by each user")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--baseline", help="report of a previous run to compare against")
+    args = parser.parse_args()
+
+    common.createSchema()
+    asyncio.run(main(args))
@@ -0,0 +1,150 @@
+"""Index benchmark: query plans and latency of the hot lookups, without and with the composite indexes.
+
+Seeds a temporary SQLite database with --matches matches spread over
+--tournaments tournaments, then runs the lookups behind setWinner,
+add/removePlayerFromTournament, finishTournament and next_phase twice: first
+on the old schema (single-column indexes, tournamentsPlayers without a key),
+then after creating the indexes added by migration 4f2b9d6e8a13. For each
+lookup it prints the EXPLAIN QUERY PLAN detail and the median latency.
+
+Usage (from BackEnd/):
+    python benchmarks/indexes.py --matches 1000000 --tournaments 20
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import time
+
+import common
+from sqlalchemy import create_engine  # noqa: E402
+
+from models import Base  # noqa: E402
+
+NEW_INDEXES = [
+    'CREATE UNIQUE INDEX "uq_tournamentScores_tournament_player" ON "tournamentScores" (tournament_id, player_id)',
+    'CREATE INDEX ix_matches_tournament_status ON matches (tournament_id, status)',
+    'CREATE INDEX ix_matches_tournament_phase ON matches (tournament_id, phase)',
+    'CREATE INDEX "ix_tournamentsPlayers_player_id" ON "tournamentsPlayers" (player_id)',
+]
+
+# (nombre, SQL, generador de parámetros)
+LOOKUPS = [
+    ("score of a player (setWinner)",
+     'SELECT id, score FROM "tournamentScores" WHERE tournament_id = ? AND player_id = ?', "tp"),
+    ("membership (addPlayer)",
+     'SELECT 1 FROM "tournamentsPlayers" WHERE tournament_id = ? AND player_id = ?', "tp"),
+    ("tournaments of a player",
+     'SELECT tournament_id FROM "tournamentsPlayers" WHERE player_id = ?', "p"),
+    ("unfinished matches (finish)",
+     'SELECT count(id) FROM matches WHERE tournament_id = ? AND status = 0', "t"),
+    ("matches of a phase (next_phase)",
+     'SELECT id, player1_id, player2_id, win, draw FROM matches WHERE tournament_id = ? AND phase = ?', "tf"),
+]
+
+
+def createOldSchema(conn: sqlite3.Connection) -> None:
+    """Current tables minus the new indexes, with the association table as it used to be"""
+    engine = create_engine(f"sqlite:///{conn.execute('PRAGMA database_list').fetchone()[2]}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    for name in ("uq_tournamentScores_tournament_player", "ix_matches_tournament_status",
+                 "ix_matches_tournament_phase", "ix_tournamentsPlayers_player_id"):
+        conn.execute(f'DROP INDEX "{name}"')
+    conn.execute('DROP TABLE "tournamentsPlayers"')
+    conn.execute('CREATE TABLE "tournamentsPlayers" (tournament_id INTEGER REFERENCES tournament (id), '
+                 'player_id INTEGER REFERENCES players (id))')
+
+
+def addKeys(conn: sqlite3.Connection) -> None:
+    conn.executescript(
+        'CREATE TABLE tp_new (tournament_id INTEGER NOT NULL REFERENCES tournament (id), '
+        'player_id INTEGER NOT NULL REFERENCES players (id), PRIMARY KEY (tournament_id, player_id));'
+        'INSERT INTO tp_new SELECT tournament_id, player_id FROM "tournamentsPlayers";'
+        'DROP TABLE "tournamentsPlayers"; ALTER TABLE tp_new RENAME TO "tournamentsPlayers";'
+    )
+    for ddl in NEW_INDEXES:
+        conn.execute(ddl)
+    conn.execute("ANALYZE")
+
+
+def seed(conn: sqlite3.Connection, matches: int, tournaments: int, roster: int, rng: random.Random) -> int:
+    players = roster * 4
+    phases = 10
+    conn.executemany("INSERT INTO players (id, name, personalScore) VALUES (?, ?, 0)",
+                     ((p, f"Player {p}") for p in range(1, players + 1)))
+    conn.executemany("INSERT INTO tournament (id, name, type, status, version) VALUES (?, ?, 'roundRobin', 0, 1)",
+                     ((t, f"Tournament {t}") for t in range(1, tournaments + 1)))
+    for t in range(1, tournaments + 1):
+        members = rng.sample(range(1, players + 1), roster)
+        conn.executemany('INSERT INTO "tournamentsPlayers" VALUES (?, ?)', ((t, p) for p in members))
+        conn.executemany('INSERT INTO "tournamentScores" (tournament_id, player_id, score) VALUES (?, ?, 0)',
+                         ((t, p) for p in members))
+
+    def rows():
+        for i in range(matches):
+            status = rng.random() < 0.9
+            yield (rng.randint(1, tournaments), rng.randint(1, players), rng.randint(1, players),
+                   -1, status, False, rng.randint(1, phases))
+    conn.executemany("INSERT INTO matches (tournament_id, player1_id, player2_id, win, status, draw, phase) "
+                     "VALUES (?, ?, ?, ?, ?, ?, ?)", rows())
+    conn.commit()
+    conn.execute("ANALYZE")
+    return players
+
+
+def params(kind: str, tournaments: int, players: int, rng: random.Random):
+    values = {"t": rng.randint(1, tournaments), "p": rng.randint(1, players), "f": rng.randint(1, 10)}
+    if kind == "tp":
+        return values["t"], values["p"]
+    return tuple(values[k] for k in kind)
+
+
+def measure(conn, tournaments: int, players: int, samples: int, seed: int):
+    results = {}
+    for name, sql, kind in LOOKUPS:
+        rng = random.Random(seed)
+        plan = "; ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql,
+                                                        params(kind, tournaments, players, rng)))
+        timings = []
+        for _ in range(samples):
+            args = params(kind, tournaments, players, rng)
+            start = time.perf_counter()
+            conn.execute(sql, args).fetchall()
+            timings.append(time.perf_counter() - start)
+        results[name] = (plan, statistics.median(timings) * 1000)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--matches", type=int, default=1_000_000)
+    parser.add_argument("--tournaments", type=int, default=20)
+    parser.add_argument("--roster", type=int, default=1000, help="players registered per tournament")
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    path = os.environ["DB_URL"].replace("sqlite:///", "", 1)
+    conn = sqlite3.connect(path)
+    createOldSchema(conn)
+    start = time.perf_counter()
+    players = seed(conn, args.matches, args.tournaments, args.roster, random.Random(args.seed))
+    print(f"seeded {args.matches} matches in {time.perf_counter() - start:.1f}s\n")
+
+    before = measure(conn, args.tournaments, players, args.samples, args.seed)
+    addKeys(conn)
+    after = measure(conn, args.tournaments, players, args.samples, args.seed)
+    conn.close()
+
+    for name, _, _ in LOOKUPS:
+        (planBefore, msBefore), (planAfter, msAfter) = before[name], after[name]
+        print(f"{name}")
+        print(f"  before {msBefore:9.3f} ms  {planBefore}")
+        print(f"  after  {msAfter:9.3f} ms  {planAfter}")
+        print(f"  speedup {msBefore / msAfter:7.1f}x\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Latency under concurrency: p50/p99 at 50-500 concurrent connections.
+
+Every connection loops over a mix of cheap reads (/player/{id}, /match/{id})
+and the heavy /tournament listing. When the endpoints block the event loop,
+one slow listing delays every other request and p99 grows with concurrency;
+with the async database layer the cheap reads keep a low p50.
+
+Run it on two commits to compare before/after:
+    python benchmarks/latency.py --concurrency 50 100 250 500 --json after.json
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import common
+
+from main import app
+
+
+async def connection(client, requests: int, samples: list, errors: list) -> None:
+    for i in range(requests):
+        if i % 10 == 0:
+            path = "/tournament"
+        elif i % 2:
+            path = f"/player/{i % 50 + 1}"
+        else:
+            path = f"/match/{i % 50 + 1}"
+        start = time.perf_counter()
+        res = await client.get(path)
+        samples.append((time.perf_counter() - start) * 1000)
+        if res.status_code >= 500:
+            errors.append(path)
+
+
+async def run(client, concurrency: int, requests: int) -> dict:
+    samples, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(connection(client, requests, samples, errors) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        "concurrency": concurrency,
+        "requests": len(samples),
+        "rps": len(samples) / elapsed,
+        "p50_ms": common.percentile(samples, 50),
+        "p99_ms": common.percentile(samples, 99),
+        "errors": len(errors),
+    }
+
+
+async def main(args):
+    results = []
+    async with common.asgiClient(app) as client:
+        await common.seed(client, args.players, args.tournaments)
+        for t in range(1, args.tournaments + 1):
+            await client.post(f"/tournament/{t}/generate_matches")
+
+        print(f"{'conns':>6} {'requests':>9} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>9} {'errors':>7}")
+        for concurrency in args.concurrency:
+            r = await run(client, concurrency, args.requests)
+            results.append(r)
+            print(f"{r['concurrency']:>6} {r['requests']:>9} {r['rps']:>8.1f} "
+                  f"{r['p50_ms']:>8.1f} {r['p99_ms']:>9.1f} {r['errors']:>7}")
+    await common.engine.dispose()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--tournaments", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=20, help="requests per connection")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 100, 250, 500])
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    common.createSchema()
+    asyncio.run(main(args))
@@ -0,0 +1,60 @@
+"""Load test: request throughput with 1..N concurrent clients.
+
+Seeds a temporary SQLite database and drives the real endpoints in main.py
+from several concurrent clients. With a session per request and a pooled
+engine, requests no longer queue behind a single shared session, so
+throughput should grow with the number of clients until the CPU saturates.
+
+Usage (from BackEnd/):
+    python benchmarks/loadTest.py --players 200 --tournaments 20 --requests 200
+"""
+import argparse
+import asyncio
+import time
+
+import common
+
+from main import app
+
+
+async def worker(client, requests: int, tournaments: int, errors: list) -> None:
+    for i in range(requests):
+        if i % 2:
+            res = await client.get(f"/tournament/{i % tournaments + 1}")
+        else:
+            res = await client.get(f"/player/{i + 1}")
+        if res.status_code >= 500:
+            errors.append(res.status_code)
+
+
+async def run(client, clients: int, requests: int, tournaments: int) -> dict:
+    errors = []
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(client, requests, tournaments, errors) for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    total = clients * requests
+    return {"clients": clients, "requests": total, "seconds": elapsed,
+            "rps": total / elapsed, "errors": len(errors)}
+
+
+async def main(args):
+    async with common.asgiClient(app) as client:
+        await common.seed(client, args.players, args.tournaments)
+
+        print(f"{'clients':>8} {'requests':>9} {'seconds':>8} {'req/s':>9} {'errors':>7}")
+        for clients in args.clients:
+            r = await run(client, clients, args.requests, args.tournaments)
+            print(f"{r['clients']:>8} {r['requests']:>9} {r['seconds']:>8.2f} {r['rps']:>9.1f} {r['errors']:>7}")
+    await common.engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=200)
+    parser.add_argument("--tournaments", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=200, help="requests per client")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    common.createSchema()
+    asyncio.run(main(args))
@@ -0,0 +1,71 @@
+"""Match generation benchmark: ORM add_all versus bulk INSERT ... RETURNING.
+
+For each bracket size, seeds a tournament with that many players directly in
+the database and times writing its bracket twice: once as Matches
+objects through session.add_all + flush (the previous path) and once through
+matchGeneration.insertMatches. Each run is rolled back so both measure the
+same empty table.
+
+Usage (from BackEnd/):
+    python benchmarks/matchGeneration.py --players 64 1000 10000
+"""
+import argparse
+import asyncio
+import random
+import time
+
+import common  # noqa: F401  (sets DB_URL and sys.path)
+from sqlalchemy import insert  # noqa: E402
+
+from matchGeneration import insertMatches, matchesElimination  # noqa: E402
+from models import Matches, Players, SessionLocal, Tournament, engine, init_db  # noqa: E402
+
+
+async def timeRound(rows, repeat: int):
+    """Best time of the ORM path and the bulk path for the same rows"""
+    orm, bulk = [], []
+    for _ in range(repeat):
+        async with SessionLocal() as db:
+            start = time.perf_counter()
+            db.add_all([Matches(**row) for row in rows])
+            await db.flush()
+            orm.append(time.perf_counter() - start)
+            await db.rollback()
+        async with SessionLocal() as db:
+            start = time.perf_counter()
+            await insertMatches(db, rows)
+            bulk.append(time.perf_counter() - start)
+            await db.rollback()
+    return min(orm), min(bulk)
+
+
+async def run(sizes, repeat: int, seed: int):
+    await init_db()
+    rng = random.Random(seed)
+    async with SessionLocal() as db:
+        await db.execute(insert(Players), [{"name": f"Player {i}"} for i in range(max(sizes))])
+        await db.execute(insert(Tournament), [{"name": "Bench", "type": "elimination"}])
+        await db.commit()
+
+    print(f"{'players':>8} {'matches':>8} {'orm ms':>8} {'bulk ms':>8} {'speedup':>8}")
+    for players in sizes:
+        roster = list(range(1, players + 1))
+        rng.shuffle(roster)
+        rows = []
+        matchesElimination(rows, roster, 1)
+        orm, bulk = await timeRound(rows, repeat)
+        print(f"{players:>8} {len(rows):>8} {orm * 1000:>8.1f} {bulk * 1000:>8.1f} {orm / bulk:>7.1f}x")
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, nargs="+", default=[64, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(run(args.players, args.repeat, args.seed))
+
+
+if __name__ == "__main__":
+    main()
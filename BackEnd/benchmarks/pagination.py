@@ -0,0 +1,79 @@
+"""Page latency and size of the list endpoints as the tables grow.
+
+Bulk-inserts matches and scores in steps (10^3 .. 10^6 rows by default) and,
+at every step, times the first page and a page near the end of the table for
+/matches and /scores, plus a fields= projection. With keyset pagination both
+the response size and the latency should stay flat across steps.
+
+Usage (from BackEnd/):
+    python benchmarks/pagination.py --sizes 1000 10000 100000 1000000
+"""
+import argparse
+import asyncio
+import time
+
+import common
+
+from sqlalchemy import insert
+
+from main import app
+from models import SessionLocal, Matches, TournamentScores
+
+CHUNK = 50_000
+
+
+async def grow(total: int, current: int) -> None:
+    """Insert rows until both tables hold ``total`` rows"""
+    async with SessionLocal() as db:
+        for start in range(current, total, CHUNK):
+            stop = min(start + CHUNK, total)
+            await db.execute(insert(Matches), [
+                {"tournament_id": 1, "player1_id": i % 100 + 1, "player2_id": (i + 1) % 100 + 1,
+                 "win": -1, "status": False, "draw": False, "phase": 1}
+                for i in range(start, stop)
+            ])
+            await db.execute(insert(TournamentScores), [
+                {"tournament_id": 1, "player_id": i % 100 + 1, "score": i % 7}
+                for i in range(start, stop)
+            ])
+        await db.commit()
+
+
+async def timed(client, path: str, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        res = await client.get(path)
+        samples.append((time.perf_counter() - start) * 1000)
+        res.raise_for_status()
+    return common.percentile(samples, 50), len(res.content)
+
+
+async def main(args):
+    current = 0
+    async with common.asgiClient(app) as client:
+        print(f"{'rows':>9} {'path':<55} {'p50 ms':>8} {'bytes':>8}")
+        for size in args.sizes:
+            await grow(size, current)
+            current = size
+            deep = max(size - args.limit - 1, 0)
+            for path in (
+                f"/matches?limit={args.limit}",
+                f"/matches?limit={args.limit}&cursor={deep}",
+                f"/matches?limit={args.limit}&cursor={deep}&fields=player1_id,win",
+                f"/scores?limit={args.limit}&cursor={deep}",
+            ):
+                p50, size_bytes = await timed(client, path, args.repeat)
+                print(f"{size:>9} {path:<55} {p50:>8.2f} {size_bytes:>8}")
+    await common.engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    common.createSchema()
+    asyncio.run(main(args))
@@ -0,0 +1,60 @@
+"""Query-count check: the read endpoints must not issue N+1 queries.
+
+Seeds the database in growing steps and counts the SQL statements each
+endpoint executes. Every endpoint has a fixed statement budget; if any
+request goes over it at any data size the script prints the offenders and
+exits with status 1, so it can run as a CI gate. The budgets and the
+counting live in queryBudget.py, shared with tests/test_queryCount.py.
+
+Usage (from BackEnd/):
+    python benchmarks/queryCount.py --steps 10 50 200
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+# Se miden las consultas reales, sin la caché de respuestas
+os.environ.setdefault("CACHE_ENABLED", "false")
+
+import common  # noqa: E402
+
+from main import app  # noqa: E402
+from queryBudget import BUDGETS, measure, overBudget  # noqa: E402
+
+
+async def main(args) -> int:
+    failures = []
+    created = 0
+    async with common.asgiClient(app) as client:
+        print(f"{'players':>8} " + " ".join(f"{path:>18}" for path in BUDGETS))
+        for players in args.steps:
+            # Grow the data set: new players, a tournament with matches per step
+            await common.seed(client, players - created, 0)
+            tournament_id = args.steps.index(players) + 1
+            await client.post("/tournament", json={"name": f"Step {players}", "type": "roundRobin"})
+            for p in range(1, min(players, args.roster) + 1):
+                await client.post(f"/tournament/{tournament_id}/player/{p}")
+            await client.post(f"/tournament/{tournament_id}/generate_matches")
+            created = players
+
+            counts = await measure(client)
+            print(f"{players:>8} " + " ".join(f"{counts[path]:>18}" for path in BUDGETS))
+            for path, count in overBudget(counts).items():
+                failures.append(f"{path}: {count} statements with {players} players (budget {BUDGETS[path]})")
+    await common.engine.dispose()
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, nargs="+", default=[10, 50, 200],
+                        help="total number of players at each step")
+    parser.add_argument("--roster", type=int, default=16, help="players registered per tournament")
+    args = parser.parse_args()
+
+    common.createSchema()
+    sys.exit(asyncio.run(main(args)))
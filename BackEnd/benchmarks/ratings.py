@@ -0,0 +1,91 @@
+"""Rating rebuild benchmark: vectorized Elo replay versus a game-by-game loop.
+
+Draws a random match history, replays it with rating.replayElo and checks
+the result against rating.eloUpdate applied one game at a time (only up to
+--check games, the loop is slow). With --db-matches it also writes that many
+finished matches to a temporary SQLite database and times the whole
+``python rating.py`` rebuild, reads and writes included.
+
+Usage (from BackEnd/):
+    python benchmarks/ratings.py --games 100000 1000000 10000000 --players 100000
+    python benchmarks/ratings.py --games 1000000 --db-matches 1000000
+"""
+import argparse
+import os
+import sqlite3
+import time
+
+import common  # noqa: F401  (sets DB_URL and sys.path)
+import numpy as np  # noqa: E402
+
+import rating  # noqa: E402
+
+
+def history(games: int, players: int, rng):
+    player1 = rng.integers(0, players, games)
+    player2 = (player1 + rng.integers(1, players, games)) % players
+    score1 = rng.choice([0.0, 0.5, 1.0], games, p=[0.45, 0.1, 0.45])
+    return player1, player2, score1
+
+
+def loopElo(player1, player2, score1, players: int):
+    ratings = [rating.RATING_START] * players
+    for a, b, s in zip(player1.tolist(), player2.tolist(), score1.tolist()):
+        ratings[a], ratings[b] = rating.eloUpdate(ratings[a], ratings[b], s)
+    return np.array(ratings)
+
+
+def rebuildFromDatabase(matches: int, players: int, rng) -> None:
+    path = os.environ["DB_URL"].replace("sqlite:///", "", 1)
+    common.createSchema()
+    player1, player2, score1 = history(matches, players, rng)
+    ids1, ids2 = (player1 + 1).tolist(), (player2 + 1).tolist()
+    win = np.where(score1 == 1.0, player1 + 1, player2 + 1).tolist()
+    draw = (score1 == 0.5).tolist()
+    with sqlite3.connect(path) as conn:
+        conn.executemany("INSERT INTO players (id, name) VALUES (?, ?)",
+                         ((i, f"Player {i}") for i in range(1, players + 1)))
+        conn.executemany(
+            "INSERT INTO matches (tournament_id, player1_id, player2_id, win, status, draw, phase) "
+            "VALUES (1, ?, ?, ?, 1, ?, 1)",
+            zip(ids1, ids2, win, draw),
+        )
+    start = time.perf_counter()
+    rated, games = rating.rebuildRatings()
+    elapsed = time.perf_counter() - start
+    print(f"\nrebuild from SQLite: {games} matches, {rated} players in {elapsed:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, nargs="+", default=[100000, 1000000, 10000000])
+    parser.add_argument("--players", type=int, default=100000)
+    parser.add_argument("--check", type=int, default=200000, help="games also replayed one by one")
+    parser.add_argument("--db-matches", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'games':>10} {'layers':>8} {'numpy s':>8} {'loop s':>8} {'max diff':>10}")
+    for games in args.games:
+        player1, player2, score1 = history(games, args.players, rng)
+        start = time.perf_counter()
+        ratings = rating.replayElo(player1, player2, score1, args.players)
+        vectorized = time.perf_counter() - start
+        layers = rating.replayLayers(player1, player2, args.players).max()
+
+        loop, diff = "-", "-"
+        if games <= args.check:
+            start = time.perf_counter()
+            expected = loopElo(player1, player2, score1, args.players)
+            loop = f"{time.perf_counter() - start:.2f}"
+            diff = f"{np.abs(ratings - expected).max():.1e}"
+            assert np.allclose(ratings, expected), "vectorized replay differs from the loop"
+        print(f"{games:>10} {layers:>8} {vectorized:>8.2f} {loop:>8} {diff:>10}")
+
+    if args.db_matches:
+        rebuildFromDatabase(args.db_matches, args.players, rng)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Roster scaling check: adding a player and advancing a phase must not grow with the event.
+
+For each roster size, seeds an elimination tournament directly in the
+database, finishes its first round, then times (and counts the statements
+of) POST /tournament/{id}/player/{player} and POST /tournament/{id}/next-phase
+through the API.
+
+Usage (from BackEnd/):
+    python benchmarks/rosterScaling.py --sizes 16 256 4096
+"""
+import argparse
+import asyncio
+import time
+
+import common
+from sqlalchemy import event, insert, update  # noqa: E402
+
+from main import app  # noqa: E402
+from matchGeneration import generateMatches  # noqa: E402
+from models import Matches, Players, SessionLocal, Tournament, TournamentScores, tournamentsPlayers  # noqa: E402
+
+
+async def seedTournament(tournament_id: int, size: int, firstPlayer: int) -> int:
+    """Tournament with `size` players and a finished first round; returns a free player id"""
+    ids = list(range(firstPlayer, firstPlayer + size))
+    async with SessionLocal() as db:
+        await db.execute(insert(Players), [{"id": p, "name": f"Player {p}", "personalScore": 0} for p in ids + [ids[-1] + 1]])
+        await db.execute(insert(Tournament), [{"id": tournament_id, "name": f"Size {size}", "type": "elimination"}])
+        await db.execute(insert(tournamentsPlayers), [{"tournament_id": tournament_id, "player_id": p} for p in ids])
+        await db.execute(insert(TournamentScores), [{"tournament_id": tournament_id, "player_id": p, "score": 0} for p in ids])
+        await generateMatches(db, tournament_id)
+        await db.execute(update(Matches).where(Matches.tournament_id == tournament_id)
+                         .values(status=True, win=Matches.player1_id))
+        await db.commit()
+    return ids[-1] + 1
+
+
+async def timed(client, url: str):
+    statements = []
+
+    def _record(*args):
+        statements.append(1)
+
+    event.listen(common.engine.sync_engine, "before_cursor_execute", _record)
+    start = time.perf_counter()
+    res = await client.post(url)
+    elapsed = time.perf_counter() - start
+    event.remove(common.engine.sync_engine, "before_cursor_execute", _record)
+    res.raise_for_status()
+    return elapsed * 1000, len(statements)
+
+
+async def main(args):
+    print(f"{'players':>8} {'add ms':>8} {'add sql':>8} {'phase ms':>9} {'phase sql':>10}")
+    nextPlayer = 1
+    async with common.asgiClient(app) as client:
+        for tournament_id, size in enumerate(args.sizes, start=1):
+            extra = await seedTournament(tournament_id, size, nextPlayer)
+            nextPlayer = extra + 1
+            addMs, addSql = await timed(client, f"/tournament/{tournament_id}/player/{extra}")
+            phaseMs, phaseSql = await timed(client, f"/tournament/{tournament_id}/next-phase")
+            print(f"{size:>8} {addMs:>8.1f} {addSql:>8} {phaseMs:>9.1f} {phaseSql:>10}")
+    await common.engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 256, 4096])
+    args = parser.parse_args()
+
+    common.createSchema()
+    asyncio.run(main(args))
@@ -0,0 +1,73 @@
+"""Seeding benchmark: time to order and place a bracket, with property checks.
+
+Works on the pure seeding functions (no database). For each size and mode it
+times seedOrder + bracketPairs over several seeds and checks that the same
+seed gives the same bracket, every player appears exactly once, the byes go
+to the top seeds, seeds 1 and 2 sit in opposite halves and, in rating mode,
+seed order follows the ratings.
+
+Usage (from BackEnd/):
+    python benchmarks/seeding.py --players 7 64 1000 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from seeding import SEEDING_MODES, bracketPairs, bracketSize, seedOrder  # noqa: E402
+
+
+def checkBracket(players, ratings, mode, seed, order, pairs):
+    assert seedOrder(players, mode, seed) == order, "same seed, different order"
+    assert seedOrder(list(reversed(players)), mode, seed) == order, "input order leaks into the result"
+
+    placed = [p for pair in pairs for p in pair if p is not None]
+    assert sorted(placed) == sorted(ratings), "players missing or repeated"
+
+    size = bracketSize(len(players))
+    byes = [p1 for p1, p2 in pairs if p2 is None]
+    assert len(pairs) == size // 2 and len(byes) == size - len(players), "wrong bye count"
+    assert set(byes) == set(order[:len(byes)]), "byes not given to the top seeds"
+
+    half = len(pairs) // 2
+    if half:
+        top = {p for pair in pairs[:half] for p in pair}
+        assert (order[0] in top) != (order[1] in top), "seeds 1 and 2 in the same half"
+
+    if mode == "rating":
+        scores = [ratings[p] for p in order]
+        assert scores == sorted(scores, reverse=True), "rating order not respected"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, nargs="+", default=[7, 64, 1000, 100000])
+    parser.add_argument("--seeds", type=int, default=5, help="seeds tried per size and mode")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'players':>8} {'mode':>7} {'byes':>6} {'mean ms':>8} {'max ms':>8}")
+    for count in args.players:
+        ratings = {p: rng.randrange(0, 50) for p in range(1, count + 1)}
+        players = list(ratings.items())
+        for mode in SEEDING_MODES:
+            timings = []
+            for _ in range(args.seeds):
+                seed = rng.randrange(1, 2 ** 31)
+                start = time.perf_counter()
+                order = seedOrder(players, mode, seed)
+                pairs = bracketPairs(order)
+                timings.append(time.perf_counter() - start)
+                checkBracket(players, ratings, mode, seed, order, pairs)
+            byes = bracketSize(count) - count
+            mean = sum(timings) / len(timings) * 1000
+            print(f"{count:>8} {mode:>7} {byes:>6} {mean:>8.2f} {max(timings) * 1000:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
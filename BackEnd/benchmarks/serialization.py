@@ -0,0 +1,144 @@
+"""Serialization benchmark: ORM objects plus response_model versus the lean read models.
+
+Generates tournaments with finished matches (common.generateData) and builds
+the body of one GET /tournament page holding every tournament in two ways:
+
+  orm   the previous path: selectinload of players (with their tournaments),
+        scores and matches into ORM objects, then validation against
+        List[TournamentBase] and FastAPI's JSON encoding
+  lean  readModels: column queries shaped into dicts, encoded with orjson
+        (and with the json fallback, reported as lean-json)
+
+Each path is split into loading (queries and objects or dicts) and
+serializing (validation and encoding), reported in milliseconds per 10k
+matches in the page. Both bodies are decoded and compared before timing.
+
+Usage (from BackEnd/):
+    python benchmarks/serialization.py --matches 10000 100000 --tournaments 50
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import List
+
+import common
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import func, insert, select  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+import cache  # noqa: E402
+import readModels  # noqa: E402
+from models import Matches, Players, SessionLocal, Tournament  # noqa: E402
+from schemas import TournamentBase  # noqa: E402
+
+# Opciones de carga que usaba GET /tournament antes de readModels
+ORM_OPTIONS = (
+    selectinload(Tournament.players).selectinload(Players.tournament),
+    selectinload(Tournament.scores),
+    selectinload(Tournament.matches.and_(Matches.player1_id.isnot(None), Matches.player2_id.isnot(None))),
+)
+
+_page = TypeAdapter(List[TournamentBase])
+
+
+async def addMatches(count: int, players: int, tournaments: int, rng: random.Random) -> None:
+    async with SessionLocal() as db:
+        for start in range(0, count, common.GENERATE_CHUNK):
+            rows = []
+            for _ in range(min(common.GENERATE_CHUNK, count - start)):
+                p1, p2 = rng.sample(range(1, players + 1), 2)
+                rows.append({"tournament_id": rng.randrange(1, tournaments + 1), "player1_id": p1,
+                             "player2_id": p2, "win": rng.choice((p1, p2)), "status": True,
+                             "draw": False, "phase": 1})
+            await db.execute(insert(Matches), rows)
+        await db.commit()
+
+
+async def ormBody(db, limit: int):
+    start = time.perf_counter()
+    rows = (await db.execute(
+        select(Tournament).options(*ORM_OPTIONS).order_by(Tournament.id).limit(limit)
+    )).scalars().all()
+    loaded = time.perf_counter()
+    # Como FastAPI con response_model: validar, volcar en modo JSON y codificar
+    body = cache.encode(_page.dump_python(_page.validate_python(rows, from_attributes=True), mode="json"))
+    return body, loaded - start, time.perf_counter() - loaded
+
+
+async def leanItems(db, limit: int):
+    # Mismos pasos que pagination.fetchPage sin fields=
+    names = list(TournamentBase.model_fields)
+    columns = readModels.fieldColumns(TournamentBase, Tournament.__table__)
+    rows = (await db.execute(
+        select(*(Tournament.__table__.c[name] for name in columns)).order_by(Tournament.id).limit(limit)
+    )).all()
+    ids = [row[0] for row in rows]
+    nested = {name: await load(db, ids) for name, load in readModels.TOURNAMENT_LIST_NESTED.items()}
+    return readModels.shape(TournamentBase, names, columns, rows, nested)
+
+
+async def leanBody(db, limit: int, useOrjson: bool = True):
+    start = time.perf_counter()
+    items = await leanItems(db, limit)
+    loaded = time.perf_counter()
+    saved, readModels.orjson = readModels.orjson, readModels.orjson if useOrjson else None
+    try:
+        body = readModels.dumps(items)
+    finally:
+        readModels.orjson = saved
+    return body, loaded - start, time.perf_counter() - loaded
+
+
+def normalized(body: bytes):
+    # El orden de los torneos de cada jugador no estaba definido en la carga ORM
+    page = json.loads(body)
+    for tournament in page:
+        for player in tournament["players"]:
+            player["tournament"].sort(key=lambda t: t["id"])
+    return page
+
+
+async def best(call, repeat: int, *args):
+    runs = [await call(*args) for _ in range(repeat)]
+    return runs[0][0], min(r[1] for r in runs), min(r[2] for r in runs)
+
+
+async def main(args):
+    if readModels.orjson is None:
+        print("orjson is not installed: the lean row uses the json fallback")
+    print(f"{'matches':>9} {'path':<10} {'load ms/10k':>12} {'serialize ms/10k':>17} "
+          f"{'total ms/10k':>13} {'speedup':>8}")
+    rng = random.Random(args.seed)
+    await common.generateData(args.players, args.tournaments, 0, roster=args.roster, seed=args.seed)
+    loaded = 0
+    for size in sorted(args.matches):
+        # Las partidas crecen de forma acumulada; la página incluye todos los torneos
+        await addMatches(size - loaded, args.players, args.tournaments, rng)
+        async with SessionLocal() as db:
+            loaded = await db.scalar(select(func.count(Matches.id)))
+            orm = await best(ormBody, args.repeat, db, args.tournaments)
+            lean = await best(leanBody, args.repeat, db, args.tournaments)
+            leanJson = await best(leanBody, args.repeat, db, args.tournaments, False)
+        assert normalized(orm[0]) == normalized(lean[0]), "lean body differs from the response_model body"
+        assert lean[0] == leanJson[0]
+        per = 10000 / loaded
+        base = orm[1] + orm[2]
+        for name, (_, load, serialize) in (("orm", orm), ("lean", lean), ("lean-json", leanJson)):
+            total = load + serialize
+            print(f"{loaded:>9} {name:<10} {load * 1000 * per:>12.1f} {serialize * 1000 * per:>17.1f} "
+                  f"{total * 1000 * per:>13.1f} {base / total:>7.1f}x")
+    await common.engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--matches", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--tournaments", type=int, default=50)
+    parser.add_argument("--players", type=int, default=500)
+    parser.add_argument("--roster", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    common.createSchema()
+    asyncio.run(main(parser.parse_args()))
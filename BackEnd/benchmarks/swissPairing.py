@@ -0,0 +1,90 @@
+"""Swiss pairing benchmark: time to pair every round of a large event.
+
+Runs a full Swiss event on the pure pairing function (no database): each
+round is paired from the current scores, results are drawn at random, and
+the script checks that no pair meets twice and no player gets two byes.
+
+A second table pairs one round where the top tables have used up their
+rematch-free opponents: the ``--exhausted`` highest ranked players have all
+met each other, so each of them must reach well down the ranking.
+
+Usage (from BackEnd/):
+    python benchmarks/swissPairing.py --players 2000 500 64
+    python benchmarks/swissPairing.py --players 2000 --exhausted 5 9 10 32
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from swiss import pairRound, swissRounds  # noqa: E402
+
+
+def runEvent(players: int, rng: random.Random):
+    score = {p: 0 for p in range(1, players + 1)}
+    played, byes = set(), set()
+    timings = []
+    for _ in range(swissRounds(players)):
+        ranked = sorted(score.items(), key=lambda kv: (-kv[1], kv[0]))
+        start = time.perf_counter()
+        pairs, bye = pairRound(ranked, played, byes)
+        timings.append(time.perf_counter() - start)
+
+        for a, b in pairs:
+            pair = frozenset((a, b))
+            assert pair not in played, f"rematch {a}-{b}"
+            played.add(pair)
+            roll = rng.random()
+            if roll < 0.1:
+                score[a] += 1
+                score[b] += 1
+            else:
+                score[a if roll < 0.55 else b] += 3
+        if bye is not None:
+            assert bye not in byes, f"second bye for {bye}"
+            byes.add(bye)
+            score[bye] += 3
+    return timings
+
+
+def exhaustedRound(players: int, top: int, rng: random.Random) -> float:
+    # Puntuaciones de media partida jugada; los `top` primeros ya se enfrentaron todos
+    ranked = sorted(((p, 3 * rng.randint(0, 5)) for p in range(1, players + 1)), key=lambda kv: (-kv[1], kv[0]))
+    leaders = [p for p, _ in ranked[:top]]
+    played = {frozenset((a, b)) for i, a in enumerate(leaders) for b in leaders[i + 1:]}
+    start = time.perf_counter()
+    pairs, _ = pairRound(ranked, played)
+    elapsed = time.perf_counter() - start
+    assert not any(frozenset(pair) in played for pair in pairs), "rematch"
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, nargs="+", default=[64, 500, 2000])
+    parser.add_argument("--exhausted", type=int, nargs="+", default=[5, 9, 10],
+                        help="sizes of the group of leaders that already met each other")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'players':>8} {'rounds':>7} {'mean ms':>8} {'max ms':>8}")
+    for players in args.players:
+        timings = runEvent(players, rng)
+        mean = sum(timings) / len(timings) * 1000
+        print(f"{players:>8} {len(timings):>7} {mean:>8.1f} {max(timings) * 1000:>8.1f}")
+
+    print(f"\n{'players':>8} {'leaders':>8} {'ms':>8}")
+    for players in args.players:
+        for top in args.exhausted:
+            if top < players:
+                ms = exhaustedRound(players, top, rng) * 1000
+                print(f"{players:>8} {top:>8} {ms:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
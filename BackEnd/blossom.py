@@ -0,0 +1,398 @@
+"""Maximum-weight matching on general graphs (Edmonds' blossom algorithm).
+
+The primal-dual method of Edmonds as described by Galil ("Efficient
+algorithms for finding maximum matching in graphs", 1986), in the layout of
+Joris van Rantwijk's reference implementation: O(n) stages, each one
+growing alternating trees over tight edges, shrinking odd cycles into
+blossoms and adjusting the dual variables until it finds an augmenting
+path. The running time is O(n^3) in the worst case and close to O(n * m)
+on the sparse graphs swiss.py builds.
+
+Weights must be integers, so that every dual update stays integral.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+Edge = Tuple[int, int, int]
+
+
+def maxWeightMatching(vertices: int, edges: Sequence[Edge], maxCardinality: bool = False,
+                      initial: Sequence[Tuple[int, int]] = ()) -> List[int]:
+    """Mate of every vertex (-1 if unmatched) in a maximum-weight matching.
+
+    ``edges`` holds ``(i, j, weight)`` tuples with integer weights. With
+    ``maxCardinality`` the matching has the largest possible number of edges
+    and the largest weight among those. ``initial`` may warm-start the search
+    with pairs joined by edges of the maximum weight, which are tight under
+    the initial duals.
+    """
+    return _Matching(vertices, edges).solve(maxCardinality, initial)
+
+
+class _Matching:
+    def __init__(self, vertices: int, edges: Sequence[Edge]):
+        n = vertices
+        self.n = n
+        self.edges = list(edges)
+        self.maxWeight = max([0] + [wt for _, _, wt in self.edges])
+        # Extremo p de la arista p // 2: endpoint[2k] = i, endpoint[2k + 1] = j
+        self.endpoint = [v for i, j, _ in self.edges for v in (i, j)]
+        # Extremos remotos de las aristas de cada vértice
+        self.neighbend: List[List[int]] = [[] for _ in range(n)]
+        for k, (i, j, _) in enumerate(self.edges):
+            self.neighbend[i].append(2 * k + 1)
+            self.neighbend[j].append(2 * k)
+        # mate[v]: extremo remoto de la arista emparejada de v, o -1
+        self.mate = [-1] * n
+        # Etiquetas de vértices y blossoms de nivel superior: 0 libre, 1 S, 2 T
+        self.label = [0] * (2 * n)
+        self.labelend = [-1] * (2 * n)
+        self.inblossom = list(range(n))
+        self.blossomparent = [-1] * (2 * n)
+        self.blossomchilds: List[Optional[List[int]]] = [None] * (2 * n)
+        self.blossombase = list(range(n)) + [-1] * n
+        self.blossomendps: List[Optional[List[int]]] = [None] * (2 * n)
+        self.blossomleaves: List[Optional[List[int]]] = [None] * (2 * n)
+        self.bestedge = [-1] * (2 * n)
+        self.blossombestedges: List[Optional[List[int]]] = [None] * (2 * n)
+        self.unusedblossoms = list(range(n, 2 * n))
+        # Duales duplicados: slack(k) = u(i) + u(j) - 2 * w(k) es entero
+        self.dualvar = [self.maxWeight] * n + [0] * n
+        self.allowedge = [False] * len(self.edges)
+        self.queue: List[int] = []
+        # Vértices y blossoms etiquetados o con bestedge en esta etapa: los
+        # ajustes de duales solo recorren estos, no los 2n
+        self.touched: List[int] = []
+
+    def slack(self, k: int) -> int:
+        i, j, wt = self.edges[k]
+        return self.dualvar[i] + self.dualvar[j] - 2 * wt
+
+    def leaves(self, b: int) -> List[int]:
+        return [b] if b < self.n else self.blossomleaves[b]
+
+    def assignLabel(self, w: int, t: int, p: int) -> None:
+        # Etiqueta w y su blossom; una T arrastra la S de su pareja
+        while True:
+            b = self.inblossom[w]
+            self.label[w] = self.label[b] = t
+            self.labelend[w] = self.labelend[b] = p
+            self.bestedge[w] = self.bestedge[b] = -1
+            self.touched.append(b)
+            if t == 1:
+                self.queue.extend(self.leaves(b))
+                return
+            base = self.blossombase[b]
+            w, t, p = self.endpoint[self.mate[base]], 1, self.mate[base] ^ 1
+
+    def scanBlossom(self, v: int, w: int) -> int:
+        """Base of the new blossom closed by the edge v-w, or -1 for an augmenting path"""
+        label, endpoint = self.label, self.endpoint
+        path = []
+        base = -1
+        while v != -1 or w != -1:
+            b = self.inblossom[v]
+            if label[b] & 4:
+                base = self.blossombase[b]
+                break
+            path.append(b)
+            label[b] = 5
+            if self.labelend[b] == -1:
+                v = -1
+            else:
+                v = endpoint[self.labelend[b]]
+                b = self.inblossom[v]
+                v = endpoint[self.labelend[b]]
+            if w != -1:
+                v, w = w, v
+        for b in path:
+            label[b] = 1
+        return base
+
+    def addBlossom(self, base: int, k: int) -> None:
+        endpoint, inblossom, labelend = self.endpoint, self.inblossom, self.labelend
+        v, w, _ = self.edges[k]
+        bb, bv, bw = inblossom[base], inblossom[v], inblossom[w]
+        b = self.unusedblossoms.pop()
+        self.blossombase[b] = base
+        self.blossomparent[b] = -1
+        self.blossomparent[bb] = b
+        self.blossomchilds[b] = path = []
+        self.blossomendps[b] = endps = []
+        # Ciclo impar: de v hasta la base y de la base hasta w
+        while bv != bb:
+            self.blossomparent[bv] = b
+            path.append(bv)
+            endps.append(labelend[bv])
+            v = endpoint[labelend[bv]]
+            bv = inblossom[v]
+        path.append(bb)
+        path.reverse()
+        endps.reverse()
+        endps.append(2 * k)
+        while bw != bb:
+            self.blossomparent[bw] = b
+            path.append(bw)
+            endps.append(labelend[bw] ^ 1)
+            w = endpoint[labelend[bw]]
+            bw = inblossom[w]
+        self.label[b] = 1
+        labelend[b] = labelend[bb]
+        self.dualvar[b] = 0
+        self.touched.append(b)
+        self.blossomleaves[b] = [v for child in path for v in self.leaves(child)]
+        for v in self.leaves(b):
+            if self.label[inblossom[v]] == 2:
+                # Los antiguos vértices T pasan a ser S dentro del blossom
+                self.queue.append(v)
+            inblossom[v] = b
+        # Mejor arista del blossom hacia cada blossom S vecino
+        bestedgeto: Dict[int, int] = {}
+        for bv in path:
+            if self.blossombestedges[bv] is None:
+                nblists = [[p // 2 for p in self.neighbend[v]] for v in self.leaves(bv)]
+            else:
+                nblists = [self.blossombestedges[bv]]
+            for nblist in nblists:
+                for k in nblist:
+                    i, j, _ = self.edges[k]
+                    if inblossom[j] == b:
+                        i, j = j, i
+                    bj = inblossom[j]
+                    if (bj != b and self.label[bj] == 1
+                            and (bj not in bestedgeto or self.slack(k) < self.slack(bestedgeto[bj]))):
+                        bestedgeto[bj] = k
+            self.blossombestedges[bv] = None
+            self.bestedge[bv] = -1
+        self.blossombestedges[b] = list(bestedgeto.values())
+        self.bestedge[b] = -1
+        for k in self.blossombestedges[b]:
+            if self.bestedge[b] == -1 or self.slack(k) < self.slack(self.bestedge[b]):
+                self.bestedge[b] = k
+
+    def expandBlossom(self, b: int, endstage: bool) -> None:
+        n, endpoint, label, labelend = self.n, self.endpoint, self.label, self.labelend
+        for s in self.blossomchilds[b]:
+            self.blossomparent[s] = -1
+            if s < n:
+                self.inblossom[s] = s
+            elif endstage and self.dualvar[s] == 0:
+                self.expandBlossom(s, endstage)
+            else:
+                for v in self.leaves(s):
+                    self.inblossom[v] = s
+        if not endstage and label[b] == 2:
+            # Blossom T expandido a mitad de etapa: se reetiquetan sus hijos
+            # a lo largo del camino par desde el punto de entrada hasta la base
+            childs, endps = self.blossomchilds[b], self.blossomendps[b]
+            entrychild = self.inblossom[endpoint[labelend[b] ^ 1]]
+            j = childs.index(entrychild)
+            if j & 1:
+                j -= len(childs)
+                jstep, endptrick = 1, 0
+            else:
+                jstep, endptrick = -1, 1
+            p = labelend[b]
+            while j != 0:
+                label[endpoint[p ^ 1]] = 0
+                label[endpoint[endps[j - endptrick] ^ endptrick ^ 1]] = 0
+                self.assignLabel(endpoint[p ^ 1], 2, p)
+                self.allowedge[endps[j - endptrick] // 2] = True
+                j += jstep
+                p = endps[j - endptrick] ^ endptrick
+                self.allowedge[p // 2] = True
+                j += jstep
+            bv = childs[j]
+            label[endpoint[p ^ 1]] = label[bv] = 2
+            labelend[endpoint[p ^ 1]] = labelend[bv] = p
+            self.bestedge[bv] = -1
+            self.touched.append(bv)
+            j += jstep
+            while childs[j] != entrychild:
+                bv = childs[j]
+                if label[bv] == 1:
+                    j += jstep
+                    continue
+                for v in self.leaves(bv):
+                    if label[v] != 0:
+                        break
+                if label[v] != 0:
+                    label[v] = 0
+                    label[endpoint[self.mate[self.blossombase[bv]]]] = 0
+                    self.assignLabel(v, 2, labelend[v])
+                j += jstep
+        label[b] = labelend[b] = -1
+        self.blossomchilds[b] = self.blossomendps[b] = self.blossomleaves[b] = None
+        self.blossombase[b] = -1
+        self.blossombestedges[b] = None
+        self.bestedge[b] = -1
+        self.unusedblossoms.append(b)
+
+    def augmentBlossom(self, b: int, v: int) -> None:
+        # Intercambia las aristas del camino par de v a la base; v pasa a ser la base
+        endpoint = self.endpoint
+        t = v
+        while self.blossomparent[t] != b:
+            t = self.blossomparent[t]
+        if t >= self.n:
+            self.augmentBlossom(t, v)
+        childs, endps = self.blossomchilds[b], self.blossomendps[b]
+        i = j = childs.index(t)
+        if i & 1:
+            j -= len(childs)
+            jstep, endptrick = 1, 0
+        else:
+            jstep, endptrick = -1, 1
+        while j != 0:
+            j += jstep
+            t = childs[j]
+            p = endps[j - endptrick] ^ endptrick
+            if t >= self.n:
+                self.augmentBlossom(t, endpoint[p])
+            j += jstep
+            t = childs[j]
+            if t >= self.n:
+                self.augmentBlossom(t, endpoint[p ^ 1])
+            self.mate[endpoint[p]] = p ^ 1
+            self.mate[endpoint[p ^ 1]] = p
+        self.blossomchilds[b] = childs[i:] + childs[:i]
+        self.blossomendps[b] = endps[i:] + endps[:i]
+        self.blossombase[b] = self.blossombase[self.blossomchilds[b][0]]
+
+    def augmentMatching(self, k: int) -> None:
+        endpoint, inblossom, labelend = self.endpoint, self.inblossom, self.labelend
+        v, w, _ = self.edges[k]
+        for s, p in ((v, 2 * k + 1), (w, 2 * k)):
+            # Recorre el árbol de s hasta su raíz alternando las aristas
+            while True:
+                bs = inblossom[s]
+                if bs >= self.n:
+                    self.augmentBlossom(bs, s)
+                self.mate[s] = p
+                if labelend[bs] == -1:
+                    break
+                t = endpoint[labelend[bs]]
+                bt = inblossom[t]
+                s = endpoint[labelend[bt]]
+                j = endpoint[labelend[bt] ^ 1]
+                if bt >= self.n:
+                    self.augmentBlossom(bt, j)
+                self.mate[j] = labelend[bt]
+                p = labelend[bt] ^ 1
+
+    def solve(self, maxCardinality: bool, initial: Sequence[Tuple[int, int]]) -> List[int]:
+        n = self.n
+        if not self.edges:
+            return [-1] * n
+        label, inblossom, bestedge, dualvar = self.label, self.inblossom, self.bestedge, self.dualvar
+
+        if initial:
+            index = {(min(i, j), max(i, j)): k for k, (i, j, wt) in enumerate(self.edges)
+                     if wt == self.maxWeight}
+            for i, j in initial:
+                k = index[(min(i, j), max(i, j))]
+                self.mate[self.edges[k][0]] = 2 * k + 1
+                self.mate[self.edges[k][1]] = 2 * k
+
+        for _ in range(n):
+            # Etapa: árboles alternantes desde cada vértice libre hasta aumentar
+            label[:] = [0] * (2 * n)
+            bestedge[:] = [-1] * (2 * n)
+            self.blossombestedges[n:] = [None] * n
+            self.allowedge[:] = [False] * len(self.edges)
+            self.queue[:] = []
+            self.touched[:] = []
+            for v in range(n):
+                if self.mate[v] == -1 and label[inblossom[v]] == 0:
+                    self.assignLabel(v, 1, -1)
+
+            augmented = False
+            while True:
+                while self.queue and not augmented:
+                    v = self.queue.pop()
+                    for p in self.neighbend[v]:
+                        k = p // 2
+                        w = self.endpoint[p]
+                        if inblossom[v] == inblossom[w]:
+                            continue
+                        if not self.allowedge[k]:
+                            kslack = self.slack(k)
+                            if kslack <= 0:
+                                self.allowedge[k] = True
+                        if self.allowedge[k]:
+                            if label[inblossom[w]] == 0:
+                                self.assignLabel(w, 2, p ^ 1)
+                            elif label[inblossom[w]] == 1:
+                                base = self.scanBlossom(v, w)
+                                if base >= 0:
+                                    self.addBlossom(base, k)
+                                else:
+                                    self.augmentMatching(k)
+                                    augmented = True
+                                    break
+                            elif label[w] == 0:
+                                label[w] = 2
+                                self.labelend[w] = p ^ 1
+                        elif label[inblossom[w]] == 1:
+                            b = inblossom[v]
+                            if bestedge[b] == -1 or kslack < self.slack(bestedge[b]):
+                                bestedge[b] = k
+                                self.touched.append(b)
+                        elif label[w] == 0:
+                            if bestedge[w] == -1 or kslack < self.slack(bestedge[w]):
+                                bestedge[w] = k
+                                self.touched.append(w)
+                if augmented:
+                    break
+
+                # Sin aristas ajustadas: el menor cambio de duales que añade una
+                touched = set(self.touched)
+                # Blossoms y vértices de nivel superior etiquetados S o T
+                trees = [b for b in touched if self.blossomparent[b] == -1 and label[b] in (1, 2)
+                         and (b < n or self.blossombase[b] >= 0)]
+                deltatype, delta, deltaedge, deltablossom = -1, None, None, None
+                if not maxCardinality:
+                    deltatype, delta = 1, min(dualvar[:n])
+                for v in touched:
+                    if v < n and label[inblossom[v]] == 0 and bestedge[v] != -1:
+                        d = self.slack(bestedge[v])
+                        if deltatype == -1 or d < delta:
+                            deltatype, delta, deltaedge = 2, d, bestedge[v]
+                for b in trees:
+                    if label[b] == 1 and bestedge[b] != -1:
+                        d = self.slack(bestedge[b]) // 2
+                        if deltatype == -1 or d < delta:
+                            deltatype, delta, deltaedge = 3, d, bestedge[b]
+                    elif label[b] == 2 and b >= n and (deltatype == -1 or dualvar[b] < delta):
+                        deltatype, delta, deltablossom = 4, dualvar[b], b
+                if deltatype == -1:
+                    # Cardinalidad máxima ya alcanzada: último ajuste y fin
+                    deltatype, delta = 1, max(0, min(dualvar[:n]))
+
+                for b in trees:
+                    change = -delta if label[b] == 1 else delta
+                    for v in self.leaves(b):
+                        dualvar[v] += change
+                    if b >= n:
+                        dualvar[b] -= change
+
+                if deltatype == 1:
+                    break
+                if deltatype == 2:
+                    self.allowedge[deltaedge] = True
+                    i, j, _ = self.edges[deltaedge]
+                    self.queue.append(i if label[inblossom[i]] == 1 else j)
+                elif deltatype == 3:
+                    self.allowedge[deltaedge] = True
+                    self.queue.append(self.edges[deltaedge][0])
+                else:
+                    self.expandBlossom(deltablossom, False)
+
+            if not augmented:
+                break
+            # Fin de etapa: los blossoms S con dual cero ya no hacen falta
+            for b in set(self.touched):
+                if (b >= n and self.blossomparent[b] == -1 and self.blossombase[b] >= 0
+                        and label[b] == 1 and dualvar[b] == 0):
+                    self.expandBlossom(b, True)
+
+        return [self.endpoint[p] if p >= 0 else -1 for p in self.mate]
@@ -0,0 +1,167 @@
+"""In-process cache of serialized read responses.
+
+Entries are JSON bodies tagged with the tournaments and players they were
+built from ("tournament:3", "player:7"). Writes mark the tags they touch on
+the session (see versions.py) and the tags are invalidated right after the
+commit. Entries also expire after CACHE_TTL seconds, which bounds staleness
+when several worker processes each keep their own cache.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+import metrics
+from config import CACHE_ENABLED, CACHE_MAX_BYTES, CACHE_TTL
+
+# Coste fijo estimado por entrada (clave, tupla, nodo del OrderedDict)
+ENTRY_OVERHEAD = 200
+# Tags invalidados que se recuerdan para descartar lecturas en curso
+TAG_HISTORY = 10000
+
+
+class ResponseCache:
+    """LRU cache bounded by the total size of the stored bodies, with TTL and tags"""
+    def __init__(self, maxBytes: int = CACHE_MAX_BYTES, ttl: float = CACHE_TTL):
+        self.maxBytes = maxBytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[bytes, Tuple[str, ...], float]]" = OrderedDict()
+        self._byTag: Dict[str, set] = {}
+        self._invalidatedAt: Dict[str, int] = {}
+        self._epoch = 0
+        self._floor = 0
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    def epoch(self) -> int:
+        """Take before reading from the database and pass to set()"""
+        return self._epoch
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[2] < time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, body: bytes, tags: Iterable[str], since: int) -> None:
+        """Store a body unless one of its tags was invalidated after `since`.
+
+        A request that read the database before a write committed would
+        otherwise put the old data back right after the invalidation.
+        """
+        tags = tuple(set(tags))
+        size = len(body) + ENTRY_OVERHEAD
+        if size > self.maxBytes:
+            return
+        with self._lock:
+            if since < self._floor or any(self._invalidatedAt.get(tag, -1) >= since for tag in tags):
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (body, tags, time.monotonic() + self.ttl)
+            self._bytes += size
+            for tag in tags:
+                self._byTag.setdefault(tag, set()).add(key)
+            while self._bytes > self.maxBytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            self._epoch += 1
+            if len(self._invalidatedAt) > TAG_HISTORY:
+                # Se olvida el historial: ninguna lectura anterior podrá guardarse
+                self._invalidatedAt.clear()
+                self._floor = self._epoch
+            for tag in tags:
+                self._invalidatedAt[tag] = self._epoch
+                for key in self._byTag.pop(tag, ()):
+                    if key in self._entries:
+                        self._remove(key)
+                        self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._floor = self._epoch
+            self._entries.clear()
+            self._byTag.clear()
+            self._invalidatedAt.clear()
+            self._bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        body, tags, _ = self._entries.pop(key)
+        self._bytes -= len(body) + ENTRY_OVERHEAD
+        for tag in tags:
+            keys = self._byTag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._byTag[tag]
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions,
+                "expirations": self.expirations, "invalidations": self.invalidations}
+
+
+# Desactivada: tamaño 0, todas las lecturas son fallos y nada se guarda
+responseCache = ResponseCache(CACHE_MAX_BYTES if CACHE_ENABLED else 0)
+
+
+def touch(db, *tags: str) -> None:
+    """Mark cache tags changed by the current transaction; they are invalidated after commit"""
+    db.sync_session.info.setdefault("cache_tags", set()).update(tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidateCommitted(session):
+    tags = session.info.pop("cache_tags", None)
+    if tags:
+        responseCache.invalidate(tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discardRolledBack(session):
+    session.info.pop("cache_tags", None)
+
+
+def encode(content) -> bytes:
+    """Serialize like FastAPI's JSONResponse, so cached and fresh bodies are identical"""
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, allow_nan=False,
+                      indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def jsonResponse(body: bytes, response: Optional[Response] = None) -> Response:
+    """Response for a serialized body, keeping headers already set (e.g. ETag)"""
+    headers = dict(response.headers) if response is not None else None
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _metricLines() -> List[str]:
+    lines = []
+    for name, value in responseCache.stats().items():
+        kind = "gauge" if name in ("entries", "bytes") else "counter"
+        suffix = "" if kind == "gauge" else "_total"
+        metric = f"magic_response_cache_{name}{suffix}"
+        lines += [f"# TYPE {metric} {kind}", f"{metric} {value}"]
+    return lines
+
+
+metrics.registerCollector(_metricLines)
@@ -1,4 +1,44 @@
 import os
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DB_PATH = f"sqlite:///{os.path.join(BASE_DIR, 'tournament.db')}"
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_PATH = f"sqlite:///{os.path.join(BASE_DIR, 'DB', 'database.sqlite')}"
+
+# Configuración de la base de datos (se puede sobrescribir con variables de entorno)
+DB_URL = os.getenv("DB_URL", DB_PATH)
+# La API usa el driver asíncrono (aiosqlite) sobre la misma base
+ASYNC_DB_URL = os.getenv("ASYNC_DB_URL", DB_URL.replace("sqlite://", "sqlite+aiosqlite://", 1))
+
+# Pool de conexiones
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))    # seconds
+
+# SQLite: tiempo de espera cuando la base está bloqueada por otro escritor
+DB_BUSY_TIMEOUT = int(os.getenv("DB_BUSY_TIMEOUT", "5000"))  # milliseconds
+
+# Paginación de los listados (/player, /tournament, /matches, /scores)
+PAGE_DEFAULT_LIMIT = int(os.getenv("PAGE_DEFAULT_LIMIT", "100"))
+PAGE_MAX_LIMIT = int(os.getenv("PAGE_MAX_LIMIT", "1000"))
+
+# Logs: nivel y formato ("json" para producción, "text" para desarrollo)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+
+# Métricas Prometheus en /metrics (desactivadas por defecto)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() in ("1", "true", "yes")
+
+# Caché en memoria de respuestas de lectura (por proceso)
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+CACHE_TTL = float(os.getenv("CACHE_TTL", "30"))  # seconds
+
+# Trabajos en segundo plano (POST ...?background=true): hilos por proceso y
+# cada cuánto buscan trabajos encolados por otros procesos
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1"))
+# Arriendo de un trabajo en ejecución: sin latido durante este tiempo, otro proceso lo retoma
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+
+# Respuestas guardadas por Idempotency-Key: horas que se puede repetir la petición
+IDEMPOTENCY_TTL_HOURS = float(os.getenv("IDEMPOTENCY_TTL_HOURS", "24"))
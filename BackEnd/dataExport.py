@@ -0,0 +1,170 @@
+"""Streaming export of matches, scores and standings.
+
+Rows are read through a server-side cursor in chunks of EXPORT_CHUNK and
+encoded chunk by chunk, so memory stays flat however much history is
+exported. GET /export/{kind} streams NDJSON or CSV with chunked transfer;
+``python dataExport.py`` writes the same data to a file, or to a compact
+columnar Parquet file when pyarrow is installed:
+
+    python dataExport.py matches --format csv -o matches.csv
+    python dataExport.py standings --tournament 3
+    pip install pyarrow && python dataExport.py matches --format parquet -o matches.parquet
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import sys
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Boolean, Select, select
+from sqlalchemy.orm import aliased
+
+from models import Matches, Players, Tournament, TournamentScores, engine
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Solo la exportación a Parquet necesita pyarrow
+    pa = None
+
+EXPORT_KINDS = ("matches", "scores", "standings")
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_CHUNK = 5000
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+_matches = Matches.__table__
+_scores = TournamentScores.__table__
+
+
+def exportQuery(kind: str, tournament_id: Optional[int] = None) -> Select:
+    """Column-tuple query of one export, in a stable order"""
+    if kind == "matches":
+        player1, player2 = aliased(Players), aliased(Players)
+        query = (
+            select(_matches.c.id, _matches.c.tournament_id, _matches.c.phase,
+                   _matches.c.player1_id, player1.name.label("player1_name"),
+                   _matches.c.player2_id, player2.name.label("player2_name"),
+                   _matches.c.status, _matches.c.win, _matches.c.draw,
+                   _matches.c.bracket_slot, _matches.c.next_match_id)
+            .outerjoin(player1, player1.id == _matches.c.player1_id)
+            .outerjoin(player2, player2.id == _matches.c.player2_id)
+            .order_by(_matches.c.id)
+        )
+        column = _matches.c.tournament_id
+    elif kind == "scores":
+        query = (
+            select(_scores.c.id, _scores.c.tournament_id, _scores.c.player_id, _scores.c.score,
+                   _scores.c.wins, _scores.c.draws, _scores.c.losses, _scores.c.buchholz,
+                   _scores.c.position)
+            .order_by(_scores.c.id)
+        )
+        column = _scores.c.tournament_id
+    elif kind == "standings":
+        # Mismas columnas que GET /tournament/{id}/standings, con el torneo
+        query = (
+            select(_scores.c.tournament_id, Tournament.name.label("tournament_name"),
+                   _scores.c.position, _scores.c.player_id, Players.name.label("player_name"),
+                   _scores.c.score.label("final_score"), _scores.c.wins, _scores.c.draws,
+                   _scores.c.losses, _scores.c.buchholz)
+            .join(Tournament, Tournament.id == _scores.c.tournament_id)
+            .join(Players, Players.id == _scores.c.player_id)
+            .order_by(_scores.c.tournament_id, _scores.c.position.is_(None), _scores.c.position)
+        )
+        column = _scores.c.tournament_id
+    else:
+        raise ValueError(f"Invalid export kind: {kind}")
+    if tournament_id is not None:
+        query = query.where(column == tournament_id)
+    return query
+
+
+async def exportChunks(query: Select, chunk: int = EXPORT_CHUNK) -> AsyncIterator[List[Tuple]]:
+    """Lists of up to `chunk` rows read with a server-side cursor on a connection of its own"""
+    # Conexión propia: la sesión de la petición ya está cerrada mientras se envía el cuerpo
+    async with engine.connect() as conn:
+        result = await conn.stream(query.execution_options(yield_per=chunk))
+        async for rows in result.partitions(chunk):
+            yield rows
+
+
+def _encodeNdjson(columns: Sequence[str], rows: List[Tuple]) -> str:
+    return "".join(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n" for row in rows)
+
+
+def _encodeCsv(columns: Sequence[str], rows: List[Tuple]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue()
+
+
+async def encode(query: Select, fmt: str) -> AsyncIterator[bytes]:
+    """Body of an export: one encoded piece per chunk of rows"""
+    columns = [c.name for c in query.selected_columns]
+    if fmt == "csv":
+        yield (",".join(columns) + "\n").encode()
+        encoder = _encodeCsv
+    else:
+        encoder = _encodeNdjson
+    async for rows in exportChunks(query):
+        yield encoder(columns, rows).encode()
+
+
+def _arrowSchema(query: Select):
+    types = []
+    for column in query.selected_columns:
+        if isinstance(column.type, Boolean):
+            types.append((column.name, pa.bool_()))
+        elif column.type.python_type is int:
+            types.append((column.name, pa.int64()))
+        else:
+            types.append((column.name, pa.string()))
+    return pa.schema(types)
+
+
+async def writeParquet(query: Select, path: str) -> int:
+    """Write the export as a Parquet file, one row group per chunk; returns the rows written"""
+    if pa is None:
+        raise RuntimeError("Parquet export needs pyarrow: pip install pyarrow")
+    schema = _arrowSchema(query)
+    total = 0
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        async for rows in exportChunks(query):
+            writer.write_batch(pa.RecordBatch.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(zip(*rows), schema)],
+                schema=schema,
+            ))
+            total += len(rows)
+    return total
+
+
+async def _export(args) -> None:
+    query = exportQuery(args.kind, args.tournament)
+    try:
+        if args.format == "parquet":
+            rows = await writeParquet(query, args.output)
+            print(f"{rows} {args.kind} rows written to {args.output}", file=sys.stderr)
+            return
+        out = open(args.output, "wb") if args.output else sys.stdout.buffer
+        try:
+            async for piece in encode(query, args.format):
+                out.write(piece)
+        finally:
+            if args.output:
+                out.close()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("kind", choices=EXPORT_KINDS)
+    parser.add_argument("--format", choices=EXPORT_FORMATS + ("parquet",), default="ndjson")
+    parser.add_argument("--tournament", type=int, help="only this tournament")
+    parser.add_argument("-o", "--output", help="output file (default: standard output)")
+    args = parser.parse_args()
+    if args.format == "parquet" and not args.output:
+        parser.error("--format parquet needs --output")
+    asyncio.run(_export(args))
@@ -0,0 +1,66 @@
+"""Idempotency-Key support for result submissions.
+
+A client that may retry a write (timeouts, double clicks, two judges sharing
+a device) sends an Idempotency-Key header. The key is reserved with the
+first write of the request's transaction and the response is stored in the
+same transaction, so a retry, even one sent while the first request is still
+running, waits for it and gets the same response back instead of applying
+the result twice. Only successful responses are stored: if the request
+fails nothing is committed and the key can be used again. Keys expire after
+IDEMPOTENCY_TTL_HOURS.
+"""
+import json
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import HTTPException, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import IDEMPOTENCY_TTL_HOURS
+from models import IdempotencyKeys
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+KEY_MAX = IdempotencyKeys.__table__.c.key.type.length
+
+_keys = IdempotencyKeys.__table__
+
+
+def requestOf(request: Request) -> str:
+    return f"{request.method} {request.url.path}"
+
+
+async def reserve(db: AsyncSession, key: str, request: Request) -> Optional[JSONResponse]:
+    """Reserve the key for this request, or return the stored response of the
+    request that already used it. Must be the first statement of the transaction."""
+    if len(key) > KEY_MAX:
+        raise HTTPException(status_code=400, detail=f"Idempotency-Key longer than {KEY_MAX} characters")
+    now = datetime.now()
+    # Escrituras primero: si otra petición tiene la clave, se espera a que confirme
+    await db.execute(delete(_keys).where(_keys.c.created_at < now - timedelta(hours=IDEMPOTENCY_TTL_HOURS)))
+    reserved = await db.execute(
+        insert(_keys).values(key=key, request=requestOf(request), created_at=now)
+        .on_conflict_do_nothing(index_elements=[_keys.c.key])
+        .returning(_keys.c.key)
+    )
+    if reserved.first():
+        return None
+
+    stored = (await db.execute(
+        select(_keys.c.request, _keys.c.status_code, _keys.c.body).where(_keys.c.key == key)
+    )).first()
+    await db.rollback()
+    if stored.request != requestOf(request):
+        raise HTTPException(status_code=422, detail="Idempotency-Key already used for another request")
+    return JSONResponse(status_code=stored.status_code, content=json.loads(stored.body),
+                        headers={REPLAYED_HEADER: "true"})
+
+
+async def store(db: AsyncSession, key: str, body: dict, status_code: int = 200) -> None:
+    """Save the response with the key; committed together with the request's changes"""
+    await db.execute(
+        update(_keys).where(_keys.c.key == key)
+        .values(status_code=status_code, body=json.dumps(body, default=str))
+    )
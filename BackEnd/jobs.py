@@ -0,0 +1,283 @@
+"""Background jobs for the expensive tournament operations.
+
+POST /tournament/{id}/generate_matches, /next-phase and /finish accept
+?background=true: the request only stores a row in the jobs table and
+answers 202 with the job id, and a pool of worker threads runs the
+operation. Each worker has its own event loop and a pool-less engine
+(models.workerEngine), so a long generation never blocks the API loop. The
+SQLite table is the queue: a job is claimed with a single UPDATE, so several
+threads or processes can share it without a broker, and the operation and
+the "done" status are committed in the same transaction.
+
+A claimed job is leased to its worker: the worker records itself as owner
+and refreshes heartbeat_at while the job runs. A running job whose heartbeat
+is older than JOB_LEASE_SECONDS belonged to a process that stopped, and any
+worker may claim it again; a worker that lost its lease rolls its work back
+instead of saving it.
+
+Retries are idempotent: an Idempotency-Key header returns the job created
+with that key, and while a job is queued or running the same operation on
+the same tournament returns that job instead of queuing another. Progress
+is kept in memory while a job runs and polled through GET /jobs/{id}.
+"""
+import asyncio
+import json
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+import operations
+from config import JOB_LEASE_SECONDS, JOB_POLL_SECONDS, JOB_WORKERS
+from logConfig import getLogger
+from models import Jobs, workerEngine
+
+log = getLogger("jobs")
+
+JOB_KINDS = {
+    "generate_matches": operations.generateMatches,
+    "next_phase": operations.nextPhase,
+    "finish": operations.finishTournament,
+}
+ACTIVE = ("queued", "running")
+# Espera tras un error del bucle (p. ej. base de datos bloqueada): se duplica hasta el máximo
+RETRY_SECONDS = 0.5
+RETRY_MAX_SECONDS = 30
+
+_jobs = Jobs.__table__
+
+
+def _expired(lease: float):
+    """Running jobs whose owner stopped refreshing the heartbeat"""
+    cutoff = datetime.now() - timedelta(seconds=lease)
+    return and_(_jobs.c.status == "running",
+                or_(_jobs.c.heartbeat_at.is_(None), _jobs.c.heartbeat_at < cutoff))
+
+
+class JobRunner:
+    """Worker threads that claim queued jobs from the jobs table"""
+    def __init__(self, workers: int = JOB_WORKERS, poll: float = JOB_POLL_SECONDS,
+                 lease: float = JOB_LEASE_SECONDS):
+        self.workers = workers
+        self.poll = poll
+        self.lease = lease
+        # Dueño de los trabajos que ejecuta este proceso
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._threads = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._progress: Dict[int, Tuple[int, str]] = {}
+
+    def start(self) -> None:
+        """Start the missing workers, replacing any that died; safe to call on every submit"""
+        with self._lock:
+            self._stop.clear()
+            threads = []
+            for n in range(self.workers):
+                thread = self._threads[n] if n < len(self._threads) else None
+                if thread is None or not thread.is_alive():
+                    if thread is not None:
+                        log.warning("job worker died, starting a new one", extra={"worker": thread.name})
+                    thread = threading.Thread(target=self._thread, name=f"job-worker-{n}", daemon=True)
+                    thread.start()
+                threads.append(thread)
+            self._threads = threads
+
+    def stop(self) -> None:
+        with self._lock:
+            threads, self._threads = self._threads, []
+        self._stop.set()
+        self._wake.set()
+        for thread in threads:
+            thread.join()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def progress(self, job_id: int) -> Optional[Tuple[int, str]]:
+        return self._progress.get(job_id)
+
+    def _thread(self) -> None:
+        asyncio.run(self._work())
+
+    async def _work(self) -> None:
+        engine = workerEngine()
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        delay = RETRY_SECONDS
+        try:
+            while not self._stop.is_set():
+                try:
+                    job = await self._claim(sessions)
+                    if job is not None:
+                        await self._run(sessions, *job)
+                except Exception:
+                    # Un error (p. ej. "database is locked") no debe matar al trabajador
+                    log.exception("job worker error, retrying", extra={"retry_seconds": delay})
+                    self._stop.wait(delay)
+                    delay = min(delay * 2, RETRY_MAX_SECONDS)
+                    continue
+                delay = RETRY_SECONDS
+                if job is None:
+                    # Nada pendiente: espera un aviso de submit() o el siguiente sondeo
+                    self._wake.wait(self.poll)
+                    self._wake.clear()
+        finally:
+            await engine.dispose()
+
+    async def _claim(self, sessions) -> Optional[Tuple[int, str, int]]:
+        # UPDATE con subconsulta: dos trabajadores nunca reclaman el mismo trabajo.
+        # También se reclaman los trabajos con el arriendo vencido.
+        claimable = or_(_jobs.c.status == "queued", _expired(self.lease))
+        next_job = select(_jobs.c.id).where(claimable).order_by(_jobs.c.id).limit(1)
+        now = datetime.now()
+        async with sessions() as db:
+            row = (await db.execute(
+                update(_jobs)
+                .where(_jobs.c.id == next_job.scalar_subquery(), claimable)
+                .values(status="running", owner=self.owner, heartbeat_at=now, started_at=now,
+                        attempts=_jobs.c.attempts + 1, progress=0, stage=None)
+                .returning(_jobs.c.id, _jobs.c.kind, _jobs.c.tournament_id)
+            )).first()
+            await db.commit()
+        return tuple(row) if row else None
+
+    async def _run(self, sessions, job_id: int, kind: str, tournament_id: int) -> None:
+        def progress(percent: int, stage: str) -> None:
+            self._progress[job_id] = (percent, stage)
+
+        heartbeat = asyncio.create_task(self._heartbeat(sessions, job_id))
+        try:
+            async with sessions() as db:
+                try:
+                    result, announce = await JOB_KINDS[kind](db, tournament_id, progress)
+                    if not await self._finish(db, job_id, status="done", progress=100, stage=None,
+                                              result=json.dumps(result, default=str)):
+                        # Otro trabajador lo reclamó (arriendo vencido): su ejecución es la válida
+                        await db.rollback()
+                        log.warning("job lease lost, discarding its work", extra={"job_id": job_id, "kind": kind})
+                        return
+                    await db.commit()
+                except HTTPException as e:
+                    await db.rollback()
+                    await self._finish(db, job_id, status="failed", error=str(e.detail),
+                                       error_status=e.status_code)
+                    await db.commit()
+                    return
+                except Exception as e:
+                    await db.rollback()
+                    log.exception("job failed", extra={"job_id": job_id, "kind": kind,
+                                                       "tournament_id": tournament_id})
+                    await self._finish(db, job_id, status="failed", error=str(e), error_status=500)
+                    await db.commit()
+                    return
+                log.info("job done", extra={"job_id": job_id, "kind": kind, "tournament_id": tournament_id})
+                try:
+                    await announce()
+                except Exception:
+                    # El trabajo ya está guardado: solo se pierde el aviso en vivo
+                    log.exception("job announce failed", extra={"job_id": job_id, "kind": kind})
+        finally:
+            heartbeat.cancel()
+            self._progress.pop(job_id, None)
+
+    async def _heartbeat(self, sessions, job_id: int) -> None:
+        """Refresh the lease of a running job until cancelled"""
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            try:
+                async with sessions() as db:
+                    await db.execute(update(_jobs).where(self._owned(job_id)).values(heartbeat_at=datetime.now()))
+                    await db.commit()
+            except Exception:
+                # Normalmente el propio trabajo tiene el bloqueo de escritura; se reintenta en el siguiente latido
+                log.warning("job heartbeat failed", extra={"job_id": job_id}, exc_info=True)
+
+    def _owned(self, job_id: int):
+        return and_(_jobs.c.id == job_id, _jobs.c.status == "running", _jobs.c.owner == self.owner)
+
+    async def _finish(self, db: AsyncSession, job_id: int, **values) -> bool:
+        """Store the outcome if this worker still holds the job; False if its lease was lost"""
+        result = await db.execute(update(_jobs).where(self._owned(job_id))
+                                  .values(finished_at=datetime.now(), **values))
+        return result.rowcount == 1
+
+
+runner = JobRunner()
+
+
+async def recover(db: AsyncSession, lease: float = JOB_LEASE_SECONDS) -> int:
+    """Queue again the jobs left running by a stopped process; returns how many.
+
+    Only jobs whose lease expired are requeued: a job whose heartbeat is
+    recent is still running in another process. Their work was never
+    committed (it commits with the job status), and the operations check the
+    tournament state, so running one again is harmless.
+    """
+    result = await db.execute(update(_jobs).where(_expired(lease)).values(status="queued", owner=None))
+    await db.commit()
+    return result.rowcount
+
+
+async def submit(db: AsyncSession, kind: str, tournament_id: int,
+                 idempotency_key: Optional[str] = None) -> Tuple[Jobs, bool]:
+    """Queue an operation; returns (job, created). A retry gets the existing job."""
+    if idempotency_key:
+        job = await db.scalar(select(Jobs).where(Jobs.idempotency_key == idempotency_key))
+        if job:
+            if (job.kind, job.tournament_id) != (kind, tournament_id):
+                raise HTTPException(status_code=422, detail="Idempotency-Key already used for another operation")
+            return job, False
+
+    active = select(Jobs).where(Jobs.kind == kind, Jobs.tournament_id == tournament_id,
+                                Jobs.status.in_(ACTIVE))
+    job = await db.scalar(active)
+    if job:
+        return job, False
+
+    job = Jobs(kind=kind, tournament_id=tournament_id, status="queued", progress=0,
+               attempts=0, idempotency_key=idempotency_key, created_at=datetime.now())
+    db.add(job)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Otra petición creó el mismo trabajo a la vez (índices únicos)
+        await db.rollback()
+        job = await db.scalar(active)
+        if job is None and idempotency_key:
+            job = await db.scalar(select(Jobs).where(Jobs.idempotency_key == idempotency_key))
+        if job is None:
+            raise
+        return job, False
+    runner.start()
+    runner.wake()
+    return job, True
+
+
+def describe(job: Jobs) -> dict:
+    """Job as returned by the API, with the live progress of a running job"""
+    progress, stage = job.progress, job.stage
+    if job.status == "running":
+        progress, stage = runner.progress(job.id) or (progress, stage)
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "tournament_id": job.tournament_id,
+        "status": job.status,
+        "progress": progress,
+        "stage": stage,
+        "result": json.loads(job.result) if job.result else None,
+        "error": job.error,
+        "error_status": job.error_status,
+        "attempts": job.attempts,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
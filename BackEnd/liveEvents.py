@@ -0,0 +1,170 @@
+"""Push channel for live tournament updates (server-sent events).
+
+Write endpoints publish compact diffs after they commit; spectators keep one
+GET /tournament/{id}/events stream open instead of polling the whole
+tournament. Subscribers live in this process only, and nothing is published
+for tournaments nobody is watching, so clients reload the tournament once
+when they (re)connect and then apply the diffs.
+"""
+import asyncio
+import json
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Matches, TournamentScores
+
+# Eventos pendientes por cliente; si un cliente lento lo supera se le desconecta
+SUBSCRIBER_QUEUE = 256
+# Comentario keep-alive para que los proxies no corten la conexión
+HEARTBEAT_SECONDS = 15
+
+Event = Tuple[int, str, str]  # (id, tipo, datos JSON)
+
+
+class _Subscriber:
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(SUBSCRIBER_QUEUE)
+        self.overflowed = False
+
+    def push(self, event: Optional[Event]) -> None:
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Cliente demasiado lento: se le cierra el stream y deberá reconectar
+            self.overflowed = True
+            self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class Broker:
+    """Per-tournament fan-out of events to the open streams"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, Set[_Subscriber]] = {}
+        self._lastId: Dict[int, int] = {}
+
+    def hasSubscribers(self, tournament_id: int) -> bool:
+        return bool(self._subscribers.get(tournament_id))
+
+    def subscribe(self, tournament_id: int) -> _Subscriber:
+        subscriber = _Subscriber(asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.setdefault(tournament_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, tournament_id: int, subscriber: _Subscriber) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(tournament_id)
+            if subscribers:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[tournament_id]
+                    self._lastId.pop(tournament_id, None)
+
+    def publish(self, tournament_id: int, kind: str, data) -> None:
+        """Queue an event for every stream of the tournament; safe from any thread"""
+        with self._lock:
+            eventId = self._lastId.get(tournament_id, 0) + 1
+            self._lastId[tournament_id] = eventId
+            event = (eventId, kind, json.dumps(data, separators=(",", ":"), default=str))
+            subscribers = list(self._subscribers.get(tournament_id, ()))
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        for subscriber in subscribers:
+            if running is subscriber.loop:
+                subscriber.push(event)
+            else:
+                subscriber.loop.call_soon_threadsafe(subscriber.push, event)
+
+    def close(self, tournament_id: int) -> None:
+        """Close every stream of a tournament (e.g. it was deleted)"""
+        with self._lock:
+            self._lastId.pop(tournament_id, None)
+            subscribers = self._subscribers.pop(tournament_id, set())
+        for subscriber in subscribers:
+            subscriber.loop.call_soon_threadsafe(subscriber.push, None)
+
+
+broker = Broker()
+
+
+def formatEvent(event: Event) -> str:
+    eventId, kind, data = event
+    return f"id: {eventId}\nevent: {kind}\ndata: {data}\n\n"
+
+
+async def stream(tournament_id: int):
+    """Async generator of SSE frames for one client"""
+    subscriber = broker.subscribe(tournament_id)
+    try:
+        # Pide al navegador reconectar a los 3 s si se corta
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if event is None:
+                return
+            yield formatEvent(event)
+    finally:
+        broker.unsubscribe(tournament_id, subscriber)
+
+
+async def standingsRows(db: AsyncSession, tournament_id: int) -> List[Dict]:
+    """Compact standings rows (no names) for the standings event"""
+    rows = await db.execute(
+        select(TournamentScores.player_id, TournamentScores.score, TournamentScores.wins,
+               TournamentScores.draws, TournamentScores.losses, TournamentScores.buchholz,
+               TournamentScores.position)
+        .where(TournamentScores.tournament_id == tournament_id)
+        .order_by(TournamentScores.position.is_(None), TournamentScores.position)
+    )
+    return [dict(row._mapping) for row in rows]
+
+
+def matchDiff(match: Matches) -> Dict:
+    return {"id": match.id, "phase": match.phase, "status": match.status,
+            "win": match.win, "draw": match.draw}
+
+
+async def publishResults(db: AsyncSession, matches: List[Matches]) -> None:
+    """Publish the result of each match, the bracket seats it filled and the new standings"""
+    byTournament: Dict[int, List[Matches]] = {}
+    for match in matches:
+        byTournament.setdefault(match.tournament_id, []).append(match)
+    for tournament_id, played in byTournament.items():
+        if not broker.hasSubscribers(tournament_id):
+            continue
+        diffs = [matchDiff(m) for m in played]
+        fed = [m.next_match_id for m in played if m.next_match_id is not None]
+        if fed:
+            # Partidas del cuadro en las que se acaba de sentar a los ganadores
+            rows = await db.execute(
+                select(Matches.id, Matches.player1_id, Matches.player2_id).where(Matches.id.in_(fed))
+            )
+            diffs.extend(dict(r._mapping) for r in rows)
+        broker.publish(tournament_id, "results", {"matches": diffs})
+        broker.publish(tournament_id, "standings", {"scores": await standingsRows(db, tournament_id)})
+
+
+async def publishPhase(db: AsyncSession, tournament_id: int, phase: int, match_ids: List[int]) -> None:
+    """Publish a new phase with its matches"""
+    if not broker.hasSubscribers(tournament_id):
+        return
+    rows = await db.execute(
+        select(Matches.id, Matches.player1_id, Matches.player2_id, Matches.phase,
+               Matches.status, Matches.win, Matches.draw)
+        .where(Matches.id.in_(match_ids))
+    )
+    broker.publish(tournament_id, "phase", {"phase": phase, "matches": [dict(r._mapping) for r in rows]})
+    broker.publish(tournament_id, "standings", {"scores": await standingsRows(db, tournament_id)})
@@ -0,0 +1,32 @@
+"""Eager-loading strategies for each endpoint.
+
+AsyncSession cannot lazy load, and per-row lazy loads are what turned the
+list endpoints into N+1 queries. Each endpoint uses one of these option sets,
+so the number of statements it issues stays fixed as the tables grow:
+collections use selectinload (one extra SELECT ... IN per relationship) and
+many-to-one references use joinedload (same statement).
+
+The tournament and player reads no longer load ORM objects: readModels.py
+builds their bodies from column queries with the same fixed statement count.
+"""
+from sqlalchemy.orm import selectinload, joinedload
+
+from models import Players, Tournament, TournamentScores
+
+# GET /scores/{id}, GET /scores/player/{id}
+SCORE_WITH_OWNERS = (
+    joinedload(TournamentScores.tournament),
+    joinedload(TournamentScores.player),
+)
+
+# Deletes must see every dependent collection so the ORM can clean it up
+PLAYER_DELETE = (
+    selectinload(Players.tournament),
+    selectinload(Players.tournament_scores),
+)
+
+TOURNAMENT_DELETE = (
+    selectinload(Tournament.players),
+    selectinload(Tournament.scores),
+    selectinload(Tournament.matches),
+)
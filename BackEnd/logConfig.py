@@ -0,0 +1,81 @@
+import json
+import logging
+import logging.handlers
+import queue
+import time
+import atexit
+from contextvars import ContextVar
+from typing import Optional
+
+from config import LOG_LEVEL, LOG_FORMAT
+
+# Id de correlación de la petición en curso (lo fija el middleware de main.py)
+requestId: ContextVar[Optional[str]] = ContextVar("requestId", default=None)
+
+# Atributos estándar de LogRecord; el resto son campos pasados con extra={...}
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+
+class _RequestIdFilter(logging.Filter):
+    """Attach the current correlation id to every record"""
+    def filter(self, record):
+        record.request_id = requestId.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the message, level, request id and extra fields"""
+    def format(self, record):
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        entry.update({k: v for k, v in vars(record).items() if k not in _RESERVED})
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human readable lines for local development"""
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s")
+
+    def format(self, record):
+        line = super().format(record)
+        extra = {k: v for k, v in vars(record).items() if k not in _RESERVED}
+        return f"{line} {extra}" if extra else line
+
+
+def setupLogging() -> None:
+    """Configure the "magic" logger once.
+
+    Records go through a QueueHandler and are written to stderr by a
+    background QueueListener thread, so request handlers never block on I/O.
+    """
+    root = logging.getLogger("magic")
+    if root.handlers:
+        return
+    records: queue.Queue = queue.Queue(-1)
+    # QueueHandler formatea antes de encolar (y descarta exc_info), así que
+    # el formato va aquí y el hilo de escritura solo vuelca el texto
+    handler = logging.handlers.QueueHandler(records)
+    handler.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else TextFormatter())
+    handler.addFilter(_RequestIdFilter())
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter("%(message)s"))
+    root.addHandler(handler)
+    root.setLevel(LOG_LEVEL)
+    root.propagate = False
+    listener = logging.handlers.QueueListener(records, stream)
+    listener.start()
+    atexit.register(listener.stop)
+
+
+def getLogger(name: str) -> logging.Logger:
+    """Logger under the "magic" namespace, e.g. getLogger("api")"""
+    setupLogging()
+    return logging.getLogger(f"magic.{name}")
@@ -1,22 +1,89 @@
 #[ ] Agregar métodos para terminar un torneo y guardar los resultados
 
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Union, List
-from fastapi import FastAPI, HTTPException
+from typing import Union, List, Optional
+from fastapi import FastAPI, HTTPException, Depends, Response, Request, Query, Header
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from fastapi import FastAPI
 from pydantic import BaseModel
-from models import Players, session, Tournament, Matches, TournamentScores
-from matchGeneration import generateMatches, generateNextPhaseMatches
+from sqlalchemy import select, insert, delete, update, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import Players, engine, get_db, Tournament, Matches, TournamentScores, PlayerStats, Jobs, SessionLocal, tournamentsPlayers
 from fastapi.middleware.cors import CORSMiddleware
-from schemas import TournamentBase, PlayerBase, MatchBase, TournamentScoreBase
-
-
-app = FastAPI()
+from schemas import TournamentBase, PlayerBase, MatchBase, TournamentScoreBase, StandingBase, PlayerStatsBase, JobBase
+import loaders
+import readModels
+import standings
+import playerStats
+import rosterImport
+import dataExport
+import jobs
+import idempotency
+import pagination
+from pagination import CursorQuery, LimitQuery, FieldsQuery
+import metrics
+import liveEvents
+import versions
+import seeding
+import cache
+from cache import responseCache
+from liveEvents import broker
+from config import METRICS_ENABLED
+from logConfig import getLogger, requestId
+import time
+import uuid
+
+log = getLogger("api")
+
+# Cabecera con el id de correlación (se respeta si la trae el cliente)
+REQUEST_ID_HEADER = "X-Request-ID"
+
+if METRICS_ENABLED:
+    metrics.instrumentEngine(engine.sync_engine)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Trabajos que quedaron a medias en un arranque anterior
+    async with SessionLocal() as db:
+        await jobs.recover(db)
+    jobs.runner.start()
+    yield
+    jobs.runner.stop()
+    # Cierra las conexiones del pool al apagar el servidor
+    await engine.dispose()
+
+app = FastAPI(lifespan=lifespan)
 
 # Configuración de CORS
 origin = ["*"]
-app.add_middleware(CORSMiddleware, allow_origins=origin, allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
+app.add_middleware(CORSMiddleware, allow_origins=origin, allow_credentials=True, allow_methods=["*"], allow_headers=["*"],
+                   expose_headers=[pagination.NEXT_CURSOR_HEADER, REQUEST_ID_HEADER, "ETag",
+                                   idempotency.REPLAYED_HEADER])
+
+@app.middleware("http")
+async def requestContext(request: Request, call_next):
+    """Tag the request with a correlation id, log it and record its latency"""
+    rid = request.headers.get(REQUEST_ID_HEADER) or uuid.uuid4().hex
+    token = requestId.set(rid)
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        response.headers[REQUEST_ID_HEADER] = rid
+        return response
+    finally:
+        elapsed = time.perf_counter() - start
+        # Plantilla de la ruta (/tournament/{tournament_id}) para no disparar la cardinalidad
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        if METRICS_ENABLED:
+            metrics.observeRequest(request.method, route, status, elapsed)
+        log.info("request", extra={"method": request.method, "route": route, "status": status,
+                                   "duration_ms": round(elapsed * 1000, 2)})
+        requestId.reset(token)
 
 # Configuración de la base de datos
 class tabPlayers(BaseModel):
@@ -28,570 +95,674 @@ class tabTournament(BaseModel):
     name:str
     #createDate:str|None = datetime.now().strftime("%Y-%m-%d")
     type:str
+    seeding:str = "random"
+    seed:Optional[int] = None
+
+# Operaciones largas: ?background=true las encola como trabajo (ver jobs.py)
+BackgroundQuery = Query(False, description="Queue the operation as a job and return its id")
+
+# Reintentos seguros: trabajos (jobs.py) y resultados (idempotency.py)
+IdempotencyHeader = Header(None, alias="Idempotency-Key")
+
+# Formato del cuerpo de una importación; por defecto según Content-Type
+ImportFormatQuery = Query(None, alias="format", description="csv, ndjson or json (default: from Content-Type)")
+
+class tabMatchResult(BaseModel):
+    match_id:int
+    winner_id:int
+    draw:bool = False
 
 
 @app.get("/")
 def read_root():
     return {"Description": "Magic Tournament API"}
 
+@app.get("/metrics", include_in_schema=False)
+def readMetrics():
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4")
+
 # métodos relacionados con jugadores
 @app.get("/player", response_model=List[PlayerBase])
-async def readPlayer():
-    players = session.query(Players).all()
-    return players
+async def readPlayer(cursor: Optional[int] = CursorQuery, limit: int = LimitQuery,
+                     fields: Optional[str] = FieldsQuery, db: AsyncSession = Depends(get_db)):
+    return await pagination.fetchPage(
+        db, Players, PlayerBase,
+        cursor=cursor, limit=limit, fields=fields,
+        relationships=readModels.PLAYER_LIST_NESTED,
+    )
 
 @app.get("/player/{player_id}", response_model=PlayerBase)
-async def readPlayer(player_id: int):
+async def readPlayer(player_id: int, db: AsyncSession = Depends(get_db)):
+    key = ("player", player_id)
+    body = responseCache.get(key)
+    if body is not None:
+        return cache.jsonResponse(body)
+    since = responseCache.epoch()
+
     try:
-        player = session.query(Players).filter(Players.id == player_id).first()
+        player = await readModels.playerDetail(db, player_id)
         if not player:
             raise HTTPException(
                 status_code=404,
                 detail="Player not found"
             )
 
-        return player
+        body = readModels.dumps(player)
+        responseCache.set(key, body, [f"player:{player_id}", f"rating:{player_id}"]
+                          + [f"tournament:{t['id']}" for t in player["tournament"]], since)
+        return cache.jsonResponse(body)
 
     except HTTPException as he:
         raise he
     except Exception as e:
+        log.exception("request failed")
         raise HTTPException(
             status_code=500,
             detail=f"Error retrieving player: {str(e)}"
         )
 
+@app.get("/player/{player_id}/stats", response_model=PlayerStatsBase)
+async def readPlayerStats(player_id: int, db: AsyncSession = Depends(get_db)):
+    # Una fila mantenida por playerStats: no se recorren partidas ni puntuaciones
+    row = (await db.execute(
+        select(Players.id, PlayerStats)
+        .outerjoin(PlayerStats, PlayerStats.player_id == Players.id)
+        .where(Players.id == player_id)
+    )).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Player not found")
+    stats = row.PlayerStats
+    if stats is None:
+        return PlayerStatsBase(player_id=player_id)
+    return PlayerStatsBase(
+        player_id=player_id,
+        matches_played=stats.wins + stats.draws + stats.losses,
+        **{name: getattr(stats, name) for name in playerStats.COUNTERS},
+    )
+
 @app.post("/player")
-async def createUser(tabuser: tabPlayers):
+async def createUser(tabuser: tabPlayers, db: AsyncSession = Depends(get_db)):
     newPlayer = Players(
         name=tabuser.name,
         creationDate=datetime.now(),
         personalScore=0
     )
-    session.add(newPlayer)
-    session.commit()
+    db.add(newPlayer)
+    await db.commit()
     return {"message": "Player added"}
 
+async def importRoster(request: Request, fmt: Optional[str], db: AsyncSession,
+                       tournament_id: Optional[int] = None) -> dict:
+    """Stream the request body through rosterImport and summarize the per-row results"""
+    fmt = fmt or rosterImport.formatFor(request.headers.get("content-type"))
+    if fmt not in rosterImport.IMPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Invalid import format: {fmt}")
+    try:
+        results = await rosterImport.importRoster(db, request.stream(), fmt, tournament_id)
+    except ValueError as e:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "rows": len(results),
+        "created": sum(r["status"] == "created" for r in results),
+        "registered": sum(bool(r.get("registered")) for r in results),
+        "errors": sum(r["status"] == "error" for r in results),
+        "results": results,
+    }
+
+@app.post("/player/import")
+async def importPlayers(request: Request, fmt: Optional[str] = ImportFormatQuery, db: AsyncSession = Depends(get_db)):
+    """Create the players of a CSV/NDJSON/JSON roster that do not exist yet (matched by name)"""
+    report = await importRoster(request, fmt, db)
+    await db.commit()
+    return {"message": "Players imported", **report}
+
 @app.patch("/player/{player_id}/score")
-async def updatePlayerScore(player_id: int, score: int):
-    player = session.query(Players).filter(Players.id == player_id).first()
+async def updatePlayerScore(player_id: int, score: int, db: AsyncSession = Depends(get_db)):
+    player = await db.scalar(select(Players).where(Players.id == player_id))
     if not player:
         return {"message":"Player not found"}
     player.personalScore = score
-    session.commit()
+    await versions.bumpPlayerTournaments(db, player_id)
+    await db.commit()
     return {"message": "Player not found"}
 
 @app.delete("/player/{player_id}")
-async def deletePlayer(player_id: int):
-    player = session.query(Players).filter(Players.id == player_id).first()
+async def deletePlayer(player_id: int, db: AsyncSession = Depends(get_db)):
+    # Las relaciones se cargan antes de borrar: AsyncSession no permite cargas perezosas
+    player = await db.scalar(
+        select(Players)
+        .options(*loaders.PLAYER_DELETE)
+        .where(Players.id == player_id)
+    )
     if not player:
         return {"message":"Player not found"}
-    session.delete(player)
-    session.commit()
+    await versions.bumpPlayerTournaments(db, player_id)
+    await db.execute(delete(PlayerStats).where(PlayerStats.player_id == player_id))
+    await db.delete(player)
+    await db.commit()
     return {"message": "Player deleted"}
 
 # Torneos
 
 
 @app.get("/tournament", response_model=List[TournamentBase])
-async def getAllTournament():
+async def getAllTournament(cursor: Optional[int] = CursorQuery, limit: int = LimitQuery,
+                           fields: Optional[str] = FieldsQuery, db: AsyncSession = Depends(get_db)):
     try:
-        tournaments = session.query(Tournament).all()
-        # Filter out invalid matches before returning
-        for tournament in tournaments:
-            tournament.matches = [
-                match for match in tournament.matches
-                if match.player1_id is not None and match.player2_id is not None
-            ]
-        return tournaments
+        # Matches without both players are filtered out by the loader
+        return await pagination.fetchPage(
+            db, Tournament, TournamentBase,
+            cursor=cursor, limit=limit, fields=fields,
+            relationships=readModels.TOURNAMENT_LIST_NESTED,
+        )
+    except HTTPException as he:
+        raise he
     except Exception as e:
+        log.exception("request failed")
         raise HTTPException(
             status_code=500,
             detail=f"Internal server error: {str(e)}"
         )
 
 @app.get("/tournament/{tournament_id}", response_model=TournamentBase)
-async def getTournament(tournament_id: int):
+async def getTournament(tournament_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_db)):
+    # Petición condicional: si el cliente tiene la versión actual no se carga nada más
+    version = await versions.tournamentVersion(db, tournament_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+    unchanged = versions.notModified(request, response, versions.makeETag(tournament_id, version))
+    if unchanged:
+        return unchanged
+
+    # La versión forma parte de la clave: una entrada nunca sirve datos viejos
+    key = ("tournament", tournament_id, version)
+    body = responseCache.get(key)
+    if body is not None:
+        return cache.jsonResponse(body, response)
+    since = responseCache.epoch()
+
     try:
-        tournament = session.query(Tournament).filter(Tournament.id == tournament_id).first()
+        # Columnas a diccionarios con la forma de TournamentBase (readModels)
+        tournament = await readModels.tournamentDetail(db, tournament_id)
         if not tournament:
             raise HTTPException(status_code=404, detail="Tournament not found")
 
-        # Get standings if tournament is finished
-        final_standings = []
-        if tournament.status:
-            scores = session.query(TournamentScores).filter(
-                TournamentScores.tournament_id == tournament_id
-            ).order_by(TournamentScores.score.desc()).all()
-
-            final_standings = [
-                {
-                    "position": i + 1,
-                    "player_id": score.player_id,
-                    "player_name": score.player.name,
-                    "final_score": score.score
-                }
-                for i, score in enumerate(scores)
-            ]
-
-        # Create a clean dictionary without circular references
-        tournament_data = {
-            "id": tournament.id,
-            "name": tournament.name,
-            "type": tournament.type,
-            "creationDate": tournament.creationDate,
-            "status": tournament.status,
-            "currentPhase": tournament.currentPhase,  # Add current phase
-            "players": [
-                {
-                    "id": p.id,
-                    "name": p.name,
-                    "creationDate": p.creationDate,
-                    "personalScore": p.personalScore,
-                    "tournament": []  # Avoid circular reference
-                } for p in tournament.players
-            ],
-            "matches": [
-                {
-                    "id": m.id,
-                    "tournament_id": m.tournament_id,
-                    "player1_id": m.player1_id,
-                    "player2_id": m.player2_id,
-                    "win": m.win,
-                    "status": m.status,
-                    "draw": m.draw,
-                    "phase": m.phase  # Add phase information
-                } for m in tournament.matches
-            ],
-            "scores": [
-                {
-                    "id": s.id,
-                    "tournament_id": s.tournament_id,
-                    "player_id": s.player_id,
-                    "score": s.score
-                } for s in tournament.scores
-            ],
-            "final_standings": final_standings
-        }
-
-        return tournament_data
+        body = readModels.dumps(tournament)
+        responseCache.set(key, body, [f"tournament:{tournament_id}"]
+                          + [f"player:{p['id']}" for p in tournament["players"]], since)
+        return cache.jsonResponse(body, response)
 
     except Exception as e:
+        log.exception("request failed")
         raise HTTPException(
             status_code=500,
             detail=f"Error retrieving tournament: {str(e)}"
         )
 
+@app.get("/tournament/{tournament_id}/events")
+async def tournamentEvents(tournament_id: int, db: AsyncSession = Depends(get_db)):
+    """Server-sent events with the live updates of a tournament"""
+    exists = await db.scalar(select(Tournament.id).where(Tournament.id == tournament_id))
+    if not exists:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+    # La sesión no se usa durante el stream: se libera la conexión ya
+    await db.close()
+    return StreamingResponse(
+        liveEvents.stream(tournament_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/tournament/{tournament_id}/standings", response_model=List[StandingBase])
+async def getTournamentStandings(tournament_id: int, request: Request, response: Response,
+                                 db: AsyncSession = Depends(get_db)):
+    version = await versions.tournamentVersion(db, tournament_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+    unchanged = versions.notModified(request, response, versions.makeETag(tournament_id, version))
+    if unchanged:
+        return unchanged
+    return await standings.getStandings(db, tournament_id)
+
 @app.post("/tournament")
-async def createTournament(tabtournament: tabTournament):
+async def createTournament(tabtournament: tabTournament, db: AsyncSession = Depends(get_db)):
+    if tabtournament.seeding not in seeding.SEEDING_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid seeding mode: {tabtournament.seeding}")
     newTournament = Tournament(
         name=tabtournament.name,
         creationDate=datetime.now(),
         type=tabtournament.type,
         players=[],
-        status=False
+        status=False,
+        seeding=tabtournament.seeding,
+        # Con la misma semilla y los mismos jugadores se obtiene el mismo cuadro
+        seed=tabtournament.seed if tabtournament.seed is not None else seeding.newSeed(),
         )
-    session.add(newTournament)
-    session.commit()
-    return {"message": "Tournament added"}
+    db.add(newTournament)
+    await db.commit()
+    return {"message": "Tournament added", "id": newTournament.id}
 
 @app.post("/tournament/{tournament_id}/player/{player_id}")
-async def addPlayerToTournament(tournament_id: int, player_id: int):
-    tournament = session.query(Tournament).filter(Tournament.id == tournament_id).first()
+async def addPlayerToTournament(tournament_id: int, player_id: int, db: AsyncSession = Depends(get_db)):
+    tournament = await db.scalar(select(Tournament).where(Tournament.id == tournament_id))
     if not tournament:
         return {"message": "Tournament not found"}
 
-    player = session.query(Players).filter(Players.id == player_id).first()
+    player = await db.scalar(select(Players.id).where(Players.id == player_id))
     if not player:
         return {"message": "Player not found"}
 
-    if player in tournament.players:
+    # EXISTS sobre la clave primaria en lugar de cargar la lista de jugadores
+    if await tournament.has_player(db, player_id):
         return {"message": "This player is in the tournament"}
 
-    tournament.players.append(player)
+    await db.execute(insert(tournamentsPlayers).values(tournament_id=tournament_id, player_id=player_id))
     score = TournamentScores(
                         tournament_id = tournament_id,
                         player_id = player_id,
                         score = 0
                     )
-    session.add(score)
-    session.commit()
+    db.add(score)
+    await db.flush()
+    await standings.placeNewPlayer(db, tournament_id, player_id)
+    await versions.bumpVersion(db, tournament_id)
+    # La lista de torneos y puntajes del jugador también cambia
+    cache.touch(db, f"player:{player_id}")
+    await db.commit()
     return {"message": "Player added to tournament"}
 
+@app.post("/tournament/{tournament_id}/import")
+async def importTournamentPlayers(tournament_id: int, request: Request, fmt: Optional[str] = ImportFormatQuery,
+                                  db: AsyncSession = Depends(get_db)):
+    """Register a whole CSV/NDJSON/JSON roster in one transaction, creating missing players"""
+    tournament = await db.scalar(select(Tournament.id).where(Tournament.id == tournament_id))
+    if not tournament:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+
+    report = await importRoster(request, fmt, db, tournament_id)
+    registered = [r["player_id"] for r in report["results"] if r.get("registered")]
+    if registered:
+        # Los recién llegados no tienen puntos: una sola reordenación al final
+        await standings.refreshPositions(db, tournament_id)
+        await versions.bumpVersion(db, tournament_id)
+        cache.touch(db, *(f"player:{pid}" for pid in registered))
+    await db.commit()
+    return {"message": "Roster imported", **report}
+
 @app.delete("/tournament/{tournament_id}/player/{player_id}")
-async def removePlayerFromTournament(tournament_id: int, player_id: int):
+async def removePlayerFromTournament(tournament_id: int, player_id: int, db: AsyncSession = Depends(get_db)):
     try:
-        tournament = session.query(Tournament).filter(Tournament.id == tournament_id).first()
+        tournament = await db.scalar(select(Tournament).where(Tournament.id == tournament_id))
         if not tournament:
             raise HTTPException(status_code=404, detail="Tournament not found")
 
-        player = session.query(Players).filter(Players.id == player_id).first()
+        player = await db.scalar(select(Players.id).where(Players.id == player_id))
         if not player:
             raise HTTPException(status_code=404, detail="Player not found")
 
-        if player not in tournament.players:
+        if not await tournament.has_player(db, player_id):
             raise HTTPException(status_code=400, detail="Player not in tournament")
 
         # Remove player from tournament
-        tournament.players.remove(player)
+        await db.execute(delete(tournamentsPlayers).where(
+            tournamentsPlayers.c.tournament_id == tournament_id,
+            tournamentsPlayers.c.player_id == player_id,
+        ))
 
         # Remove player's tournament score
-        tournament_score = session.query(TournamentScores).filter(
+        tournament_score = await db.scalar(select(TournamentScores).where(
             TournamentScores.tournament_id == tournament_id,
             TournamentScores.player_id == player_id
-        ).first()
+        ))
         if tournament_score:
-            session.delete(tournament_score)
+            await db.delete(tournament_score)
+            await db.flush()
+            await standings.refreshPositions(db, tournament_id)
 
-        session.commit()
+        await versions.bumpVersion(db, tournament_id)
+        cache.touch(db, f"player:{player_id}")
+        await db.commit()
         return {"message": "Player removed from tournament"}
 
     except Exception as e:
-        session.rollback()
+        log.exception("request failed")
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error removing player: {str(e)}")
 
 @app.delete("/tournament/{tournament_id}")
-async def deleteTournament(tournament_id: int):
-    tournament = session.query(Tournament).filter(Tournament.id == tournament_id).first()
+async def deleteTournament(tournament_id: int, db: AsyncSession = Depends(get_db)):
+    tournament = await db.scalar(
+        select(Tournament)
+        .options(*loaders.TOURNAMENT_DELETE)
+        .where(Tournament.id == tournament_id)
+    )
     if not tournament:
         return {"message":"Tournament not found"}
-    session.delete(tournament)
-    session.commit()
+    await db.delete(tournament)
+    cache.touch(db, f"tournament:{tournament_id}")
+    await db.commit()
+    broker.close(tournament_id)
     return {"message": "Tournament deleted"}
 
-@app.post("/tournament/{tournament_id}/generate_matches")
-async def generateMatchesAPI(tournament_id: int):
-    print(f"DEBUG: Starting match generation for tournament {tournament_id}")
-    tournament = session.query(Tournament).filter(Tournament.id == tournament_id).first()
-    if not tournament:
-        print(f"DEBUG: Tournament {tournament_id} not found")
-        raise HTTPException(status_code=404, detail="Tournament not found")
-
-    print(f"DEBUG: Tournament type: {tournament.type}")
-    print(f"DEBUG: Number of players: {len(tournament.players)}")
-
-    if len(tournament.players) < 2:
-        print("DEBUG: Not enough players to generate matches")
-        raise HTTPException(status_code=400, detail="Not enough players to generate matches")
-
-    if(tournament.status):
-        print("DEBUG: Tournament is already finished")
-        raise HTTPException(status_code=400, detail="Tournament already finished")
-
+async def runOperation(kind: str, tournament_id: int, background: bool, idempotency_key: Optional[str],
+                       db: AsyncSession):
+    """Run a tournament operation now, or queue it as a job and answer 202 with its id"""
+    if background:
+        exists = await db.scalar(select(Tournament.id).where(Tournament.id == tournament_id))
+        if not exists:
+            raise HTTPException(status_code=404, detail="Tournament not found")
+        job, created = await jobs.submit(db, kind, tournament_id, idempotency_key)
+        return JSONResponse(
+            status_code=202,
+            content={"message": "Job queued" if created else "Job already submitted",
+                     "job_id": job.id, "status": job.status},
+            headers={"Location": f"/jobs/{job.id}"},
+        )
     try:
-        print("DEBUG: Calling generateMatches function")
-        # Get matches and ensure they're Match objects
-        matches = generateMatches(tournament_id)
-        print(f"DEBUG: Generated {len(matches) if matches else 0} matches")
-
-        if not matches:
-            print("DEBUG: No matches were generated")
-            raise HTTPException(
-                status_code=400,
-                detail="No matches were generated"
-            )
-
-        # Ensure each match has the correct tournament_id
-        print("DEBUG: Validating generated matches")
-        for i, match in enumerate(matches):
-            print(f"DEBUG: Validating match {i+1}/{len(matches)}")
-            print(f"DEBUG: Match details - P1: {match.player1_id}, P2: {match.player2_id}")
-
-            if not isinstance(match, Matches):
-                print(f"DEBUG: Invalid match object type: {type(match)}")
-                raise HTTPException(
-                    status_code=500,
-                    detail="Invalid match object generated"
-                )
-
-            match.tournament_id = tournament_id
-            if match.player1_id is None or (match.player2_id is None and not tournament.type == "elimination"):
-                print(f"DEBUG: Invalid match - missing player(s)")
-                raise HTTPException(
-                    status_code=400,
-                    detail="Invalid match generated - missing player"
-                )
-            session.add(match)
-
-        print("DEBUG: Committing matches to database")
-        session.commit()
-        print("DEBUG: Successfully generated and saved matches")
-        return matches
-
+        result, announce = await jobs.JOB_KINDS[kind](db, tournament_id)
+        await db.commit()
+    except HTTPException:
+        await db.rollback()
+        raise
     except Exception as e:
-        session.rollback()
-        print(f"DEBUG: Error generating matches: {str(e)}")
-        print(f"DEBUG: Error type: {type(e)}")
-        import traceback
-        print(f"DEBUG: Stack trace: {traceback.format_exc()}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error generating matches: {str(e)}"
-        )
+        await db.rollback()
+        log.exception("operation failed", extra={"tournament_id": tournament_id, "kind": kind})
+        raise HTTPException(status_code=500, detail=str(e))
+    await announce()
+    return result
+
+@app.post("/tournament/{tournament_id}/generate_matches")
+async def generateMatchesAPI(tournament_id: int, background: bool = BackgroundQuery,
+                             idempotency_key: Optional[str] = IdempotencyHeader,
+                             db: AsyncSession = Depends(get_db)):
+    return await runOperation("generate_matches", tournament_id, background, idempotency_key, db)
 
 #matches
 
 @app.get("/matches", response_model=List[MatchBase])
-async def getMatches():
+async def getMatches(cursor: Optional[int] = CursorQuery, limit: int = LimitQuery,
+                     fields: Optional[str] = FieldsQuery, db: AsyncSession = Depends(get_db)):
     try:
-        matches = session.query(Matches).all()
-        # Filter out invalid matches before returning
-        valid_matches = [
-            match for match in matches
-            if match.player1_id is not None
-        ]
-        return valid_matches
+        # Filter out invalid matches before returning; bracket matches
+        # waiting for their players are valid
+        return await pagination.fetchPage(
+            db, Matches, MatchBase,
+            cursor=cursor, limit=limit, fields=fields,
+            relationships={}, where=[or_(Matches.player1_id.isnot(None), Matches.bracket_slot.isnot(None))],
+        )
+    except HTTPException as he:
+        raise he
     except Exception as e:
+        log.exception("request failed")
         raise HTTPException(
             status_code=500,
             detail=f"Internal server error: {str(e)}"
         )
 
 @app.get("/match/{match_id}", response_model=List[MatchBase])
-async def getMatch(match_id: int):
+async def getMatch(match_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_db)):
+    # La partida cambia siempre junto con la versión de su torneo
+    owner = (await db.execute(
+        select(Tournament.id, Tournament.version)
+        .join(Matches, Matches.tournament_id == Tournament.id)
+        .where(Matches.id == match_id)
+    )).first()
+    if owner:
+        unchanged = versions.notModified(request, response, versions.makeETag(*owner))
+        if unchanged:
+            return unchanged
+
     try:
-        match = session.query(Matches).filter(Matches.id == match_id).first()
+        match = await db.scalar(select(Matches).where(Matches.id == match_id))
         if not match:
             raise HTTPException(status_code=404, detail="Match not found")
 
         # Return as a list to match the response_model
         return [match]
     except Exception as e:
+        log.exception("request failed")
         raise HTTPException(
             status_code=500,
             detail=f"Error retrieving match: {str(e)}"
         )
 
+RESULT_ALREADY_SET = "Result already set"
+
+def resultError(match: Matches, winner_id: int, claimed: bool) -> Optional[str]:
+    """Return why a result cannot be set on this match, or None if it can.
+
+    ``claimed`` tells whether standings.claimMatches took the match for this request.
+    """
+    if not claimed:
+        if match.status:
+            return RESULT_ALREADY_SET
+        return "Match players are not decided yet"
+    if winner_id not in [match.player1_id, match.player2_id]:
+        return "Winner not found in this match"
+    return None
+
+@app.post("/match/results")
+async def setWinners(results: List[tabMatchResult], request: Request, atomic: bool = False,
+                     idempotency_key: Optional[str] = IdempotencyHeader, db: AsyncSession = Depends(get_db)):
+    """Set a whole round of results in one transaction.
+
+    Invalid items are reported per item and skipped; with atomic=true any
+    invalid item rejects the whole batch. A match whose result is already
+    set is reported as such, also when another request set it concurrently.
+    """
+    try:
+        if idempotency_key:
+            replay = await idempotency.reserve(db, idempotency_key, request)
+            if replay:
+                return replay
+
+        ids = [r.match_id for r in results]
+        # Primero la escritura condicional: ningún otro envío puede aplicar estas partidas
+        claimed = await standings.claimMatches(db, ids)
+        matches = {
+            m.id: m for m in (await db.execute(select(Matches).where(Matches.id.in_(ids)))).scalars()
+        }
+
+        report = []
+        valid = []
+        seen = set()
+        for r in results:
+            match = matches.get(r.match_id)
+            if not match:
+                error = "Match not found"
+            elif r.match_id in seen:
+                error = "Duplicated match in batch"
+            else:
+                error = resultError(match, r.winner_id, r.match_id in claimed)
+            seen.add(r.match_id)
+            if error:
+                report.append({"match_id": r.match_id, "status": "error", "detail": error})
+            else:
+                report.append({"match_id": r.match_id, "status": "ok"})
+                valid.append((match, r.winner_id, r.draw))
+
+        if atomic and len(valid) != len(results):
+            await db.rollback()
+            return {"message": "No results set", "applied": 0, "results": report}
+
+        # Partidas reclamadas con un ganador no válido vuelven a quedar pendientes
+        released = claimed - {match.id for match, _, _ in valid}
+        if released:
+            await db.execute(update(Matches).where(Matches.id.in_(released)).values(status=False))
+
+        response = {"message": "Results set successfully", "applied": len(valid), "results": report}
+        if valid:
+            await standings.recordResults(db, valid)
+        if idempotency_key:
+            await idempotency.store(db, idempotency_key, response)
+        await db.commit()
+        if valid:
+            await liveEvents.publishResults(db, [match for match, _, _ in valid])
+        return response
+
+    except HTTPException:
+        await db.rollback()
+        raise
+    except Exception as e:
+        log.exception("request failed")
+        await db.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error setting results: {str(e)}"
+        )
+
 @app.post("/match/{match_id}/{winner_id}/{draw}")
-async def setWinner(match_id: int, winner_id: int, draw: bool):
+async def setWinner(match_id: int, winner_id: int, draw: bool, request: Request,
+                    idempotency_key: Optional[str] = IdempotencyHeader, db: AsyncSession = Depends(get_db)):
     try:
-        match = session.query(Matches).filter(Matches.id == match_id).first()
+        if idempotency_key:
+            replay = await idempotency.reserve(db, idempotency_key, request)
+            if replay:
+                return replay
+
+        # UPDATE ... WHERE status = false antes de leer: de dos envíos simultáneos solo uno gana
+        claimed = await standings.claimMatches(db, [match_id])
+        match = await db.scalar(select(Matches).where(Matches.id == match_id))
         if not match:
             raise HTTPException(status_code=404, detail="Match not found")
 
-        if match.status:
-            raise HTTPException(status_code=400, detail="Result already set")
-
-        if winner_id not in [match.player1_id, match.player2_id]:
-            raise HTTPException(status_code=400, detail="Winner not found in this match")
-
-        # Begin transaction
-        try:
-            if draw:
-                # En caso de empate, se le da 1 punto a cada jugador
-                for player_id in [match.player1_id, match.player2_id]:
-                    score = session.query(TournamentScores).filter(
-                        TournamentScores.tournament_id == match.tournament_id,
-                        TournamentScores.player_id == player_id
-                    ).first()
-                    if score:
-                        score.score += 1
-            else:
-                # En caso de victoria, se le da 3 puntos al ganador
-                score = session.query(TournamentScores).filter(
-                    TournamentScores.tournament_id == match.tournament_id,
-                    TournamentScores.player_id == winner_id
-                ).first()
-                if score:
-                    score.score += 3
-
-            # Update match status
-            match.win = winner_id if not draw else -1
-            match.status = True
-            match.draw = draw
-
-            # Commit all changes
-            session.commit()
-            return {"message": "Winner and scores set successfully"}
-
-        except Exception as e:
-            session.rollback()
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error updating scores: {str(e)}"
-            )
+        error = resultError(match, winner_id, match_id in claimed)
+        if error:
+            raise HTTPException(status_code=409 if error == RESULT_ALREADY_SET else 400, detail=error)
 
+        # Victoria: 3 puntos al ganador; empate: 1 punto a cada jugador.
+        # La clasificación y el estado de la partida se guardan juntos.
+        await standings.recordResults(db, [(match, winner_id, draw)])
+
+        response = {"message": "Winner and scores set successfully"}
+        if idempotency_key:
+            await idempotency.store(db, idempotency_key, response)
+        await db.commit()
+        await liveEvents.publishResults(db, [match])
+        return response
+
+    except HTTPException:
+        await db.rollback()
+        raise
     except Exception as e:
+        log.exception("request failed")
+        await db.rollback()
         raise HTTPException(
             status_code=500,
-            detail=f"Error processing request: {str(e)}"
+            detail=f"Error updating scores: {str(e)}"
         )
 
 @app.delete("/matches/{matches_id}")
-async def deleteMatch(matches_id: int):
-    match = session.query(Matches).filter(Matches.id == matches_id).first()
+async def deleteMatch(matches_id: int, db: AsyncSession = Depends(get_db)):
+    match = await db.scalar(select(Matches).where(Matches.id == matches_id))
     if not match:
         return {"message":"Player not found"}
-    session.delete(match)
-    session.commit()
+    # Un resultado ya aplicado sale del historial de los jugadores y de la clasificación
+    await playerStats.removeResults(db, [match])
+    await db.delete(match)
+    await db.flush()
+    if match.status:
+        await standings.rebuildStandings(db, match.tournament_id)
+    await versions.bumpVersion(db, match.tournament_id)
+    await db.commit()
     return {"message": "Match deleted"}
 
 
 # acceso a puntajes
 
 @app.get("/scores", response_model=List[TournamentScoreBase])
-async def getScores():
-    scores = session.query(TournamentScores).all()
-    return scores
+async def getScores(cursor: Optional[int] = CursorQuery, limit: int = LimitQuery,
+                    fields: Optional[str] = FieldsQuery, db: AsyncSession = Depends(get_db)):
+    return await pagination.fetchPage(
+        db, TournamentScores, TournamentScoreBase,
+        cursor=cursor, limit=limit, fields=fields,
+        relationships={},
+    )
 
 @app.get("/scores/{score_id}")
-async def getScore(score_id: int):
-    score = session.query(TournamentScores).filter(TournamentScores.id == score_id).first()
+async def getScore(score_id: int, db: AsyncSession = Depends(get_db)):
+    score = await db.scalar(
+        select(TournamentScores)
+        .options(*loaders.SCORE_WITH_OWNERS)
+        .where(TournamentScores.id == score_id)
+    )
     return {"id":score.id, "Tournament": score.tournament, "Player": score.player, "Score":score.score}
 
 @app.get("/scores/player/{player_id}")
-async def getScoreByPlayer(player_id: int):
-    scores = session.query(TournamentScores).filter(TournamentScores.player_id == player_id)
-    return [{"id":score.id, "Tournament": score.tournament, "Player": score.player, "Score":score.score} for score in scores]
+async def getScoreByPlayer(player_id: int, db: AsyncSession = Depends(get_db)):
+    key = ("scores", player_id)
+    body = responseCache.get(key)
+    if body is not None:
+        return cache.jsonResponse(body)
+    since = responseCache.epoch()
+
+    scores = (await db.execute(
+        select(TournamentScores)
+        .options(*loaders.SCORE_WITH_OWNERS)
+        .where(TournamentScores.player_id == player_id)
+    )).scalars().all()
+    body = cache.encode([{"id":score.id, "Tournament": score.tournament, "Player": score.player, "Score":score.score} for score in scores])
+    responseCache.set(key, body, [f"player:{player_id}"]
+                      + [f"tournament:{score.tournament_id}" for score in scores], since)
+    return cache.jsonResponse(body)
 
 @app.delete("/scores/{score_id}")
-async def deleteScore(score_id: int):
-    score = session.query(TournamentScores).filter(TournamentScores.id == score_id).first()
+async def deleteScore(score_id: int, db: AsyncSession = Depends(get_db)):
+    score = await db.scalar(select(TournamentScores).where(TournamentScores.id == score_id))
     if not score:
         return {"message":"Score not found"}
-    session.delete(score)
-    session.commit()
+    await db.delete(score)
+    await db.flush()
+    # El Buchholz de sus rivales incluía los puntos de este jugador
+    await standings.rebuildStandings(db, score.tournament_id)
+    await versions.bumpVersion(db, score.tournament_id)
+    await db.commit()
     return {"message": "Score deleted"}
 
-@app.post("/tournament/{tournament_id}/finish")
-async def finishTournament(tournament_id: int):
-    try:
-        tournament = session.query(Tournament).filter(Tournament.id == tournament_id).first()
-        if not tournament:
+# Exportación
+
+@app.get("/export/{kind}")
+async def exportData(kind: str, fmt: str = Query("ndjson", alias="format", description="ndjson or csv"),
+                     tournament_id: Optional[int] = None, db: AsyncSession = Depends(get_db)):
+    """Stream matches, scores or standings as NDJSON or CSV, optionally for one tournament"""
+    if kind not in dataExport.EXPORT_KINDS:
+        raise HTTPException(status_code=404, detail=f"Unknown export: {kind}")
+    if fmt not in dataExport.EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Invalid export format: {fmt}")
+    if tournament_id is not None:
+        exists = await db.scalar(select(Tournament.id).where(Tournament.id == tournament_id))
+        if not exists:
             raise HTTPException(status_code=404, detail="Tournament not found")
+    # El stream usa su propia conexión: se libera la de la sesión ya
+    await db.close()
+    name = f"{kind}-{tournament_id}" if tournament_id is not None else kind
+    return StreamingResponse(
+        dataExport.encode(dataExport.exportQuery(kind, tournament_id), fmt),
+        media_type=dataExport.MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
 
-        # Check if tournament has unfinished matches
-        unfinished_matches = session.query(Matches).filter(
-            Matches.tournament_id == tournament_id,
-            Matches.status == False
-        ).count()
-
-        if unfinished_matches > 0:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Tournament has {unfinished_matches} unfinished matches"
-            )
-
-        # Get all tournament scores ordered by score
-        final_scores = session.query(TournamentScores).filter(
-            TournamentScores.tournament_id == tournament_id
-        ).order_by(TournamentScores.score.desc()).all()
-
-        # Update personal scores for top 3 players
-        if len(final_scores) >= 1:  # First place
-            winner = session.query(Players).filter(
-                Players.id == final_scores[0].player_id
-            ).first()
-            winner.personalScore += 5
-
-        if len(final_scores) >= 2:  # Second place
-            runner_up = session.query(Players).filter(
-                Players.id == final_scores[1].player_id
-            ).first()
-            runner_up.personalScore += 3
-
-        if len(final_scores) >= 3:  # Third place
-            third_place = session.query(Players).filter(
-                Players.id == final_scores[2].player_id
-            ).first()
-            third_place.personalScore += 1
-
-        # Mark tournament as finished
-        tournament.status = True
-
-        session.commit()
-
-        # Format response with final standings
-        standings = [
-            {
-                "position": i + 1,
-                "player_id": score.player_id,
-                "player_name": score.player.name,
-                "final_score": score.score
-            }
-            for i, score in enumerate(final_scores)
-        ]
-
-        return {
-            "message": "Tournament finished successfully",
-            "final_standings": standings
-        }
-
-    except Exception as e:
-        session.rollback()
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error finishing tournament: {str(e)}"
-        )
+@app.post("/tournament/{tournament_id}/finish")
+async def finishTournament(tournament_id: int, background: bool = BackgroundQuery,
+                           idempotency_key: Optional[str] = IdempotencyHeader,
+                           db: AsyncSession = Depends(get_db)):
+    return await runOperation("finish", tournament_id, background, idempotency_key, db)
 
 @app.post("/tournament/{tournament_id}/next-phase")
-async def next_phase(tournament_id: int):
-    try:
-        print(f"DEBUG: Starting next phase for tournament {tournament_id}")
-        # Get the tournament
-        tournament = session.query(Tournament).filter(Tournament.id == tournament_id).first()
-        if not tournament:
-            print(f"DEBUG: Tournament {tournament_id} not found")
-            raise HTTPException(status_code=404, detail="Tournament not found")
-
-        print(f"DEBUG: Tournament status: {tournament.status}, type: {tournament.type}")
-        # Verify tournament is not finished
-        if tournament.status:
-            print("DEBUG: Tournament is already finished")
-            raise HTTPException(status_code=400, detail="Tournament is already finished")
-
-        # Verify tournament is elimination type
-        if tournament.type != "elimination":
-            print(f"DEBUG: Invalid tournament type: {tournament.type}")
-            raise HTTPException(status_code=400, detail="Only elimination tournaments can advance phases")
-
-        # Get current phase matches and verify they're all complete
-        current_phase = tournament.currentPhase or 1
-        print(f"DEBUG: Current phase: {current_phase}")
-        current_matches = [m for m in tournament.matches if m.phase == current_phase]
-        print(f"DEBUG: Found {len(current_matches)} matches in current phase")
-        print(f"DEBUG: Match statuses: {[m.status for m in current_matches]}")
-
-        if not all(match.status for match in current_matches):
-            print("DEBUG: Not all matches are completed")
-            raise HTTPException(
-                status_code=400,
-                detail="All matches in current phase must be completed before advancing"
-            )
-
-        # Generate next phase matches
-        print("DEBUG: Generating next phase matches")
-        next_phase_matches = generateNextPhaseMatches(tournament, current_phase)
-        print(f"DEBUG: Generated matches: {next_phase_matches}")
-
-        if not next_phase_matches:
-            print("DEBUG: No matches generated for next phase")
-            # Instead of finishing the tournament, just return a message
-            return {"message": "No es posible generar más fases"}
-
-        # Add new matches to session
-        print(f"DEBUG: Adding {len(next_phase_matches)} matches to database")
-        for match in next_phase_matches:
-            session.add(match)
-
-        # Update tournament current phase
-        print(f"DEBUG: Updating tournament phase to {current_phase + 1}")
-        tournament.currentPhase = current_phase + 1
-
-        # Commit all changes in a single transaction
-        session.commit()
-        print("DEBUG: Successfully committed changes")
-
-        return {"message": "Advanced to next phase successfully"}
-
-    except HTTPException as he:
-        session.rollback()
-        print(f"DEBUG: HTTP Exception: {he.detail}")
-        raise he
-    except Exception as e:
-        session.rollback()
-        print(f"DEBUG: Unexpected error: {str(e)}")
-        print(f"DEBUG: Error type: {type(e)}")
-        import traceback
-        print(f"DEBUG: Stack trace: {traceback.format_exc()}")
-        raise HTTPException(status_code=500, detail=str(e))
-
+async def next_phase(tournament_id: int, background: bool = BackgroundQuery,
+                     idempotency_key: Optional[str] = IdempotencyHeader,
+                     db: AsyncSession = Depends(get_db)):
+    return await runOperation("next_phase", tournament_id, background, idempotency_key, db)
+
+# Trabajos en segundo plano
+
+@app.get("/jobs/{job_id}", response_model=JobBase)
+async def getJob(job_id: int, db: AsyncSession = Depends(get_db)):
+    """State, progress and result of a background job"""
+    job = await db.scalar(select(Jobs).where(Jobs.id == job_id))
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return jobs.describe(job)
@@ -1,96 +1,205 @@
-from models import session, Tournament, Matches
-from random import shuffle
-from typing import List
+from models import Tournament, Matches, TournamentScores
+import standings
+from swiss import pairRound, swissRounds
+from sqlalchemy import select, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+import seeding
+from typing import Dict, Iterator, List, Optional, Tuple
 from sqlalchemy import func
+from logConfig import getLogger
 
-def matchesElimination(matches: List[Matches], players: List, tournamentId: int) -> None:
-    """Generate elimination tournament matches"""
-    for i in range(0, len(players) - 1, 2):
-        matches.append(Matches(
-            tournament_id=tournamentId,
-            player1_id=players[i].id,
-            player2_id=players[i + 1].id,
-            win=-1,
-            status=False,
-            draw=False,
-            phase=1
-        ))
-
-    # If odd number of players, create a phantom match
-    if len(players) % 2 != 0:
-        phantom_match = Matches(
-            tournament_id=tournamentId,
-            player1_id=players[-1].id,
-            player2_id=None,  # No opponent
-            win=players[-1].id,  # Automatically wins
-            status=True,  # Match is completed
-            draw=False,
-            phase=1
-        )
-        matches.append(phantom_match)
-
-def matchesRoundRobin(matches: List[Matches], players: List, tournamentId: int) -> None:
-    """Generate round robin tournament matches - each player plays against others once"""
-    for i in range(len(players)):
-        for j in range(i + 1, len(players)):  # Changed to avoid double matches
-            matches.append(Matches(
-                tournament_id=tournamentId,
-                player1_id=players[i].id,
-                player2_id=players[j].id,
-                win=-1,
-                status=False,
-                draw=False
-            ))
-
-def generateMatches(tournament_id: int) -> List[Matches]:
-    """Generate matches for a tournament"""
+log = getLogger("matches")
+
+# Filas por INSERT al volcar partidas en bloque
+INSERT_CHUNK = 5000
+
+def matchRow(tournamentId: int, player1_id: Optional[int], player2_id: Optional[int], phase: int,
+             win: int = -1, status: bool = False, bracket_slot: Optional[int] = None) -> Dict:
+    """Column values of a new match, ready for a bulk INSERT"""
+    return {
+        "tournament_id": tournamentId,
+        "player1_id": player1_id,
+        "player2_id": player2_id,
+        "win": win,
+        "status": status,
+        "draw": False,
+        "phase": phase,
+        "bracket_slot": bracket_slot,
+    }
+
+async def insertMatches(db: AsyncSession, rows: List[Dict]) -> List[int]:
+    """Insert match rows with executemany INSERT ... RETURNING and return their ids.
+
+    The ids are not matched back to the rows: asking for that ordering
+    (sort_by_parameter_order) makes SQLAlchemy fall back to one INSERT per
+    row on SQLite. The statement targets the Core table because the ORM bulk
+    insert splits the batch wherever a row has a different set of NULL
+    columns (byes, bracket seats still empty).
+    """
+    ids: List[int] = []
+    matches = Matches.__table__
+    stmt = insert(matches).returning(matches.c.id)
+    for start in range(0, len(rows), INSERT_CHUNK):
+        result = await db.execute(stmt, rows[start:start + INSERT_CHUNK])
+        ids.extend(result.scalars().all())
+    return ids
+
+def matchesElimination(matches: List[Dict], players: List[int], tournamentId: int) -> None:
+    """Generate the whole elimination bracket for players listed from seed 1 to N.
+
+    Round one uses the standard placement (1 vs N, 2 vs N-1...) padded to a
+    power of two, so byes only happen there. Later rounds are created empty:
+    the match in slot s of a round feeds seat s % 2 of slot s // 2 in the
+    next one (see linkBracket), and each result fills its seat.
+    """
+    pairs = seeding.bracketPairs(players)
+    nextRound = [[None, None] for _ in range(len(pairs) // 2)]
+    for slot, (player1_id, player2_id) in enumerate(pairs):
+        if player2_id is None:
+            # No opponent: the player automatically wins and is already seated in round two
+            matches.append(matchRow(tournamentId, player1_id, None, phase=1,
+                                    win=player1_id, status=True, bracket_slot=slot))
+            nextRound[slot // 2][slot % 2] = player1_id
+        else:
+            matches.append(matchRow(tournamentId, player1_id, player2_id, phase=1, bracket_slot=slot))
+
+    phase = 2
+    while nextRound:
+        for slot, (player1_id, player2_id) in enumerate(nextRound):
+            matches.append(matchRow(tournamentId, player1_id, player2_id, phase=phase, bracket_slot=slot))
+        nextRound = [[None, None] for _ in range(len(nextRound) // 2)]
+        phase += 1
+
+async def linkBracket(db: AsyncSession, tournamentId: int) -> None:
+    """Point every bracket match at the match its winner plays next, in one UPDATE"""
+    matches = Matches.__table__
+    parent = matches.alias("parent")
+    await db.execute(
+        update(matches)
+        .where(matches.c.tournament_id == tournamentId, matches.c.bracket_slot.isnot(None))
+        .values(next_match_id=select(parent.c.id).where(
+            parent.c.tournament_id == matches.c.tournament_id,
+            parent.c.phase == matches.c.phase + 1,
+            parent.c.bracket_slot == matches.c.bracket_slot // 2,
+        ).scalar_subquery())
+    )
+
+def roundRobinRounds(playerIds: List[int]) -> Iterator[List[Tuple[int, int]]]:
+    """Yield the rounds of a round robin using the circle method.
+
+    One player stays fixed and the rest rotate one position per round, so every
+    pair meets exactly once over n-1 rounds (n rounds with an odd number of
+    players, where the player facing the empty seat rests). Only the current
+    round is kept in memory.
+    """
+    ids: List[Optional[int]] = list(playerIds)
+    if len(ids) % 2:
+        ids.append(None)  # Asiento vacío: quien cae aquí descansa
+    n = len(ids)
+    fixed, rotating = ids[0], ids[1:]
+    for _ in range(n - 1):
+        circle = [fixed] + rotating
+        yield [
+            (circle[i], circle[n - 1 - i])
+            for i in range(n // 2)
+            if circle[i] is not None and circle[n - 1 - i] is not None
+        ]
+        rotating = rotating[-1:] + rotating[:-1]
+
+async def matchesRoundRobin(db: AsyncSession, players: List[int], tournamentId: int) -> int:
+    """Insert round robin matches round by round - each player plays against others once.
+
+    Rows are written in bulk INSERTs of at most INSERT_CHUNK matches, so memory
+    stays bounded by the chunk size instead of the n(n-1)/2 matches. The ids
+    are not fetched back for the same reason; only the count is returned.
+    """
+    created = 0
+    chunk = []
+    for phase, pairs in enumerate(roundRobinRounds(players), start=1):
+        for player1_id, player2_id in pairs:
+            chunk.append(matchRow(tournamentId, player1_id, player2_id, phase=phase))
+        if len(chunk) >= INSERT_CHUNK:
+            await db.execute(insert(Matches), chunk)
+            created += len(chunk)
+            chunk = []
+    if chunk:
+        await db.execute(insert(Matches), chunk)
+        created += len(chunk)
+    return created
+
+def matchesSwiss(matches: List[Dict], pairs: List, byePlayer, tournamentId: int, phase: int) -> None:
+    """Generate the matches of one Swiss round; the bye is a completed match without opponent"""
+    for player1_id, player2_id in pairs:
+        matches.append(matchRow(tournamentId, player1_id, player2_id, phase=phase))
+    if byePlayer is not None:
+        matches.append(matchRow(tournamentId, byePlayer, None, phase=phase,
+                                win=byePlayer, status=True))
+
+async def insertSwissRound(db: AsyncSession, matches: List[Dict], tournamentId: int) -> List[int]:
+    """Insert a Swiss round and count its bye as a win in the standings"""
+    ids = await insertMatches(db, matches)
+    byes = [m["player1_id"] for m in matches if m["player2_id"] is None]
+    if byes:
+        await standings.awardByes(db, tournamentId, byes)
+    return ids
+
+async def generateMatches(db: AsyncSession, tournament_id: int) -> int:
+    """Generate the first matches of a tournament and return how many were created.
+
+    Everything is written with bulk INSERTs in the caller's transaction; the
+    caller commits once.
+    """
     try:
-        tournament = session.query(Tournament).filter(Tournament.id == tournament_id).first()
+        tournament = await db.scalar(select(Tournament).where(Tournament.id == tournament_id))
         if not tournament:
             raise ValueError("Tournament not found")
 
-        players = tournament.players[:]
-        if len(players) < 2:
+        # Solo ids y puntuación: no hace falta cargar los objetos Players
+        ratings = await tournament.player_ratings(db)
+        if len(ratings) < 2:
             raise ValueError("Not enough players for tournament")
 
-        shuffle(players)
+        if tournament.seed is None:
+            # Torneos anteriores a la semilla: se fija ahora y queda guardada
+            tournament.seed = seeding.newSeed()
+        players = seeding.seedOrder(ratings, tournament.seeding or "random", tournament.seed)
         matches = []
 
         if tournament.type == "elimination":
             matchesElimination(matches, players, tournament_id)
+            created = len(await insertMatches(db, matches))
+            await linkBracket(db, tournament_id)
+            return created
         elif tournament.type == "roundRobin":
-            matchesRoundRobin(matches, players, tournament_id)
+            return await matchesRoundRobin(db, players, tournament_id)
+        elif tournament.type == "swiss":
+            # Primera ronda: todos empatados a cero, decide el orden de siembra
+            pairs, byePlayer = pairRound([(p, 0) for p in players], set())
+            matchesSwiss(matches, pairs, byePlayer, tournament_id, 1)
+            return len(await insertSwissRound(db, matches, tournament_id))
         else:
             raise ValueError(f"Invalid tournament type: {tournament.type}")
 
-        # Add all matches at once
-        session.add_all(matches)
-        session.commit()
-
-        return matches
-
     except Exception as e:
-        session.rollback()
+        await db.rollback()
         raise Exception(f"Error generating matches: {str(e)}")
 
-def generateNextPhaseMatches(tournament, current_phase: int):
-    """Generate matches for the next phase in an elimination tournament"""
+def generateNextPhaseMatches(tournament, current_matches: List[Matches], current_phase: int) -> List[Dict]:
+    """Generate matches for the next phase of an elimination tournament created without a bracket"""
     # Get winners from current phase
-    current_matches = [m for m in tournament.matches if m.phase == current_phase]
     winners = []
     for match in current_matches:
         if match.player2_id is None:
             # Phantom match - player automatically advances
             winners.append(match.player1_id)
         elif match.draw:
-            # In case of draw, randomly select a winner
-            import random
-            winner_id = random.choice([match.player1_id, match.player2_id])
-            winners.append(winner_id)
+            # In case of draw, pick a winner reproducibly from the tournament seed
+            winners.append(seeding.drawWinner(tournament.seed or 0, match.id,
+                                              match.player1_id, match.player2_id))
         else:
             winners.append(match.win)
 
-    print(f"DEBUG: Winners from phase {current_phase}: {winners}")
+    log.debug("phase winners", extra={"tournament_id": tournament.id, "phase": current_phase, "winners": len(winners)})
 
     # If only one winner, tournament is finished
     if len(winners) < 2:
@@ -103,27 +212,54 @@ def generateNextPhaseMatches(tournament, current_phase: int):
     # Pair winners for next phase
     for i in range(0, len(winners), 2):
         if i + 1 < len(winners):
-            new_match = Matches(
-                tournament_id=tournament.id,
-                player1_id=winners[i],
-                player2_id=winners[i + 1],
-                win=-1,
-                status=False,
-                draw=False,
-                phase=next_phase
-            )
+            new_matches.append(matchRow(tournament.id, winners[i], winners[i + 1], phase=next_phase))
         else:
             # Last player gets a phantom match
-            new_match = Matches(
-                tournament_id=tournament.id,
-                player1_id=winners[i],
-                player2_id=None,
-                win=winners[i],
-                status=True,
-                draw=False,
-                phase=next_phase
-            )
-        new_matches.append(new_match)
-
-    print(f"DEBUG: Generated {len(new_matches)} matches for phase {next_phase}")
+            new_matches.append(matchRow(tournament.id, winners[i], None, phase=next_phase,
+                                        win=winners[i], status=True))
+
+    log.debug("next phase paired", extra={"tournament_id": tournament.id, "phase": next_phase, "matches": len(new_matches)})
+    return new_matches
+
+async def generateNextSwissRound(db: AsyncSession, tournament, current_phase: int) -> List[Dict]:
+    """Pair the next Swiss round from the current standings, avoiding rematches and repeated byes"""
+    ranked = (await db.execute(
+        select(TournamentScores.player_id, TournamentScores.score)
+        .where(TournamentScores.tournament_id == tournament.id)
+        .order_by(TournamentScores.position.is_(None), TournamentScores.position,
+                  TournamentScores.score.desc(), TournamentScores.player_id)
+    )).all()
+    if current_phase >= swissRounds(len(ranked)):
+        return []
+
+    history = (await db.execute(
+        select(Matches.player1_id, Matches.player2_id).where(Matches.tournament_id == tournament.id)
+    )).all()
+    played = {frozenset(pair) for pair in history if pair[1] is not None}
+    hadBye = {player1_id for player1_id, player2_id in history if player2_id is None}
+
+    try:
+        pairs, byePlayer = pairRound([tuple(row) for row in ranked], played, hadBye)
+    except ValueError:
+        return []
+
+    new_matches = []
+    matchesSwiss(new_matches, pairs, byePlayer, tournament.id, current_phase + 1)
     return new_matches
+
+async def generateNextPhase(db: AsyncSession, tournament, current_phase: int) -> List[int]:
+    """Insert the matches of the next phase and return their ids (empty when no phase is left)"""
+    if tournament.type == "swiss":
+        new_matches = await generateNextSwissRound(db, tournament, current_phase)
+        return await insertSwissRound(db, new_matches, tournament.id) if new_matches else []
+
+    # Cuadro precalculado: la fase siguiente ya existe y los resultados la han completado
+    bracket = (await db.execute(
+        select(Matches.id).where(Matches.tournament_id == tournament.id, Matches.phase == current_phase + 1)
+    )).scalars().all()
+    if bracket:
+        return bracket
+
+    current_matches = await tournament.get_matches_by_phase(db, current_phase)
+    new_matches = generateNextPhaseMatches(tournament, current_matches, current_phase)
+    return await insertMatches(db, new_matches) if new_matches else []
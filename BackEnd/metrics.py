@@ -0,0 +1,108 @@
+"""Opt-in Prometheus metrics: request and DB query counts and latency histograms.
+
+Enabled with METRICS_ENABLED=true; when disabled nothing is hooked and the
+/metrics endpoint answers 404.
+"""
+import re
+import threading
+import time
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import event
+
+
+# Límites de los buckets en segundos (los de los clientes oficiales de Prometheus)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram keyed by a tuple of label pairs"""
+    def __init__(self, name: str, help: str, buckets=BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        self._series: Dict[Labels, List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # [conteos por bucket (+Inf al final), suma]
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += seconds
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = [(key, list(counts), total) for key, (counts, total) in sorted(self._series.items())]
+        for key, counts, total in series:
+            labels = ",".join(f'{k}="{_escape(v)}"' for k, v in key)
+            sep = "," if labels else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{self.name}_bucket{{{labels}{sep}le="{le}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{labels}}} {total}")
+            lines.append(f"{self.name}_count{{{labels}}} {cumulative}")
+        return lines
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+REQUESTS = Histogram("magic_http_request_duration_seconds", "HTTP request latency by route, method and status.")
+QUERIES = Histogram("magic_db_query_duration_seconds", "Database statement latency by operation and table.")
+
+
+def observeRequest(method: str, route: str, status: int, seconds: float) -> None:
+    REQUESTS.observe(seconds, method=method, route=route, status=str(status))
+
+
+_TABLE = re.compile(r'\b(?:FROM|INTO|UPDATE)\s+"?(\w+)', re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def _statementLabels(statement: str) -> Tuple[Tuple[str, str], ...]:
+    """Operation and main table of a SQL statement (cached: statements repeat)"""
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "UNKNOWN"
+    table = _TABLE.search(statement)
+    return (("operation", operation), ("table", table.group(1) if table else ""))
+
+
+def instrumentEngine(engine) -> None:
+    """Time every statement executed through the given (sync) engine"""
+    # El inicio se guarda en el contexto de la ejecución, no en la conexión:
+    # una sentencia que falla no llega a after_cursor_execute y no deja nada atrás
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        context._query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop(conn, cursor, statement, parameters, context, executemany):
+        QUERIES.observe(time.perf_counter() - context._query_start, **dict(_statementLabels(statement)))
+
+
+_collectors: List[Callable[[], List[str]]] = []
+
+
+def registerCollector(collector: Callable[[], List[str]]) -> None:
+    """Add a function returning extra exposition lines (e.g. cache counters)"""
+    _collectors.append(collector)
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format"""
+    lines = REQUESTS.render() + QUERIES.render()
+    for collector in _collectors:
+        lines += collector()
+    return "\n".join(lines) + "\n"
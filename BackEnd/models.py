@@ -1,29 +1,35 @@
 #TODO Agregar métodos para terminar un torneo y guardar los resultados
 
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Table
-from sqlalchemy.orm import relationship, sessionmaker, DeclarativeBase
-from sqlalchemy import create_engine
+from sqlalchemy import Column, Integer, Float, String, Text, Boolean, ForeignKey, DateTime, Table, Index, text
+from sqlalchemy.orm import relationship, DeclarativeBase
+from sqlalchemy import event, select, exists, func
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+import asyncio
 import os
 
-# Add these constants at the top of the file after imports
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DB_PATH = f"sqlite:///{os.path.join(BASE_DIR, 'DB', 'database.sqlite')}"
+from config import (BASE_DIR, ASYNC_DB_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW,
+                    DB_POOL_RECYCLE, DB_POOL_TIMEOUT, DB_BUSY_TIMEOUT)
 
 class Base(DeclarativeBase):
     pass
 
 # association tables
 tournamentsPlayers = Table('tournamentsPlayers', Base.metadata,
-    Column('tournament_id', Integer, ForeignKey('tournament.id')),
-    Column('player_id', Integer, ForeignKey('players.id'))
+    Column('tournament_id', Integer, ForeignKey('tournament.id'), primary_key=True),
+    Column('player_id', Integer, ForeignKey('players.id'), primary_key=True),
+    # La clave primaria cubre torneo -> jugadores; este índice, jugador -> torneos
+    Index('ix_tournamentsPlayers_player_id', 'player_id'),
 )
 
 class Players(Base):
     __tablename__ = 'players'
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
-    name = Column(String(100))  # Add max length
+    name = Column(String(100), index=True)  # Índice: la importación busca jugadores por nombre
     creationDate = Column(DateTime)
     personalScore = Column(Integer, default=0)
+    # Rating Elo, actualizado con cada resultado (ver rating.py)
+    rating = Column(Float, nullable=False, default=1500.0, server_default="1500")
     tournament = relationship("Tournament",secondary=tournamentsPlayers, back_populates="players")
     tournament_scores = relationship("TournamentScores", primaryjoin="Players.id == TournamentScores.player_id")  #
 
@@ -42,32 +48,99 @@ class Tournament(Base):
     scores = relationship("TournamentScores", back_populates="tournament")
     matches = relationship("Matches", back_populates="tournament")
     currentPhase = Column(Integer, default=1)
+    # Se incrementa con cada escritura que afecta al torneo (ver versions.py)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    # Semilla del RNG de emparejamientos y modo de siembra ("random" o "rating")
+    seed = Column(Integer, nullable=True)
+    seeding = Column(String(20), nullable=False, default="random", server_default="random")
 
     def is_active(self):
         return self.status
 
-    def get_player_score(self, player_id):
-        for score in self.scores:
-            if score.player_id == player_id:
-                return score.score
-        return 0
-
-    def get_matches_by_phase(self, phase):
-        return [match for match in self.matches if match.phase == phase]
+    # Consultas indexadas: no cargan las colecciones completas del torneo
+
+    async def get_player_score(self, db, player_id):
+        score = await db.scalar(select(TournamentScores.score).where(
+            TournamentScores.tournament_id == self.id,
+            TournamentScores.player_id == player_id,
+        ))
+        return score or 0
+
+    async def get_matches_by_phase(self, db, phase):
+        return (await db.execute(
+            select(Matches)
+            .where(Matches.tournament_id == self.id, Matches.phase == phase)
+            .order_by(Matches.id)
+        )).scalars().all()
+
+    async def has_player(self, db, player_id):
+        return await db.scalar(select(exists().where(
+            tournamentsPlayers.c.tournament_id == self.id,
+            tournamentsPlayers.c.player_id == player_id,
+        )))
+
+    async def player_ratings(self, db):
+        """(player_id, rating) of every registered player, by id"""
+        return (await db.execute(
+            select(Players.id, Players.rating)
+            .join(tournamentsPlayers, tournamentsPlayers.c.player_id == Players.id)
+            .where(tournamentsPlayers.c.tournament_id == self.id)
+            .order_by(Players.id)
+        )).all()
+
+    async def count_players(self, db):
+        return await db.scalar(
+            select(func.count()).select_from(tournamentsPlayers)
+            .where(tournamentsPlayers.c.tournament_id == self.id)
+        )
+
+    async def phase_completed(self, db, phase):
+        return not await db.scalar(select(exists().where(
+            Matches.tournament_id == self.id,
+            Matches.phase == phase,
+            Matches.status == False,
+        )))
 
 
 class TournamentScores(Base):
     __tablename__ ='tournamentScores'
+    __table_args__ = (
+        # Un registro por jugador y torneo; es además la búsqueda de setWinner
+        Index('uq_tournamentScores_tournament_player', 'tournament_id', 'player_id', unique=True),
+    )
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     tournament_id= Column(Integer, ForeignKey('tournament.id'), index=True)
     player_id = Column(Integer, ForeignKey('players.id'), index=True)
     tournament = relationship("Tournament", back_populates="scores")
     player = relationship("Players", back_populates="tournament_scores")
     score = Column(Integer, default=0)
+    # Clasificación mantenida por standings.applyResults
+    wins = Column(Integer, default=0, server_default="0")
+    draws = Column(Integer, default=0, server_default="0")
+    losses = Column(Integer, default=0, server_default="0")
+    buchholz = Column(Integer, default=0, server_default="0")
+    position = Column(Integer, nullable=True)
+
+
+class PlayerStats(Base):
+    """Totals per player, maintained by playerStats on each result and tournament finish"""
+    __tablename__ = 'playerStats'
+    player_id = Column(Integer, ForeignKey('players.id'), primary_key=True)
+    wins = Column(Integer, nullable=False, default=0, server_default="0")
+    draws = Column(Integer, nullable=False, default=0, server_default="0")
+    losses = Column(Integer, nullable=False, default=0, server_default="0")
+    tournaments_played = Column(Integer, nullable=False, default=0, server_default="0")
+    first_places = Column(Integer, nullable=False, default=0, server_default="0")
+    second_places = Column(Integer, nullable=False, default=0, server_default="0")
+    third_places = Column(Integer, nullable=False, default=0, server_default="0")
 
 
 class Matches(Base):
     __tablename__ = 'matches'
+    __table_args__ = (
+        Index('ix_matches_tournament_status', 'tournament_id', 'status'),  # partidas pendientes
+        Index('ix_matches_tournament_phase', 'tournament_id', 'phase'),    # partidas de una fase
+    )
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     tournament_id = Column(Integer, ForeignKey('tournament.id'), index=True)
     player1_id = Column(Integer, ForeignKey('players.id'), index=True)
@@ -79,19 +152,99 @@ class Matches(Base):
     status = Column(Boolean, default=False)
     draw = Column(Boolean, default=False)
     phase = Column(Integer, default=1)  # Add this line for phase tracking
+    # Cuadro de eliminación precalculado: posición dentro de la ronda y partida
+    # a la que pasa el ganador (asiento 1 si la posición es par, 2 si es impar)
+    bracket_slot = Column(Integer, nullable=True)
+    next_match_id = Column(Integer, ForeignKey('matches.id'), nullable=True)
+
+
+class Jobs(Base):
+    """Background operation on a tournament (see jobs.py)"""
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        # Un solo trabajo activo por operación y torneo: los reintentos reciben el mismo
+        Index('uq_jobs_active', 'kind', 'tournament_id', unique=True,
+              sqlite_where=text("status IN ('queued', 'running')")),
+        Index('ix_jobs_status', 'status', 'id'),
+    )
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    kind = Column(String(32), nullable=False)
+    tournament_id = Column(Integer, nullable=False)
+    status = Column(String(16), nullable=False, default="queued")  # queued, running, done, failed
+    progress = Column(Integer, nullable=False, default=0)
+    stage = Column(String(32), nullable=True)
+    result = Column(Text, nullable=True)   # JSON de la respuesta
+    error = Column(Text, nullable=True)
+    error_status = Column(Integer, nullable=True)
+    idempotency_key = Column(String(128), nullable=True, unique=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    # Arriendo: proceso que lo ejecuta y último latido (ver jobs.py)
+    owner = Column(String(64), nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+
+class IdempotencyKeys(Base):
+    """Stored response of a write sent with an Idempotency-Key header (see idempotency.py)"""
+    __tablename__ = 'idempotencyKeys'
+    key = Column(String(128), primary_key=True)
+    request = Column(String(255), nullable=False)  # método y ruta
+    status_code = Column(Integer, nullable=True)
+    body = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, index=True)
+
+
+# Create engine and session factory
+engine = create_async_engine(
+    ASYNC_DB_URL,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_pre_ping=True,
+    connect_args={"timeout": DB_BUSY_TIMEOUT / 1000},
+)
 
-
-# Create engine and session
-engine = create_engine(DB_PATH)
-Session = sessionmaker(bind=engine)
-session = Session()
-
-def init_db():
+@event.listens_for(engine.sync_engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL permite lectores concurrentes mientras hay un escritor
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT}")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+def workerEngine():
+    """Engine for code running its own event loop (job worker threads): no shared pool"""
+    worker = create_async_engine(ASYNC_DB_URL, poolclass=NullPool,
+                                 connect_args={"timeout": DB_BUSY_TIMEOUT / 1000})
+    event.listen(worker.sync_engine, "connect", _set_sqlite_pragmas)
+    return worker
+
+# expire_on_commit=False: los objetos siguen legibles después del commit sin
+# disparar una carga perezosa (no permitida con AsyncSession)
+SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+
+async def get_db():
+    """Yield a session scoped to a single request"""
+    async with SessionLocal() as db:
+        yield db
+
+async def init_db():
     # Create DB directory if it doesn't exist
     db_dir = os.path.join(BASE_DIR, 'DB')
     if not os.path.exists(db_dir):
         os.makedirs(db_dir)
-    Base.metadata.create_all(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+async def _initAndDispose():
+    await init_db()
+    # Sin cerrar el pool, los hilos de aiosqlite impiden que el proceso termine
+    await engine.dispose()
 
 if __name__ == "__main__":
-    init_db()
\ No newline at end of file
+    asyncio.run(_initAndDispose())
\ No newline at end of file
@@ -0,0 +1,168 @@
+"""Tournament operations shared by the HTTP endpoints and the job workers.
+
+Each operation does its work in the caller's session without committing and
+returns (response, announce): the caller commits (a job worker together with
+the job's own status) and then awaits announce() to publish the live events.
+Client errors raise HTTPException whichever way the operation runs. The
+optional progress callback receives (percent, stage) at each step.
+"""
+from typing import Awaitable, Callable, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from matchGeneration import generateMatches as insertFirstMatches, generateNextPhase
+from models import Matches, Players, Tournament
+import liveEvents
+import playerStats
+import standings
+import versions
+from liveEvents import broker
+from logConfig import getLogger
+
+log = getLogger("operations")
+
+Progress = Optional[Callable[[int, str], None]]
+Outcome = Tuple[dict, Callable[[], Awaitable[None]]]
+
+# Puntos personales por puesto al terminar un torneo
+FINISH_POINTS = {1: 5, 2: 3, 3: 1}
+
+_addPersonalScore = (
+    update(Players.__table__)
+    .where(Players.__table__.c.id == bindparam("b_id"))
+    .values(personalScore=Players.__table__.c.personalScore + bindparam("b_points"))
+)
+
+
+def _report(progress: Progress, percent: int, stage: str) -> None:
+    if progress:
+        progress(percent, stage)
+
+
+async def _tournament(db: AsyncSession, tournament_id: int) -> Tournament:
+    tournament = await db.scalar(select(Tournament).where(Tournament.id == tournament_id))
+    if not tournament:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+    return tournament
+
+
+async def generateMatches(db: AsyncSession, tournament_id: int, progress: Progress = None) -> Outcome:
+    """Create the first matches of a tournament"""
+    _report(progress, 0, "validating")
+    tournament = await _tournament(db, tournament_id)
+
+    players = await tournament.count_players(db)
+    if players < 2:
+        raise HTTPException(status_code=400, detail="Not enough players to generate matches")
+
+    if tournament.status:
+        raise HTTPException(status_code=400, detail="Tournament already finished")
+
+    # Un reintento no debe duplicar las partidas
+    if await db.scalar(select(Matches.id).where(Matches.tournament_id == tournament_id).limit(1)):
+        raise HTTPException(status_code=400, detail="Matches already generated")
+
+    _report(progress, 10, "generating")
+    # Matches are bulk inserted by generateMatches and committed by the caller once
+    created = await insertFirstMatches(db, tournament_id)
+    if not created:
+        raise HTTPException(status_code=400, detail="No matches were generated")
+
+    _report(progress, 90, "saving")
+    await versions.bumpVersion(db, tournament_id)
+    log.info("matches generated", extra={"tournament_id": tournament_id, "type": tournament.type,
+                                         "players": players, "matches": created})
+
+    async def announce():
+        broker.publish(tournament_id, "generated", {"matches": created})
+
+    return {"message": "Matches generated", "matches": created}, announce
+
+
+async def nextPhase(db: AsyncSession, tournament_id: int, progress: Progress = None) -> Outcome:
+    """Create the matches of the next phase of an elimination or swiss tournament"""
+    _report(progress, 0, "validating")
+    tournament = await _tournament(db, tournament_id)
+
+    # Verify tournament is not finished
+    if tournament.status:
+        raise HTTPException(status_code=400, detail="Tournament is already finished")
+
+    # Verify tournament type advances by phases
+    if tournament.type not in ("elimination", "swiss"):
+        raise HTTPException(status_code=400, detail="Only elimination and swiss tournaments can advance phases")
+
+    # Verify the current phase has no pending matches (indexed EXISTS)
+    current_phase = tournament.currentPhase or 1
+
+    if not await tournament.phase_completed(db, current_phase):
+        raise HTTPException(
+            status_code=400,
+            detail="All matches in current phase must be completed before advancing"
+        )
+
+    _report(progress, 10, "pairing")
+    # New matches are bulk inserted in this transaction
+    next_phase_ids = await generateNextPhase(db, tournament, current_phase)
+
+    async def announce():
+        if next_phase_ids:
+            await liveEvents.publishPhase(db, tournament_id, current_phase + 1, next_phase_ids)
+
+    if not next_phase_ids:
+        # Instead of finishing the tournament, just return a message
+        return {"message": "No es posible generar más fases"}, announce
+
+    _report(progress, 90, "saving")
+    tournament.currentPhase = current_phase + 1
+    await versions.bumpVersion(db, tournament_id)
+    log.info("phase advanced", extra={"tournament_id": tournament_id, "phase": current_phase + 1,
+                                      "matches": len(next_phase_ids)})
+    return {"message": "Advanced to next phase successfully"}, announce
+
+
+async def finishTournament(db: AsyncSession, tournament_id: int, progress: Progress = None) -> Outcome:
+    """Close a tournament: podium points, player stats and final standings"""
+    _report(progress, 0, "validating")
+    tournament = await _tournament(db, tournament_id)
+
+    # Finishing twice would count the tournament twice in the player stats
+    if tournament.status:
+        raise HTTPException(status_code=400, detail="Tournament is already finished")
+
+    # Check if tournament has unfinished matches
+    unfinished_matches = await db.scalar(select(func.count(Matches.id)).where(
+        Matches.tournament_id == tournament_id,
+        Matches.status == False
+    ))
+
+    if unfinished_matches > 0:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Tournament has {unfinished_matches} unfinished matches"
+        )
+
+    _report(progress, 20, "standings")
+    # Final standings are already maintained, including tie-breakers
+    final_standings = await standings.getStandings(db, tournament_id)
+
+    _report(progress, 60, "players")
+    # Puntos personales del podio en un solo UPDATE
+    podium = [{"b_id": row["player_id"], "b_points": FINISH_POINTS[position]}
+              for position, row in enumerate(final_standings[:len(FINISH_POINTS)], start=1)]
+    if podium:
+        await db.execute(_addPersonalScore, podium)
+        # personalScore aparece en los jugadores de todos sus torneos
+        await versions.bumpPlayerTournaments(db, *(row["b_id"] for row in podium))
+    await playerStats.recordFinish(db, final_standings)
+
+    # Mark tournament as finished
+    tournament.status = True
+    await versions.bumpVersion(db, tournament_id)
+
+    async def announce():
+        broker.publish(tournament_id, "finished", {"final_standings": final_standings})
+
+    return {"message": "Tournament finished successfully", "final_standings": final_standings}, announce
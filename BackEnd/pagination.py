@@ -0,0 +1,73 @@
+"""Keyset (cursor) pagination and field projection for the list endpoints.
+
+Pages are ordered by primary key and continue with ``id > cursor``, so every
+page is an index range scan no matter how deep into the table it is. The body
+keeps the original list shape; the cursor for the next page travels in the
+``X-Next-Cursor`` header and is absent on the last page.
+"""
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import readModels
+from config import PAGE_DEFAULT_LIMIT, PAGE_MAX_LIMIT
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Carga un campo anidado para los ids de una página: {id: [dicts]}
+Loader = Callable[[AsyncSession, Sequence[int]], Awaitable[Dict[int, List[dict]]]]
+
+# Parámetros comunes de los listados
+CursorQuery = Query(None, ge=0, description="Return rows with id greater than this cursor")
+LimitQuery = Query(PAGE_DEFAULT_LIMIT, ge=1, le=PAGE_MAX_LIMIT, description="Maximum rows per page")
+FieldsQuery = Query(None, description="Comma separated list of fields to return")
+
+
+def parseFields(fields: Optional[str], model, schema, relationships: Dict[str, Loader]) -> Optional[List[str]]:
+    """Validate a fields= projection against the schema, always keeping id for the cursor"""
+    if fields is None:
+        return None
+    columns = {c.key for c in inspect(model).column_attrs}
+    allowed = [name for name in schema.model_fields if name in columns or name in relationships]
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}"
+        )
+    if "id" not in names:
+        names.insert(0, "id")
+    return names
+
+
+async def fetchPage(db: AsyncSession, model, schema, *,
+                    cursor: Optional[int], limit: int, fields: Optional[str],
+                    relationships: Dict[str, Loader], where: Sequence = ()) -> Response:
+    """Return one page of ``model`` rows ordered by id as a JSON response.
+
+    Only the columns of ``schema`` (or of the ``fields`` projection) are
+    selected and shaped into dicts in schema order, without ORM objects or
+    per-row validation (see readModels.py). ``relationships`` maps each
+    nested field to the readModels loader that fills it for the whole page;
+    with ``fields`` only the requested ones run.
+    """
+    names = parseFields(fields, model, schema, relationships) or list(schema.model_fields)
+    table = inspect(model).local_table
+    columns = [name for name in names if name in table.c]
+
+    stmt = select(*(table.c[name] for name in columns))
+    if cursor is not None:
+        stmt = stmt.where(model.id > cursor)
+    rows = (await db.execute(stmt.where(*where).order_by(model.id).limit(limit + 1))).all()
+
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        headers[NEXT_CURSOR_HEADER] = str(rows[-1][columns.index("id")])
+
+    ids = [row[columns.index("id")] for row in rows]
+    nested = {name: await relationships[name](db, ids) for name in names if name in relationships}
+    return readModels.jsonResponse(readModels.shape(schema, names, columns, rows, nested), headers)
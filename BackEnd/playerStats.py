@@ -0,0 +1,134 @@
+"""Per-player statistics maintained incrementally.
+
+One PlayerStats row per player holds the match record (wins, draws, losses)
+and the tournament record (tournaments finished and podium places). Results
+and tournament finishes add to those counters in their own transaction, so
+GET /player/{id}/stats is a primary-key lookup instead of a scan of every
+match and score of the player; DELETE /matches/{id} takes a finished match
+back out. ``python playerStats.py`` rebuilds the table from the matches and
+finished tournaments (backfills, or after deleting matches or tournaments
+by hand).
+
+Byes are not counted: they are not played matches.
+"""
+import asyncio
+from collections import defaultdict
+from typing import Dict, Iterable, Sequence, Tuple
+
+from sqlalchemy import bindparam, case, delete, func, select, union_all
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Matches, PlayerStats, SessionLocal, Tournament, TournamentScores, engine
+
+COUNTERS = ("wins", "draws", "losses", "tournaments_played",
+            "first_places", "second_places", "third_places")
+PODIUM = {1: "first_places", 2: "second_places", 3: "third_places"}
+
+_stats = PlayerStats.__table__
+
+# INSERT ... ON CONFLICT DO UPDATE ejecutado como executemany: crea la fila
+# del jugador la primera vez y después suma los incrementos
+_addDelta = insert(_stats).values(
+    player_id=bindparam("b_player"),
+    **{name: bindparam(f"b_{name}") for name in COUNTERS},
+)
+_addDelta = _addDelta.on_conflict_do_update(
+    index_elements=[_stats.c.player_id],
+    set_={name: _stats.c[name] + _addDelta.excluded[name] for name in COUNTERS},
+)
+
+
+def _emptyDelta() -> Dict[str, int]:
+    return {f"b_{name}": 0 for name in COUNTERS}
+
+
+async def _addDeltas(db: AsyncSession, deltas: Dict[int, Dict[str, int]]) -> None:
+    if deltas:
+        await db.execute(_addDelta, [
+            {"b_player": player_id, **delta} for player_id, delta in deltas.items()
+        ])
+
+
+def _resultDeltas(results: Sequence[Tuple[Matches, int, bool]], sign: int) -> Dict[int, Dict[str, int]]:
+    deltas: Dict[int, Dict[str, int]] = defaultdict(_emptyDelta)
+    for match, winner_id, draw in results:
+        p1, p2 = match.player1_id, match.player2_id
+        if p2 is None:
+            continue
+        if draw:
+            deltas[p1]["b_draws"] += sign
+            deltas[p2]["b_draws"] += sign
+        else:
+            deltas[winner_id]["b_wins"] += sign
+            deltas[p2 if winner_id == p1 else p1]["b_losses"] += sign
+    return deltas
+
+
+async def applyResults(db: AsyncSession, results: Sequence[Tuple[Matches, int, bool]]) -> None:
+    """Add the outcome of each result to both players' match record (one executemany)"""
+    await _addDeltas(db, _resultDeltas(results, 1))
+
+
+async def removeResults(db: AsyncSession, matches: Iterable[Matches]) -> None:
+    """Take finished matches out of both players' match record, before deleting them"""
+    finished = [(match, match.win, match.draw) for match in matches if match.status]
+    await _addDeltas(db, _resultDeltas(finished, -1))
+
+
+async def recordFinish(db: AsyncSession, final_standings: Iterable[dict]) -> None:
+    """Count a finished tournament, and its podium places, for every player in its standings"""
+    deltas: Dict[int, Dict[str, int]] = defaultdict(_emptyDelta)
+    for row in final_standings:
+        delta = deltas[row["player_id"]]
+        delta["b_tournaments_played"] += 1
+        if row["position"] in PODIUM:
+            delta[f"b_{PODIUM[row['position']]}"] += 1
+    await _addDeltas(db, deltas)
+
+
+async def rebuildPlayerStats(db: AsyncSession) -> int:
+    """Recompute the whole table from the matches and finished tournaments; returns the rows written"""
+    await db.execute(delete(_stats))
+    deltas: Dict[int, Dict[str, int]] = defaultdict(_emptyDelta)
+
+    # Cada partida jugada cuenta una vez desde cada asiento
+    sides = union_all(*(
+        select(player.label("player_id"),
+               case((Matches.draw == True, 0), (Matches.win == player, 1), else_=0).label("won"),
+               case((Matches.draw == True, 1), else_=0).label("drawn"),
+               case((Matches.draw == True, 0), (Matches.win == player, 0), else_=1).label("lost"))
+        .where(Matches.status == True, Matches.player2_id.isnot(None))
+        for player in (Matches.player1_id, Matches.player2_id)
+    )).subquery()
+    records = await db.execute(
+        select(sides.c.player_id, func.sum(sides.c.won), func.sum(sides.c.drawn), func.sum(sides.c.lost))
+        .group_by(sides.c.player_id)
+    )
+    for player_id, wins, draws, losses in records:
+        deltas[player_id].update(b_wins=wins, b_draws=draws, b_losses=losses)
+
+    finished = await db.execute(
+        select(TournamentScores.player_id, TournamentScores.position)
+        .join(Tournament, Tournament.id == TournamentScores.tournament_id)
+        .where(Tournament.status == True)
+    )
+    for player_id, position in finished:
+        deltas[player_id]["b_tournaments_played"] += 1
+        if position in PODIUM:
+            deltas[player_id][f"b_{PODIUM[position]}"] += 1
+
+    await _addDeltas(db, deltas)
+    return len(deltas)
+
+
+async def _rebuild() -> None:
+    async with SessionLocal() as db:
+        rows = await rebuildPlayerStats(db)
+        await db.commit()
+    await engine.dispose()
+    print(f"Player stats rebuilt for {rows} players")
+
+
+if __name__ == "__main__":
+    asyncio.run(_rebuild())
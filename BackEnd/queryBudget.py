@@ -0,0 +1,69 @@
+"""Statement budgets of the read endpoints.
+
+Every read endpoint has a fixed number of SQL statements it may execute,
+independent of the number of rows; a lazy load or a per-row query breaks
+it. benchmarks/queryCount.py checks the budgets at growing data sizes and
+tests/test_queryCount.py runs the same check under pytest.
+"""
+from contextlib import contextmanager
+from typing import Dict
+
+from sqlalchemy import event
+
+from models import engine
+
+# Statements allowed per request, independent of the number of rows
+BUDGETS = {
+    "/player": 2,
+    "/player/1": 2,
+    "/tournament": 5,
+    "/tournament/1": 5,
+    # Revalidación con el ETag de la petición anterior: solo la versión
+    "/tournament/1 (304)": 1,
+    "/matches": 1,
+    "/scores": 1,
+    "/scores/player/1": 1,
+}
+
+
+@contextmanager
+def countQueries():
+    """Count the statements executed on the engine inside the block"""
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", _record)
+
+
+async def measure(client) -> Dict[str, int]:
+    """Statements executed by each budgeted request, sent through `client`.
+
+    The response cache must be disabled (CACHE_ENABLED=false) so that the
+    real queries are counted.
+    """
+    counts = {}
+    etags = {}
+    for path in BUDGETS:
+        url, _, conditional = path.partition(" ")
+        headers = {"If-None-Match": etags[url]} if conditional else {}
+        with countQueries() as statements:
+            res = await client.get(url, headers=headers)
+        if conditional and res.status_code != 304:
+            raise RuntimeError(f"{url} answered {res.status_code} to a matching If-None-Match")
+        if not conditional:
+            res.raise_for_status()
+        etags[url] = res.headers.get("etag")
+        counts[path] = len(statements)
+    return counts
+
+
+def overBudget(counts: Dict[str, int]) -> Dict[str, int]:
+    """The paths of `counts` that went over their budget"""
+    return {path: count for path, count in counts.items() if count > BUDGETS[path]}
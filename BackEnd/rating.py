@@ -0,0 +1,169 @@
+"""Elo skill ratings for players.
+
+Every result updates the rating of both players in the transaction that
+records it (see standings.recordResults). When the formula or its constants
+change, ``python rating.py`` recomputes every rating from the full match
+history with NumPy, replaying the results in match id order.
+
+Byes do not change ratings: there is no opponent to be expected against.
+"""
+import time
+from typing import Dict, Sequence, Tuple
+
+from sqlalchemy import bindparam, create_engine, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import DB_URL
+from models import Matches, Players
+import cache
+
+try:
+    import numpy as np
+except ImportError:  # Solo la reconstrucción completa necesita NumPy
+    np = None
+
+RATING_START = 1500.0
+RATING_K = 32.0
+RATING_SCALE = 400.0
+
+_players = Players.__table__
+
+_setRating = (
+    update(_players)
+    .where(_players.c.id == bindparam("b_id"))
+    .values(rating=bindparam("b_rating"))
+)
+
+
+def expectedScore(rating: float, opponent: float) -> float:
+    """Probability of winning against the opponent, draws counting half"""
+    return 1.0 / (1.0 + 10.0 ** ((opponent - rating) / RATING_SCALE))
+
+
+def eloUpdate(rating1: float, rating2: float, score1: float) -> Tuple[float, float]:
+    """New ratings after one game; score1 is 1 for a player 1 win, 0.5 for a draw, 0 for a loss"""
+    delta = RATING_K * (score1 - expectedScore(rating1, rating2))
+    return rating1 + delta, rating2 - delta
+
+
+async def applyResults(db: AsyncSession, results: Sequence[Tuple[Matches, int, bool]]) -> None:
+    """Update the ratings of both players of each result, in order, with one executemany UPDATE"""
+    games = [(match.player1_id, match.player2_id, 0.5 if draw else float(winner_id == match.player1_id))
+             for match, winner_id, draw in results if match.player2_id is not None]
+    if not games:
+        return
+    ids = {player_id for p1, p2, _ in games for player_id in (p1, p2)}
+    ratings: Dict[int, float] = {
+        player_id: rating if rating is not None else RATING_START
+        for player_id, rating in (await db.execute(
+            select(Players.id, Players.rating).where(Players.id.in_(ids))
+        )).all()
+    }
+    for p1, p2, score1 in games:
+        ratings[p1], ratings[p2] = eloUpdate(ratings.get(p1, RATING_START),
+                                             ratings.get(p2, RATING_START), score1)
+
+    await db.execute(_setRating, [{"b_id": pid, "b_rating": r} for pid, r in ratings.items()])
+    # Solo GET /player/{id} muestra el rating: los torneos del jugador no cambian
+    cache.touch(db, *(f"rating:{pid}" for pid in ratings))
+
+
+def replayLayers(player1, player2, players: int):
+    """Layer of each game so that games in one layer share no player.
+
+    A game's layer is one more than the last layer of either of its players
+    (the longest chain of earlier games it depends on), so replaying layer
+    by layer gives the same ratings as replaying game by game. Games are
+    processed in blocks of about one game per player; inside a block the
+    chains are relaxed with vectorized passes until nothing changes.
+    """
+    count = len(player1)
+    block = max(1024, players // 2)
+    last = np.zeros(players, dtype=np.int64)
+    layers = np.empty(count, dtype=np.int64)
+    for start in range(0, count, block):
+        a = player1[start:start + block]
+        b = player2[start:start + block]
+        size = len(a)
+        index = np.arange(size)
+        seats = np.concatenate((a, b))
+        games = np.concatenate((index, index))
+        # Partidas de cada jugador dentro del bloque, en orden
+        order = np.argsort(seats * size + games)
+        seats, games = seats[order], games[order]
+        same = seats[1:] == seats[:-1]
+        later, earlier = games[1:][same], games[:-1][same]
+
+        layer = np.maximum(last[a], last[b]) + 1
+        while True:
+            needed = layer[earlier] + 1
+            behind = needed > layer[later]
+            if not behind.any():
+                break
+            np.maximum.at(layer, later[behind], needed[behind])
+        layers[start:start + size] = layer
+
+        final = np.ones(len(seats), dtype=bool)
+        final[:-1] = ~same
+        last[seats[final]] = layer[games[final]]
+    return layers
+
+
+def replayElo(player1, player2, score1, players: int):
+    """Ratings of players 0..players-1 after replaying the games in order (NumPy arrays)"""
+    ratings = np.full(players, RATING_START)
+    if not len(player1):
+        return ratings
+    layers = replayLayers(player1, player2, players)
+    order = np.argsort(layers, kind="stable")
+    bounds = np.flatnonzero(np.diff(layers[order])) + 1
+    for games in np.split(order, bounds):
+        a, b = player1[games], player2[games]
+        expected = 1.0 / (1.0 + 10.0 ** ((ratings[b] - ratings[a]) / RATING_SCALE))
+        delta = RATING_K * (score1[games] - expected)
+        ratings[a] += delta
+        ratings[b] -= delta
+    return ratings
+
+
+def rebuildRatings(url: str = DB_URL) -> Tuple[int, int]:
+    """Recompute every player's rating from the finished matches; returns (players, games)"""
+    if np is None:
+        raise RuntimeError("Rebuilding ratings needs NumPy: pip install numpy")
+    engine = create_engine(url)
+    try:
+        with engine.begin() as conn:
+            # Cursor DB-API: NumPy convierte las tuplas sin pasar por Row
+            cursor = conn.connection.cursor()
+            cursor.execute(
+                "SELECT player1_id, player2_id, "
+                "CASE WHEN draw THEN 1 WHEN win = player1_id THEN 2 ELSE 0 END "
+                "FROM matches WHERE status AND player2_id IS NOT NULL ORDER BY id"
+            )
+            rows = []
+            while True:
+                chunk = cursor.fetchmany(100_000)
+                if not chunk:
+                    break
+                rows.append(np.array(chunk, dtype=np.int64).reshape(-1, 3))
+            cursor.close()
+            games = np.concatenate(rows) if rows else np.empty((0, 3), dtype=np.int64)
+            # Ids de jugador a posiciones 0..n-1 (incluye jugadores ya borrados con partidas)
+            playerIds = np.union1d(np.array(conn.execute(select(Players.id)).scalars().all(), dtype=np.int64),
+                                   games[:, :2].ravel())
+            ratings = replayElo(np.searchsorted(playerIds, games[:, 0]),
+                                np.searchsorted(playerIds, games[:, 1]),
+                                games[:, 2] / 2.0, len(playerIds))
+
+            conn.execute(_setRating, [{"b_id": pid, "b_rating": r}
+                                      for pid, r in zip(playerIds.tolist(), ratings.tolist())])
+    finally:
+        engine.dispose()
+    return len(playerIds), len(games)
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    players, games = rebuildRatings()
+    print(f"Ratings rebuilt for {players} players from {games} matches "
+          f"in {time.perf_counter() - start:.1f}s")
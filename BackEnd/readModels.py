@@ -0,0 +1,201 @@
+"""Lean read models: response bodies built straight from column tuples.
+
+Returning ORM objects through a response_model loads every row as an object
+and then validates it field by field, nested schemas included; for a page of
+tournaments with their players, scores and matches that costs far more than
+the queries. These builders select only the columns the schemas in
+schemas.py declare and shape plain dicts with the same keys in the same
+order, so the schemas stay the API contract (field names, order and
+defaults are read from them) without validating each row against them.
+
+Bodies are encoded once with orjson when it is installed and with the
+standard json module otherwise; both give the same bytes as FastAPI's own
+encoder for these types. benchmarks/serialization.py compares both paths.
+"""
+import json
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from fastapi import Response
+from sqlalchemy import Table, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Matches, Players, Tournament, TournamentScores, tournamentsPlayers
+from schemas import (MatchBase, PlayerBase, TournamentBase, TournamentBaseSimple, TournamentPlayerBase,
+                     TournamentScoreBase)
+import standings
+
+try:
+    import orjson
+except ImportError:  # Opcional: sin orjson se usa json, con el mismo resultado
+    orjson = None
+
+_tournaments = Tournament.__table__
+_players = Players.__table__
+_scores = TournamentScores.__table__
+_matches = Matches.__table__
+_roster = tournamentsPlayers
+
+
+def fieldColumns(schema, table: Table) -> List[str]:
+    """Fields of a schema that are plain columns of the table, in schema order"""
+    return [name for name in schema.model_fields if name in table.c]
+
+
+def _select(schema, table: Table, *extra):
+    return select(*extra, *(table.c[name] for name in fieldColumns(schema, table)))
+
+
+def _grouped(rows, names: Sequence[str]) -> Dict[int, List[dict]]:
+    # Primera columna: la clave de agrupación; el resto, los campos del esquema
+    groups: Dict[int, List[dict]] = {}
+    for key, *values in rows:
+        groups.setdefault(key, []).append(dict(zip(names, values)))
+    return groups
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content) -> bytes:
+    """JSON body of already shaped dicts and lists"""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, default=_default, ensure_ascii=False, allow_nan=False,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def jsonResponse(content, headers: Optional[Dict[str, str]] = None) -> Response:
+    return Response(content=dumps(content), media_type="application/json", headers=headers)
+
+
+def shape(schema, names: Sequence[str], columns: Sequence[str], rows: Iterable[Sequence],
+          nested: Dict[str, Dict[int, List[dict]]]) -> List[dict]:
+    """Dicts with the `names` fields of `schema` from rows of `columns`.
+
+    Nested fields come from `nested` (lists keyed by the row id) and any
+    other field takes its schema default.
+    """
+    defaults = {name: schema.model_fields[name].get_default(call_default_factory=True)
+                for name in names if name not in columns and name not in nested}
+    items = []
+    for row in rows:
+        values = dict(zip(columns, row))
+        items.append({
+            name: values[name] if name in values
+            else nested[name].get(values["id"], []) if name in nested
+            else defaults[name]
+            for name in names
+        })
+    return items
+
+
+# Colecciones anidadas: cada una es un SELECT para todos los ids de la página
+
+async def playerTournaments(db: AsyncSession, player_ids: Sequence[int]) -> Dict[int, List[dict]]:
+    """TournamentBaseSimple dicts of each player's tournaments"""
+    return await _tournamentsOf(db, _roster.c.player_id.in_(player_ids))
+
+
+async def _tournamentsOf(db: AsyncSession, condition) -> Dict[int, List[dict]]:
+    rows = await db.execute(
+        _select(TournamentBaseSimple, _tournaments, _roster.c.player_id)
+        .join(_roster, _roster.c.tournament_id == _tournaments.c.id)
+        .where(condition)
+        .order_by(_roster.c.player_id, _tournaments.c.id)
+    )
+    return _grouped(rows, fieldColumns(TournamentBaseSimple, _tournaments))
+
+
+async def tournamentPlayers(db: AsyncSession, tournament_ids: Sequence[int],
+                            withTournaments: bool = True) -> Dict[int, List[dict]]:
+    """TournamentPlayerBase dicts of each tournament's players, with all their tournaments
+    or, with withTournaments=False, an empty tournament list"""
+    rows = await db.execute(
+        _select(TournamentPlayerBase, _players, _roster.c.tournament_id)
+        .join(_roster, _roster.c.player_id == _players.c.id)
+        .where(_roster.c.tournament_id.in_(tournament_ids))
+        .order_by(_roster.c.tournament_id, _players.c.id)
+    )
+    tournaments = {}
+    if withTournaments:
+        # Torneos de todos los jugadores de la página en una sola consulta
+        registered = select(_roster.c.player_id).where(_roster.c.tournament_id.in_(tournament_ids))
+        tournaments = await _tournamentsOf(db, _roster.c.player_id.in_(registered))
+    groups: Dict[int, list] = {}
+    for tournament_id, *values in rows:
+        groups.setdefault(tournament_id, []).append(values)
+    names, columns = list(TournamentPlayerBase.model_fields), fieldColumns(TournamentPlayerBase, _players)
+    return {tournament_id: shape(TournamentPlayerBase, names, columns, group, {"tournament": tournaments})
+            for tournament_id, group in groups.items()}
+
+
+async def tournamentScores(db: AsyncSession, tournament_ids: Sequence[int]) -> Dict[int, List[dict]]:
+    rows = await db.execute(
+        _select(TournamentScoreBase, _scores, _scores.c.tournament_id)
+        .where(_scores.c.tournament_id.in_(tournament_ids))
+        .order_by(_scores.c.id)
+    )
+    return _grouped(rows, fieldColumns(TournamentScoreBase, _scores))
+
+
+async def tournamentMatches(db: AsyncSession, tournament_ids: Sequence[int],
+                            decided: bool = False) -> Dict[int, List[dict]]:
+    """MatchBase dicts of each tournament; decided=True skips matches without both players"""
+    query = (
+        _select(MatchBase, _matches, _matches.c.tournament_id)
+        .where(_matches.c.tournament_id.in_(tournament_ids))
+        .order_by(_matches.c.id)
+    )
+    if decided:
+        query = query.where(_matches.c.player1_id.isnot(None), _matches.c.player2_id.isnot(None))
+    return _grouped(await db.execute(query), fieldColumns(MatchBase, _matches))
+
+
+async def decidedMatches(db: AsyncSession, tournament_ids: Sequence[int]) -> Dict[int, List[dict]]:
+    return await tournamentMatches(db, tournament_ids, decided=True)
+
+
+# Campos anidados de los listados, por nombre del campo en la respuesta.
+# GET /tournament: players -> tournaments, scores y las partidas con los dos jugadores
+TOURNAMENT_LIST_NESTED = {
+    "players": tournamentPlayers,
+    "scores": tournamentScores,
+    "matches": decidedMatches,
+}
+
+PLAYER_LIST_NESTED = {
+    "tournament": playerTournaments,
+}
+
+
+async def tournamentDetail(db: AsyncSession, tournament_id: int) -> Optional[dict]:
+    """Body of GET /tournament/{id}: flat players, every match and the final standings"""
+    columns = fieldColumns(TournamentBase, _tournaments)
+    row = (await db.execute(_select(TournamentBase, _tournaments).where(_tournaments.c.id == tournament_id))).first()
+    if row is None:
+        return None
+    ids = [tournament_id]
+    nested = {
+        "players": await tournamentPlayers(db, ids, withTournaments=False),
+        "scores": await tournamentScores(db, ids),
+        "matches": await tournamentMatches(db, ids),
+    }
+    item = shape(TournamentBase, list(TournamentBase.model_fields), columns, [row], nested)[0]
+    # Clasificación final solo si el torneo ha terminado
+    if item["status"]:
+        item["final_standings"] = await standings.getStandings(db, tournament_id)
+    return item
+
+
+async def playerDetail(db: AsyncSession, player_id: int) -> Optional[dict]:
+    """Body of GET /player/{id}"""
+    columns = fieldColumns(PlayerBase, _players)
+    row = (await db.execute(_select(PlayerBase, _players).where(_players.c.id == player_id))).first()
+    if row is None:
+        return None
+    nested = {"tournament": await playerTournaments(db, [player_id])}
+    return shape(PlayerBase, list(PlayerBase.model_fields), columns, [row], nested)[0]
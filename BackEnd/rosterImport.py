@@ -0,0 +1,239 @@
+"""Bulk roster import from an uploaded CSV, NDJSON or JSON file.
+
+The request body is parsed as it arrives (request.stream()), so a roster of
+any size is never held in memory as a whole. Rows are resolved and written
+in batches of IMPORT_BATCH with a handful of statements per batch: players
+are found by id or by exact name and created when missing, then registered
+in the tournament with their TournamentScores row. Everything runs in the
+caller's transaction and every row gets its own result.
+
+Accepted rows: a ``player_id`` (an existing player) or a ``name`` (the
+oldest player with that name, created if there is none). CSV needs a header
+line with those column names. A body that cannot be parsed any further
+raises ValueError and the whole import is rejected.
+"""
+import codecs
+import csv
+import json
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Players, TournamentScores, tournamentsPlayers
+
+IMPORT_FORMATS = ("csv", "ndjson", "json")
+IMPORT_BATCH = 500
+NAME_MAX = Players.__table__.c.name.type.length
+
+_players = Players.__table__
+_scores = TournamentScores.__table__
+
+
+def formatFor(content_type: Optional[str]) -> str:
+    """Import format from the Content-Type header (CSV unless it says JSON)"""
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if content_type in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+        return "ndjson"
+    if content_type == "application/json":
+        return "json"
+    return "csv"
+
+
+async def _text(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    # Decodificador incremental: un carácter UTF-8 puede quedar partido entre dos trozos
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    async for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    pending = ""
+    async for text in _text(chunks):
+        pending += text
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def _csvRows(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[Optional[dict], Optional[str]]]:
+    header = None
+    record = ""
+    async for line in _lines(chunks):
+        record = f"{record}\n{line}" if record else line
+        # Un campo entre comillas puede contener saltos de línea
+        if record.count('"') % 2:
+            continue
+        line, record = record, ""
+        if not line.strip():
+            continue
+        fields = next(csv.reader([line]))
+        if header is None:
+            header = [f.strip().lower() for f in fields]
+            if "player_id" not in header and "name" not in header:
+                raise ValueError("CSV header needs a player_id or name column")
+            continue
+        yield dict(zip(header, fields)), None
+    if record:
+        raise ValueError("Unterminated quoted field")
+
+
+async def _ndjsonRows(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[Optional[dict], Optional[str]]]:
+    async for line in _lines(chunks):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line), None
+        except ValueError:
+            yield None, "Invalid JSON"
+
+
+async def _jsonRows(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[Optional[dict], Optional[str]]]:
+    """Items of a top-level JSON array, decoded one by one as the text arrives"""
+    decoder = json.JSONDecoder()
+    buffer, pos, started, done = "", 0, False, False
+    async for text in _text(chunks):
+        buffer = buffer[pos:] + text
+        pos = 0
+        while not done:
+            while pos < len(buffer) and (buffer[pos].isspace() or (started and buffer[pos] == ",")):
+                pos += 1
+            if pos == len(buffer):
+                break
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError("Expected a JSON array")
+                started, pos = True, pos + 1
+                continue
+            if buffer[pos] == "]":
+                done = True
+                break
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                break  # Elemento incompleto: se espera al siguiente trozo
+            # Un número puede seguir en el siguiente trozo
+            if end == len(buffer) and not isinstance(item, (dict, list, str)):
+                break
+            pos = end
+            yield item, None
+    if not done:
+        raise ValueError("Invalid or truncated JSON array")
+
+
+def parseRows(chunks: AsyncIterator[bytes], fmt: str) -> AsyncIterator[Tuple[Optional[dict], Optional[str]]]:
+    """(row, parse error) pairs from the body in the given format"""
+    return {"csv": _csvRows, "ndjson": _ndjsonRows, "json": _jsonRows}[fmt](chunks)
+
+
+def _rowKey(row: Optional[dict]) -> Tuple[Optional[Tuple[str, object]], Optional[str]]:
+    """("id", player_id) or ("name", name) for a parsed row, or the reason it is invalid"""
+    if not isinstance(row, dict):
+        return None, "Row must be an object"
+    player_id = row.get("player_id")
+    if player_id not in (None, ""):
+        try:
+            return ("id", int(player_id)), None
+        except (TypeError, ValueError):
+            return None, "Invalid player_id"
+    name = row.get("name")
+    name = name.strip() if isinstance(name, str) else ""
+    if not name:
+        return None, "Missing name or player_id"
+    if len(name) > NAME_MAX:
+        return None, f"Name longer than {NAME_MAX} characters"
+    return ("name", name), None
+
+
+async def _writeBatch(db: AsyncSession, batch: List[Tuple[int, Optional[dict], Optional[str]]],
+                      tournament_id: Optional[int], seen: set) -> List[dict]:
+    keys = {}
+    for number, row, error in batch:
+        if error is None:
+            keys[number], error = _rowKey(row)
+        if error is not None:
+            keys[number] = error
+    ids = {key[1] for key in keys.values() if isinstance(key, tuple) and key[0] == "id"}
+    # dict: los jugadores nuevos se crean en el orden de las filas
+    names = dict.fromkeys(key[1] for key in keys.values() if isinstance(key, tuple) and key[0] == "name")
+
+    found = set(await db.scalars(select(_players.c.id).where(_players.c.id.in_(ids)))) if ids else set()
+    byName: Dict[str, int] = dict((await db.execute(
+        select(_players.c.name, func.min(_players.c.id))
+        .where(_players.c.name.in_(names)).group_by(_players.c.name)
+    )).all()) if names else {}
+    missing = [name for name in names if name not in byName]
+    created = set(missing)
+    if missing:
+        now = datetime.now()
+        byName.update((await db.execute(
+            insert(_players).returning(_players.c.name, _players.c.id),
+            [{"name": name, "creationDate": now, "personalScore": 0} for name in missing],
+        )).all())
+
+    results = []
+    for number, _, _ in batch:
+        key = keys[number]
+        if not isinstance(key, tuple):
+            results.append({"row": number, "status": "error", "detail": key})
+            continue
+        kind, value = key
+        player_id = byName[value] if kind == "name" else value
+        if kind == "id" and player_id not in found:
+            results.append({"row": number, "status": "error", "detail": "Player not found"})
+        elif player_id in seen:
+            results.append({"row": number, "status": "error", "player_id": player_id,
+                            "detail": "Duplicated player in import"})
+        else:
+            seen.add(player_id)
+            results.append({"row": number, "player_id": player_id,
+                            "status": "created" if kind == "name" and value in created else "found"})
+    if tournament_id is None:
+        return results
+
+    playerIds = [r["player_id"] for r in results if r["status"] != "error"]
+    registered = set(await db.scalars(
+        select(tournamentsPlayers.c.player_id)
+        .where(tournamentsPlayers.c.tournament_id == tournament_id,
+               tournamentsPlayers.c.player_id.in_(playerIds))
+    )) if playerIds else set()
+    new = [pid for pid in playerIds if pid not in registered]
+    if new:
+        await db.execute(insert(tournamentsPlayers),
+                         [{"tournament_id": tournament_id, "player_id": pid} for pid in new])
+        await db.execute(insert(_scores),
+                         [{"tournament_id": tournament_id, "player_id": pid, "score": 0} for pid in new])
+    for r in results:
+        if r["status"] == "error":
+            continue
+        r["registered"] = r["player_id"] not in registered
+        if not r["registered"]:
+            r["detail"] = "This player is in the tournament"
+    return results
+
+
+async def importRoster(db: AsyncSession, chunks: AsyncIterator[bytes], fmt: str,
+                       tournament_id: Optional[int] = None) -> List[dict]:
+    """Create the missing players of the roster and, given a tournament, register
+    them with their score rows; returns one result per row (numbered from 1)"""
+    results: List[dict] = []
+    seen: set = set()
+    batch = []
+    number = 0
+    async for row, error in parseRows(chunks, fmt):
+        number += 1
+        batch.append((number, row, error))
+        if len(batch) == IMPORT_BATCH:
+            results.extend(await _writeBatch(db, batch, tournament_id, seen))
+            batch = []
+    if batch:
+        results.extend(await _writeBatch(db, batch, tournament_id, seen))
+    return results
@@ -7,6 +7,10 @@ class StandingBase(BaseModel):
     player_id: int
     player_name: str
     final_score: int
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+    buchholz: int = 0
 
     class Config:
         orm_mode = True
@@ -24,6 +28,31 @@ class TournamentBaseSimple(BaseModel):
 
 # Player schema with tournaments
 class PlayerBase(BaseModel):
+    id: int
+    name: str
+    creationDate: datetime
+    personalScore: int
+    rating: float = 1500.0
+    tournament: List[TournamentBaseSimple] = []
+
+    class Config:
+        orm_mode = True
+
+# Player statistics (GET /player/{id}/stats)
+class PlayerStatsBase(BaseModel):
+    player_id: int
+    matches_played: int = 0
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+    tournaments_played: int = 0
+    first_places: int = 0
+    second_places: int = 0
+    third_places: int = 0
+
+# Jugador dentro de un torneo: sin rating, que cambia con los resultados de
+# cualquier otro torneo e invalidaría todos los torneos del jugador
+class TournamentPlayerBase(BaseModel):
     id: int
     name: str
     creationDate: datetime
@@ -47,12 +76,13 @@ class TournamentScoreBase(BaseModel):
 class MatchBase(BaseModel):
     id: int
     tournament_id: Optional[int] = None
-    player1_id: int
+    player1_id: Optional[int] = None  # None hasta que se decide en el cuadro
     player2_id: Optional[int] = None
     win: Optional[int] = None
     status: bool = False
     draw: bool = False
     phase: int = 1  # Add this line
+    next_match_id: Optional[int] = None
 
     class Config:
         orm_mode = True
@@ -64,10 +94,28 @@ class TournamentBase(BaseModel):
     type: str
     creationDate: datetime
     status: bool
-    players: List[PlayerBase] = []
+    seeding: str = "random"
+    seed: Optional[int] = None
+    players: List[TournamentPlayerBase] = []
     scores: List[TournamentScoreBase] = []
     matches: List[MatchBase] = []
     final_standings: List[StandingBase] = []  # Add this field
 
     class Config:
         orm_mode = True
+
+# Background job (see jobs.py)
+class JobBase(BaseModel):
+    id: int
+    kind: str
+    tournament_id: int
+    status: str
+    progress: int = 0
+    stage: Optional[str] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    error_status: Optional[int] = None
+    attempts: int = 0
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -0,0 +1,76 @@
+"""Deterministic seeding and first-round bracket placement.
+
+Pure functions: the same players, mode and seed always give the same
+bracket, so a tournament can be replayed from its stored seed, and the
+pairing can be benchmarked and checked without a database.
+"""
+import random
+from typing import List, Optional, Sequence, Tuple
+
+SEEDING_MODES = ("random", "rating")
+
+Pair = Tuple[int, Optional[int]]
+
+
+def newSeed() -> int:
+    """Seed for a new tournament (fits a SQLite INTEGER and JS numbers)"""
+    return random.SystemRandom().randrange(1, 2 ** 31)
+
+
+def seedOrder(players: Sequence[Tuple[int, int]], mode: str, seed: int) -> List[int]:
+    """Order (player_id, rating) pairs from seed 1 to N.
+
+    "random" shuffles; "rating" sorts by rating, highest first, and only
+    uses the seeded RNG to break rating ties.
+    """
+    if mode not in SEEDING_MODES:
+        raise ValueError(f"Invalid seeding mode: {mode}")
+    rng = random.Random(seed)
+    # Entrada canónica: el orden en que llegan los jugadores no influye
+    ordered = sorted(players)
+    rng.shuffle(ordered)
+    if mode == "rating":
+        # sort es estable: los empates conservan el orden aleatorio
+        ordered.sort(key=lambda p: -(p[1] or 0))
+    return [player_id for player_id, _ in ordered]
+
+
+def bracketSize(players: int) -> int:
+    """Smallest power of two that fits every player (at least 2)"""
+    size = 2
+    while size < players:
+        size *= 2
+    return size
+
+
+def bracketSlots(size: int) -> List[int]:
+    """Seed numbers in standard bracket order: 1, N, N/2, N/2+1, ...
+
+    Built by mirroring: every seed s in a bracket of n becomes s and
+    2n+1-s in one of 2n, so 1 and 2 can only meet in the final.
+    """
+    slots = [1]
+    while len(slots) < size:
+        mirror = len(slots) * 2 + 1
+        slots = [seed for s in slots for seed in (s, mirror - s)]
+    return slots
+
+
+def bracketPairs(seeded: Sequence[int]) -> List[Pair]:
+    """First-round pairs for players listed from seed 1 to N.
+
+    The bracket is padded to a power of two and the missing seeds are byes,
+    which therefore go to the top seeds. Pairs come in bracket order, so
+    pairing the winners of consecutive matches walks the bracket.
+    """
+    slots = bracketSlots(bracketSize(len(seeded)))
+    pairs = []
+    for i in range(0, len(slots), 2):
+        top, bottom = slots[i], slots[i + 1]
+        pairs.append((seeded[top - 1], seeded[bottom - 1] if bottom <= len(seeded) else None))
+    return pairs
+
+
+def drawWinner(seed: int, match_id: int, player1_id: int, player2_id: int) -> int:
+    """Player that advances from a drawn elimination match, reproducible from the seed"""
+    return random.Random(f"{seed}:{match_id}").choice((player1_id, player2_id))
@@ -0,0 +1,386 @@
+"""Standings maintained incrementally per tournament.
+
+Each TournamentScores row carries the player's points, wins, draws, losses,
+Buchholz (sum of the points of the opponents already faced) and current
+position. Results update those counters in the same transaction that marks
+the match as played, so reading the standings is a single ordered SELECT
+instead of re-sorting and rescanning the matches on every request.
+
+Tie-breakers, in order: points, Buchholz, wins, head-to-head between two
+tied players, player id.
+"""
+import asyncio
+from collections import defaultdict
+from typing import Dict, List, Sequence, Set, Tuple
+
+from sqlalchemy import bindparam, select, update, or_, tuple_, exists, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from models import Matches, TournamentScores, Players, Tournament, SessionLocal, engine
+import playerStats
+import rating
+import seeding
+import versions
+
+POINTS_WIN = 3
+POINTS_DRAW = 1
+
+_scores = TournamentScores.__table__
+_matches = Matches.__table__
+
+# UPDATE ... WHERE tournament_id = ? AND player_id = ? ejecutado como executemany
+_applyDelta = (
+    update(_scores)
+    .where(_scores.c.tournament_id == bindparam("b_tournament"),
+           _scores.c.player_id == bindparam("b_player"))
+    .values(score=_scores.c.score + bindparam("b_score"),
+            wins=_scores.c.wins + bindparam("b_wins"),
+            draws=_scores.c.draws + bindparam("b_draws"),
+            losses=_scores.c.losses + bindparam("b_losses"),
+            buchholz=_scores.c.buchholz + bindparam("b_buchholz"))
+)
+
+_setPosition = (
+    update(_scores)
+    .where(_scores.c.id == bindparam("b_id"))
+    .values(position=bindparam("b_position"))
+)
+
+
+_finishMatch = (
+    update(_matches)
+    .where(_matches.c.id == bindparam("b_id"))
+    .values(win=bindparam("b_win"), status=True, draw=bindparam("b_draw"))
+)
+
+# Cuadro de eliminación: el ganador ocupa su asiento en la partida siguiente
+_seatPlayer1 = (
+    update(_matches)
+    .where(_matches.c.id == bindparam("b_id"))
+    .values(player1_id=bindparam("b_player"))
+)
+
+_seatPlayer2 = (
+    update(_matches)
+    .where(_matches.c.id == bindparam("b_id"))
+    .values(player2_id=bindparam("b_player"))
+)
+
+
+def _emptyDelta() -> Dict[str, int]:
+    return {"b_score": 0, "b_wins": 0, "b_draws": 0, "b_losses": 0, "b_buchholz": 0}
+
+
+async def claimMatches(db: AsyncSession, match_ids: Sequence[int]) -> Set[int]:
+    """Mark as played the matches that are still pending and have both players, and
+    return their ids: one conditional UPDATE, so two concurrent submissions of the
+    same result cannot both pass. Run it before reading anything in the
+    transaction: SQLite then grants the write lock before the rows are checked.
+    """
+    if not match_ids:
+        return set()
+    claimed = await db.execute(
+        update(_matches)
+        .where(_matches.c.id.in_(set(match_ids)), _matches.c.status == False,
+               _matches.c.player1_id.isnot(None), _matches.c.player2_id.isnot(None))
+        .values(status=True)
+        .returning(_matches.c.id)
+    )
+    return set(claimed.scalars())
+
+
+async def applyResults(db: AsyncSession, results: Sequence[Tuple[Matches, int, bool]]) -> None:
+    """Add the outcome of unfinished (or just claimed) matches to the standings.
+
+    ``results`` holds ``(match, winner_id, draw)`` tuples. The caller marks
+    the matches as finished and commits.
+    """
+    deltas: Dict[Tuple[int, int], Dict[str, int]] = defaultdict(_emptyDelta)
+    pairs: List[Tuple[int, int, int]] = []
+    for match, winner_id, draw in results:
+        t = match.tournament_id
+        p1, p2 = match.player1_id, match.player2_id
+        if p2 is None:
+            # Bye: cuenta como victoria y no suma rival al Buchholz
+            deltas[(t, p1)]["b_score"] += POINTS_WIN
+            deltas[(t, p1)]["b_wins"] += 1
+            continue
+        if draw:
+            for player_id in (p1, p2):
+                deltas[(t, player_id)]["b_score"] += POINTS_DRAW
+                deltas[(t, player_id)]["b_draws"] += 1
+        else:
+            loser_id = p2 if winner_id == p1 else p1
+            deltas[(t, winner_id)]["b_score"] += POINTS_WIN
+            deltas[(t, winner_id)]["b_wins"] += 1
+            deltas[(t, loser_id)]["b_losses"] += 1
+        pairs.append((t, p1, p2))
+    if not deltas:
+        return
+    # Partidas de este lote: pueden estar ya reclamadas, pero no son rivales anteriores
+    current_ids = [match.id for match, _, _ in results if match.id is not None]
+
+    byTournament: Dict[int, List[int]] = defaultdict(list)
+    for t, player_id in deltas:
+        byTournament[t].append(player_id)
+
+    for t, players in byTournament.items():
+        current = dict((await db.execute(
+            select(_scores.c.player_id, _scores.c.score)
+            .where(_scores.c.tournament_id == t, _scores.c.player_id.in_(players))
+        )).all())
+
+        # Los rivales ya enfrentados suman los puntos nuevos a su Buchholz
+        changed = [p for p in players if deltas[(t, p)]["b_score"]]
+        if changed:
+            played = await db.execute(
+                select(Matches.player1_id, Matches.player2_id)
+                .where(Matches.tournament_id == t,
+                       Matches.status == True,
+                       Matches.player2_id.isnot(None),
+                       Matches.id.notin_(current_ids),
+                       or_(Matches.player1_id.in_(changed), Matches.player2_id.in_(changed)))
+            )
+            for a, b in played:
+                if (t, a) in deltas:
+                    deltas[(t, b)]["b_buchholz"] += deltas[(t, a)]["b_score"]
+                if (t, b) in deltas:
+                    deltas[(t, a)]["b_buchholz"] += deltas[(t, b)]["b_score"]
+
+        # Los rivales nuevos suman la puntuación completa del otro jugador
+        after = {p: current.get(p, 0) + deltas[(t, p)]["b_score"] for p in players}
+        for pt, p1, p2 in pairs:
+            if pt == t:
+                deltas[(t, p1)]["b_buchholz"] += after[p2]
+                deltas[(t, p2)]["b_buchholz"] += after[p1]
+
+    await db.execute(_applyDelta, [
+        {"b_tournament": t, "b_player": p, **delta} for (t, p), delta in deltas.items()
+    ])
+    for t in byTournament:
+        await refreshPositions(db, t)
+
+
+async def recordResults(db: AsyncSession, results: Sequence[Tuple[Matches, int, bool]]) -> None:
+    """Store match results, their standings changes, the new player ratings
+    and the players' records in the caller's transaction.
+
+    Scores and matches are written with one executemany UPDATE each, however
+    many results there are.
+    """
+    await applyResults(db, results)
+    await db.execute(_finishMatch, [
+        {"b_id": match.id, "b_win": -1 if draw else winner_id, "b_draw": draw}
+        for match, winner_id, draw in results
+    ])
+    # Refleja el resultado en los objetos cargados sin volver a escribirlos
+    for match, winner_id, draw in results:
+        set_committed_value(match, "win", -1 if draw else winner_id)
+        set_committed_value(match, "status", True)
+        set_committed_value(match, "draw", draw)
+    await advanceWinners(db, results)
+    await rating.applyResults(db, results)
+    await playerStats.applyResults(db, results)
+    await versions.bumpVersion(db, *{match.tournament_id for match, _, _ in results})
+
+
+async def advanceWinners(db: AsyncSession, results: Sequence[Tuple[Matches, int, bool]]) -> None:
+    """Seat the winner of each bracket match in the match it feeds.
+
+    One UPDATE by primary key per result, so no phase is rescanned. A draw
+    cannot knock both players out: the tournament seed picks who advances.
+    """
+    linked = [(match, winner_id, draw) for match, winner_id, draw in results
+              if match.next_match_id is not None]
+    if not linked:
+        return
+    seeds: Dict[int, int] = {}
+    drawn = {match.tournament_id for match, _, draw in linked if draw}
+    if drawn:
+        seeds = dict((await db.execute(
+            select(Tournament.id, Tournament.seed).where(Tournament.id.in_(drawn))
+        )).all())
+
+    seats: Tuple[List[Dict], List[Dict]] = ([], [])
+    for match, winner_id, draw in linked:
+        if draw:
+            winner_id = seeding.drawWinner(seeds.get(match.tournament_id) or 0, match.id,
+                                           match.player1_id, match.player2_id)
+        seats[match.bracket_slot % 2].append({"b_id": match.next_match_id, "b_player": winner_id})
+    if seats[0]:
+        await db.execute(_seatPlayer1, seats[0])
+    if seats[1]:
+        await db.execute(_seatPlayer2, seats[1])
+
+
+async def awardByes(db: AsyncSession, tournament_id: int, player_ids: Sequence[int]) -> None:
+    """Count byes (matches stored already finished, without opponent) as wins"""
+    await applyResults(db, [
+        (Matches(tournament_id=tournament_id, player1_id=player_id, player2_id=None), player_id, False)
+        for player_id in player_ids
+    ])
+
+
+async def placeNewPlayer(db: AsyncSession, tournament_id: int, player_id: int) -> None:
+    """Give a just registered player its position without re-ranking the tournament.
+
+    A newcomer has no points, so it ranks last unless a scoreless player with
+    a higher id is already registered; only then the table is re-ranked.
+    """
+    behind = await db.scalar(select(exists().where(
+        _scores.c.tournament_id == tournament_id,
+        _scores.c.score == 0, _scores.c.buchholz == 0, _scores.c.wins == 0,
+        _scores.c.player_id > player_id,
+    )))
+    if behind:
+        await refreshPositions(db, tournament_id)
+        return
+    total = await db.scalar(select(func.count()).select_from(_scores).where(_scores.c.tournament_id == tournament_id))
+    await db.execute(
+        update(_scores)
+        .where(_scores.c.tournament_id == tournament_id, _scores.c.player_id == player_id)
+        .values(position=total)
+    )
+
+
+async def refreshPositions(db: AsyncSession, tournament_id: int) -> None:
+    """Re-rank a tournament from its score rows and store the positions that changed"""
+    rows = (await db.execute(
+        select(_scores.c.id, _scores.c.player_id, _scores.c.score, _scores.c.buchholz,
+               _scores.c.wins, _scores.c.position)
+        .where(_scores.c.tournament_id == tournament_id)
+        .order_by(_scores.c.score.desc(), _scores.c.buchholz.desc(),
+                  _scores.c.wins.desc(), _scores.c.player_id)
+    )).all()
+    rows = await _headToHead(db, tournament_id, rows)
+
+    changes = [
+        {"b_id": row.id, "b_position": position}
+        for position, row in enumerate(rows, start=1)
+        if row.position != position
+    ]
+    if changes:
+        await db.execute(_setPosition, changes)
+
+
+async def _headToHead(db: AsyncSession, tournament_id: int, rows: List) -> List:
+    """Swap two tied players when the lower one won their direct match"""
+    key = lambda row: (row.score, row.buchholz, row.wins)
+    ties = [
+        i for i in range(len(rows) - 1)
+        if key(rows[i]) == key(rows[i + 1])
+        and (i == 0 or key(rows[i - 1]) != key(rows[i]))
+        and (i + 2 == len(rows) or key(rows[i + 2]) != key(rows[i]))
+    ]
+    if not ties:
+        return rows
+
+    pairs = [(rows[i].player_id, rows[i + 1].player_id) for i in ties]
+    winners = dict(((p1, p2), win) for p1, p2, win in (await db.execute(
+        select(Matches.player1_id, Matches.player2_id, Matches.win)
+        .where(Matches.tournament_id == tournament_id,
+               Matches.status == True,
+               Matches.draw == False,
+               or_(tuple_(Matches.player1_id, Matches.player2_id).in_(pairs),
+                   tuple_(Matches.player2_id, Matches.player1_id).in_(pairs)))
+    )).all())
+
+    rows = list(rows)
+    for i in ties:
+        upper, lower = rows[i].player_id, rows[i + 1].player_id
+        if lower in (winners.get((upper, lower)), winners.get((lower, upper))):
+            rows[i], rows[i + 1] = rows[i + 1], rows[i]
+    return rows
+
+
+async def getStandings(db: AsyncSession, tournament_id: int) -> List[dict]:
+    """Read the maintained standings of a tournament"""
+    rows = await db.execute(
+        select(_scores.c.player_id, Players.name, _scores.c.score, _scores.c.wins,
+               _scores.c.draws, _scores.c.losses, _scores.c.buchholz)
+        .join(Players, Players.id == _scores.c.player_id)
+        .where(_scores.c.tournament_id == tournament_id)
+        .order_by(_scores.c.position.is_(None), _scores.c.position, _scores.c.score.desc())
+    )
+    return [
+        {
+            "position": i + 1,
+            "player_id": row.player_id,
+            "player_name": row.name,
+            "final_score": row.score,
+            "wins": row.wins,
+            "draws": row.draws,
+            "losses": row.losses,
+            "buchholz": row.buchholz,
+        }
+        for i, row in enumerate(rows)
+    ]
+
+
+async def rebuildStandings(db: AsyncSession, tournament_id: int) -> None:
+    """Recompute a tournament's standings from all of its matches (backfills, and
+    deleted matches or scores, whose share cannot be subtracted incrementally).
+
+    Gives the same counters as the incremental path: swiss byes count as wins
+    (see awardByes) and Buchholz is the sum of the final points of every
+    opponent faced. All matches are read once and the table is re-ranked once.
+    """
+    tournament_type = await db.scalar(select(Tournament.type).where(Tournament.id == tournament_id))
+    await db.execute(
+        update(_scores)
+        .where(_scores.c.tournament_id == tournament_id)
+        .values(score=0, wins=0, draws=0, losses=0, buchholz=0, position=None)
+    )
+    matches = (await db.execute(
+        select(_matches.c.player1_id, _matches.c.player2_id, _matches.c.win, _matches.c.draw)
+        .where(_matches.c.tournament_id == tournament_id,
+               _matches.c.status == True,
+               _matches.c.player1_id.isnot(None))
+    )).all()
+
+    deltas: Dict[int, Dict[str, int]] = defaultdict(_emptyDelta)
+    opponents: List[Tuple[int, int]] = []
+    for p1, p2, win, draw in matches:
+        if p2 is None:
+            # Solo los byes del suizo puntúan (awardByes); los del cuadro no
+            if tournament_type == "swiss":
+                deltas[p1]["b_score"] += POINTS_WIN
+                deltas[p1]["b_wins"] += 1
+            continue
+        if draw:
+            for player_id in (p1, p2):
+                deltas[player_id]["b_score"] += POINTS_DRAW
+                deltas[player_id]["b_draws"] += 1
+        else:
+            loser_id = p2 if win == p1 else p1
+            deltas[win]["b_score"] += POINTS_WIN
+            deltas[win]["b_wins"] += 1
+            deltas[loser_id]["b_losses"] += 1
+        opponents.append((p1, p2))
+
+    # Buchholz con la puntuación final de cada rival, una vez por partida jugada
+    points = {player_id: delta["b_score"] for player_id, delta in deltas.items()}
+    for p1, p2 in opponents:
+        deltas[p1]["b_buchholz"] += points.get(p2, 0)
+        deltas[p2]["b_buchholz"] += points.get(p1, 0)
+
+    if deltas:
+        await db.execute(_applyDelta, [
+            {"b_tournament": tournament_id, "b_player": p, **delta} for p, delta in deltas.items()
+        ])
+    await refreshPositions(db, tournament_id)
+
+
+async def _rebuildAll() -> None:
+    async with SessionLocal() as db:
+        tournament_ids = (await db.execute(select(Tournament.id))).scalars().all()
+        for tournament_id in tournament_ids:
+            await rebuildStandings(db, tournament_id)
+        await db.commit()
+    await engine.dispose()
+    print(f"Standings rebuilt for {len(tournament_ids)} tournaments")
+
+
+if __name__ == "__main__":
+    asyncio.run(_rebuildAll())
@@ -0,0 +1,160 @@
+"""Swiss-system pairing.
+
+Players are ranked by score and paired so that the total cost of the round
+is minimal, where pairing two players costs the squared difference of their
+scores (weighted) plus, for players from different score groups, their
+distance in the ranking, so that the lowest ranked players float down.
+Rematches are not allowed. With an odd number of players one of them gets a
+bye, preferably the lowest ranked player who has not had one yet.
+
+That is a minimum-cost perfect matching, solved with Edmonds' blossom
+algorithm (blossom.py) in polynomial time on a sparse candidate graph: every
+player is joined to the ``candidates`` nearest players above and below them
+in the ranking that they have not met yet, and the bye to the lowest ranked
+players still without one. Rematches never enter the graph, so players who
+have met their neighbours simply reach further; the players reached that way
+from above take a few such claims each, so a group of leaders who all met
+each other spreads down the standings instead of competing for the same
+players. If the candidate graph has
+no perfect matching (late rounds of small events), the number of candidates
+is doubled up to the complete graph.
+
+Inside a score group every pairing costs the same, which keeps the matching
+fast (rank distances there would make the blossom trees grow one step at a
+time); the players the matching keeps inside each group are then paired in
+ranking order, each with the nearest one below they have not met, when that
+pairs the whole group.
+"""
+import math
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+
+from blossom import maxWeightMatching
+
+SCORE_WEIGHT = 1000
+DEFAULT_CANDIDATES = 6
+
+
+def swissRounds(players: int) -> int:
+    """Number of rounds needed to find a single undefeated player"""
+    return max(1, math.ceil(math.log2(players))) if players > 1 else 1
+
+
+def pairRound(ranked: Sequence[Tuple[int, int]], played: Set[FrozenSet[int]],
+              hadBye: Iterable[int] = (), candidates: int = DEFAULT_CANDIDATES
+              ) -> Tuple[List[Tuple[int, int]], Optional[int]]:
+    """Pair one Swiss round.
+
+    ``ranked`` is a list of ``(player_id, score)`` ordered from first to last
+    in the standings, ``played`` holds the pairs that already met and
+    ``hadBye`` the players that already received a bye. Returns the list of
+    ``(player1_id, player2_id)`` pairs, higher ranked player first and in
+    ranking order, and the player that gets the bye (or None with an even
+    number of players).
+    """
+    hadBye = set(hadBye)
+    n = len(ranked)
+    if n < 2:
+        raise ValueError("Not enough players to pair a round")
+
+    candidates = max(1, min(candidates, n - 1))
+    while True:
+        result = _matchCandidates(ranked, played, hadBye, candidates)
+        if result is not None:
+            return result
+        if candidates >= n - 1:
+            raise ValueError("No pairing without rematches is possible")
+        candidates = min(candidates * 2, n - 1)
+
+
+def _candidateCosts(ranked, played, hadBye, candidates: int) -> Dict[Tuple[int, int], int]:
+    """Cost of each candidate pair of positions (i < j); position n is the bye"""
+    n = len(ranked)
+    ids = [player_id for player_id, _ in ranked]
+    scores = [score for _, score in ranked]
+    costs: Dict[Tuple[int, int], int] = {}
+    # Candidatos que cada jugador recibe de jugadores que ya saltaron a rivales
+    # repetidos: un grupo de líderes que se enfrentaron entre sí se reparte hacia
+    # abajo en vez de pedir todos a los mismos
+    reached = [0] * n
+    cap = max(1, candidates // 2)
+    for i in range(n):
+        # Los rivales más cercanos por arriba y por abajo que aún no ha tenido
+        for step in (1, -1):
+            found = 0
+            skipped = False
+            j = i + step
+            while 0 <= j < n and found < candidates:
+                if frozenset((ids[i], ids[j])) in played:
+                    skipped = True
+                elif not (skipped and step > 0 and reached[j] >= cap):
+                    a, b = min(i, j), max(i, j)
+                    gap = scores[a] - scores[b]
+                    costs[(a, b)] = SCORE_WEIGHT * gap ** 2 + (b - a) if gap else 0
+                    reached[j] += skipped and step > 0
+                    found += 1
+                j += step
+    if n % 2 == 1:
+        lowest = min(scores)
+        eligible = [i for i in range(n - 1, -1, -1) if ids[i] not in hadBye][:candidates]
+        for i in eligible:
+            costs[(i, n)] = SCORE_WEIGHT * (scores[i] - lowest) ** 2 + (n - 1 - i)
+    return costs
+
+
+def _matchCandidates(ranked, played, hadBye, candidates: int):
+    n = len(ranked)
+    vertices = n + n % 2
+    costs = _candidateCosts(ranked, played, hadBye, candidates)
+    if not costs:
+        return None
+
+    # Coste mínimo = peso máximo con pesos positivos: todas las parejas
+    # perfectas tienen el mismo número de aristas
+    top = max(costs.values()) + 1
+    edges = [(i, j, top - cost) for (i, j), cost in costs.items()]
+
+    # Arranque: parejas voraces con las aristas más baratas, ya ajustadas en los duales iniciales
+    cheapest = min(costs.values())
+    taken = [False] * vertices
+    initial = []
+    for (i, j), cost in sorted(costs.items()):
+        if cost == cheapest and not taken[i] and not taken[j]:
+            taken[i] = taken[j] = True
+            initial.append((i, j))
+
+    mate = maxWeightMatching(vertices, edges, maxCardinality=True, initial=initial)
+    if -1 in mate:
+        return None
+
+    ids = [player_id for player_id, _ in ranked]
+    byePlayer = ids[mate[n]] if n % 2 else None
+    positions = _byRanking(ranked, played, [(i, mate[i]) for i in range(n) if i < mate[i] < n])
+    return [(ids[i], ids[j]) for i, j in positions], byePlayer
+
+
+def _byRanking(ranked, played, positions: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Re-pair the players matched inside each score group in ranking order"""
+    ids = [player_id for player_id, _ in ranked]
+    groups: Dict[int, List[int]] = {}
+    result = []
+    for i, j in positions:
+        if ranked[i][1] == ranked[j][1]:
+            groups.setdefault(ranked[i][1], []).extend((i, j))
+        else:
+            result.append((i, j))
+    for score, members in groups.items():
+        members.sort()
+        free = members[:]
+        ordered = []
+        while free:
+            i = free.pop(0)
+            j = next((j for j in free if frozenset((ids[i], ids[j])) not in played), None)
+            if j is None:
+                break
+            free.remove(j)
+            ordered.append((i, j))
+        if free or len(ordered) * 2 != len(members):
+            # El orden voraz deja a alguien sin rival: se queda el emparejamiento óptimo
+            ordered = [(i, j) for i, j in positions if ranked[i][1] == score == ranked[j][1]]
+        result.extend(ordered)
+    return sorted(result)
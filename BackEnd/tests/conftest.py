@@ -0,0 +1,60 @@
+"""Shared fixtures for the test suite.
+
+Importing this module points DB_URL at a temporary SQLite file before any
+project module is imported (as benchmarks/common.py does), and every test
+gets empty tables and an in-process client.
+
+Usage (from BackEnd/):
+    python -m pytest
+"""
+import os
+import sys
+import tempfile
+
+_tmpdir = tempfile.mkdtemp(prefix="magic-test-")
+os.environ["DB_URL"] = f"sqlite:///{os.path.join(_tmpdir, 'test.sqlite')}"
+# Sin caché de respuestas: las pruebas cuentan y leen las consultas reales
+os.environ["CACHE_ENABLED"] = "false"
+os.environ.setdefault("LOG_LEVEL", "CRITICAL")
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+from main import app  # noqa: E402
+from models import Base, engine  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def client():
+    """Client for the ASGI app over freshly created tables"""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+        yield c
+    # Las conexiones de aiosqlite pertenecen al bucle de eventos de esta prueba
+    await engine.dispose()
+
+
+@pytest.fixture
+def newTournament(client):
+    """Factory: import `players` players (ids 1..players on the fresh tables), register
+    them in a new tournament of the given type and generate its first matches"""
+    async def create(tournament_type: str, players: int) -> int:
+        names = "".join(f"P{i}\n" for i in range(players))
+        await client.post("/player/import", content=f"name\n{names}".encode())
+        tournament = await client.post("/tournament", json={"name": tournament_type, "type": tournament_type})
+        tournament_id = tournament.json()["id"]
+        roster = "".join(f"{i}\n" for i in range(1, players + 1))
+        await client.post(f"/tournament/{tournament_id}/import", content=f"player_id\n{roster}".encode())
+        await client.post(f"/tournament/{tournament_id}/generate_matches")
+        return tournament_id
+    return create
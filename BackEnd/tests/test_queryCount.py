@@ -0,0 +1,29 @@
+"""Query budgets of the read endpoints (see queryBudget.py).
+
+The statement count of each endpoint must stay within its budget as the
+data grows, so a new lazy load or per-row query fails here.
+"""
+import pytest
+
+from queryBudget import BUDGETS, measure, overBudget
+
+pytestmark = pytest.mark.anyio
+
+# Jugadores totales en cada paso; cada paso añade un torneo con partidas
+STEPS = [10, 40]
+ROSTER = 16
+
+
+async def test_read_endpoints_within_query_budget(client):
+    created = 0
+    for step, players in enumerate(STEPS, start=1):
+        for i in range(created, players):
+            await client.post("/player", json={"name": f"Player {i}"})
+        await client.post("/tournament", json={"name": f"Step {players}", "type": "roundRobin"})
+        for p in range(1, min(players, ROSTER) + 1):
+            await client.post(f"/tournament/{step}/player/{p}")
+        await client.post(f"/tournament/{step}/generate_matches")
+        created = players
+
+        over = overBudget(await measure(client))
+        assert not over, f"over budget with {players} players: {over} (budgets {BUDGETS})"
@@ -0,0 +1,50 @@
+"""Results: a match result is claimed once, whatever the concurrency."""
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+import standings
+from main import RESULT_ALREADY_SET
+from models import Matches, SessionLocal
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_claim_matches_is_conditional(client, newTournament):
+    tournament_id = await newTournament("roundRobin", 4)
+    async with SessionLocal() as db:
+        ids = list((await db.scalars(select(Matches.id).where(Matches.tournament_id == tournament_id))).all())
+    async with SessionLocal() as db:
+        assert await standings.claimMatches(db, ids[:2]) == set(ids[:2])
+        await db.commit()
+    async with SessionLocal() as db:
+        # Las ya reclamadas no se devuelven otra vez
+        assert await standings.claimMatches(db, ids) == set(ids[2:])
+        assert await standings.claimMatches(db, []) == set()
+
+
+async def test_concurrent_result_applied_once(client, newTournament):
+    tournament_id = await newTournament("swiss", 8)
+    match = (await client.get(f"/tournament/{tournament_id}")).json()["matches"][0]
+    url = f"/match/{match['id']}/{match['player1_id']}/false"
+
+    responses = await asyncio.gather(*(client.post(url) for _ in range(10)))
+    assert sorted(r.status_code for r in responses) == [200] + [409] * 9
+    assert {r.json()["detail"] for r in responses if r.status_code == 409} == {RESULT_ALREADY_SET}
+
+    table = (await client.get(f"/tournament/{tournament_id}/standings")).json()
+    assert sum(row["wins"] for row in table) == 1
+    assert sum(row["final_score"] for row in table) == 3
+
+
+async def test_batch_skips_already_set_results(client, newTournament):
+    tournament_id = await newTournament("swiss", 8)
+    match = (await client.get(f"/tournament/{tournament_id}")).json()["matches"][0]
+    body = [{"match_id": match["id"], "winner_id": match["player2_id"]}]
+
+    responses = await asyncio.gather(*(client.post("/match/results", json=body) for _ in range(4)))
+    assert sorted(r.json()["applied"] for r in responses) == [0, 0, 0, 1]
+
+    table = (await client.get(f"/tournament/{tournament_id}/standings")).json()
+    assert sum(row["wins"] for row in table) == 1
@@ -0,0 +1,81 @@
+"""Standings: the full rebuild agrees with the incremental path."""
+import random
+
+import pytest
+from sqlalchemy import select
+
+import standings
+from models import Matches, SessionLocal, TournamentScores
+
+pytestmark = pytest.mark.anyio
+
+
+async def snapshot(tournament_id: int):
+    async with SessionLocal() as db:
+        rows = await db.execute(
+            select(TournamentScores.player_id, TournamentScores.score, TournamentScores.wins,
+                   TournamentScores.draws, TournamentScores.losses, TournamentScores.buchholz,
+                   TournamentScores.position)
+            .where(TournamentScores.tournament_id == tournament_id)
+            .order_by(TournamentScores.player_id)
+        )
+        return rows.all()
+
+
+async def playOut(client, tournament_id: int, rng: random.Random, draws: bool) -> None:
+    # Resultados aleatorios fase a fase hasta que no hay más fases
+    while True:
+        matches = (await client.get(f"/tournament/{tournament_id}")).json()["matches"]
+        for m in matches:
+            # Solo las partidas con los dos jugadores: en eliminación las siguientes esperan rival
+            if not m["status"] and m["player1_id"] is not None and m["player2_id"] is not None:
+                winner = rng.choice([m["player1_id"], m["player2_id"]])
+                draw = str(draws and rng.random() < 0.2).lower()
+                assert (await client.post(f"/match/{m['id']}/{winner}/{draw}")).status_code == 200
+        advanced = (await client.post(f"/tournament/{tournament_id}/next-phase")).json()
+        if "Advanced" not in advanced.get("message", ""):
+            return
+
+
+# 9 jugadores: número impar, así el suizo reparte byes
+@pytest.mark.parametrize("tournament_type", ["swiss", "elimination", "roundRobin"])
+async def test_rebuild_matches_incremental(client, newTournament, tournament_type):
+    tournament_id = await newTournament(tournament_type, 9)
+    # La eliminación directa no admite empates
+    await playOut(client, tournament_id, random.Random(3), draws=tournament_type != "elimination")
+    incremental = await snapshot(tournament_id)
+    assert sum(row.wins for row in incremental) > 0
+
+    async with SessionLocal() as db:
+        await standings.rebuildStandings(db, tournament_id)
+        await db.commit()
+    assert await snapshot(tournament_id) == incremental
+
+
+async def test_swiss_bye_counts_as_win_after_rebuild(client, newTournament):
+    tournament_id = await newTournament("swiss", 5)
+    async with SessionLocal() as db:
+        bye = await db.scalar(select(Matches).where(Matches.tournament_id == tournament_id,
+                                                    Matches.player2_id.is_(None)))
+    assert bye is not None and bye.status
+
+    async with SessionLocal() as db:
+        await standings.rebuildStandings(db, tournament_id)
+        await db.commit()
+    rows = {row.player_id: row for row in await snapshot(tournament_id)}
+    assert rows[bye.player1_id].wins == 1
+    assert rows[bye.player1_id].buchholz == 0
+
+
+async def test_deleting_finished_match_takes_its_result_out(client, newTournament):
+    tournament_id = await newTournament("roundRobin", 4)
+    match = (await client.get(f"/tournament/{tournament_id}")).json()["matches"][0]
+    winner, loser = match["player1_id"], match["player2_id"]
+    await client.post(f"/match/{match['id']}/{winner}/false")
+    assert (await client.get(f"/player/{winner}/stats")).json()["wins"] == 1
+
+    assert (await client.delete(f"/matches/{match['id']}")).json() == {"message": "Match deleted"}
+    rows = {row.player_id: row for row in await snapshot(tournament_id)}
+    assert rows[winner].score == rows[winner].wins == rows[loser].losses == 0
+    assert (await client.get(f"/player/{winner}/stats")).json()["wins"] == 0
+    assert (await client.get(f"/player/{loser}/stats")).json()["losses"] == 0
@@ -0,0 +1,69 @@
+"""Swiss pairing: optimal score gaps, no rematches, byes to the lowest."""
+import random
+
+import pytest
+
+from swiss import pairRound
+
+
+def gapCost(ranked, pairs):
+    scores = dict(ranked)
+    return sum((scores[a] - scores[b]) ** 2 for a, b in pairs)
+
+
+def bestGapCost(ranked, played):
+    # Todas las parejas perfectas sin revanchas, por fuerza bruta
+    scores = dict(ranked)
+
+    def best(free):
+        if not free:
+            return 0
+        a, rest = free[0], free[1:]
+        costs = [(scores[a] - scores[b]) ** 2 + best(rest[:k] + rest[k + 1:])
+                 for k, b in enumerate(rest) if frozenset((a, b)) not in played]
+        return min(costs, default=float("inf"))
+    return best([player_id for player_id, _ in ranked])
+
+
+def randomRound(rng, players):
+    ranked = sorted(((p, 3 * rng.randint(0, 3)) for p in range(players)), key=lambda r: -r[1])
+    ids = [p for p, _ in ranked]
+    played = {frozenset(rng.sample(ids, 2)) for _ in range(players)}
+    return ranked, played
+
+
+def test_pairing_minimises_score_gaps():
+    rng = random.Random(7)
+    for _ in range(200):
+        ranked, played = randomRound(rng, rng.choice([4, 6, 8, 10]))
+        expected = bestGapCost(ranked, played)
+        if expected == float("inf"):
+            continue
+        pairs, bye = pairRound(ranked, played, candidates=len(ranked) - 1)
+        assert bye is None
+        assert not any(frozenset(pair) in played for pair in pairs)
+        assert gapCost(ranked, pairs) == expected
+
+
+def test_leaders_who_met_each_other_float_down():
+    # Los 10 primeros ya se enfrentaron todos entre sí
+    ranked = [(p, 30 if p < 10 else 0) for p in range(200)]
+    played = {frozenset((a, b)) for a in range(10) for b in range(a + 1, 10)}
+    pairs, bye = pairRound(ranked, played)
+    assert bye is None and len(pairs) == 100
+    assert not any(frozenset(pair) in played for pair in pairs)
+    assert sorted(p for pair in pairs for p in pair) == list(range(200))
+
+
+def test_bye_goes_to_lowest_without_one():
+    ranked = [(p, 9 - p) for p in range(5)]
+    pairs, bye = pairRound(ranked, set(), hadBye={4})
+    assert bye == 3
+    assert sorted(p for pair in pairs for p in pair) == [0, 1, 2, 4]
+
+
+def test_no_pairing_without_rematches():
+    ranked = [(p, 0) for p in range(4)]
+    played = {frozenset((0, 1)), frozenset((0, 2)), frozenset((0, 3))}
+    with pytest.raises(ValueError):
+        pairRound(ranked, played)
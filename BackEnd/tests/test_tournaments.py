@@ -0,0 +1,21 @@
+"""Tournament lifecycle: finishing a tournament and the ETags it invalidates."""
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_finish_invalidates_podium_players_other_tournaments(client, newTournament):
+    tournament_id = await newTournament("roundRobin", 2)
+    other = (await client.post("/tournament", json={"name": "Other", "type": "roundRobin"})).json()["id"]
+    for player_id in (1, 2):
+        await client.post(f"/tournament/{other}/player/{player_id}")
+    etag = (await client.get(f"/tournament/{other}")).headers["etag"]
+
+    match = (await client.get(f"/tournament/{tournament_id}")).json()["matches"][0]
+    await client.post(f"/match/{match['id']}/{match['player1_id']}/false")
+    assert (await client.post(f"/tournament/{tournament_id}/finish")).status_code == 200
+
+    # El podio suma personalScore, que el otro torneo también muestra
+    response = await client.get(f"/tournament/{other}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert {p["personalScore"] for p in response.json()["players"]} != {0}
@@ -0,0 +1,70 @@
+"""Tournament version counter and the ETags derived from it.
+
+Every write that changes what the tournament endpoints return bumps
+Tournament.version in the same transaction, so a GET can answer
+If-None-Match with 304 after a single primary-key lookup. The same calls
+mark the cached responses built from those rows for invalidation.
+"""
+from typing import Iterable, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import cache
+from models import Tournament, tournamentsPlayers
+
+
+async def bumpVersion(db: AsyncSession, *tournament_ids: int) -> None:
+    """Increment the version of the given tournaments (one UPDATE)"""
+    ids = set(tournament_ids)
+    if ids:
+        cache.touch(db, *(f"tournament:{tid}" for tid in ids))
+        await db.execute(
+            update(Tournament).where(Tournament.id.in_(ids))
+            .values(version=Tournament.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+
+async def bumpPlayerTournaments(db: AsyncSession, *player_ids: int) -> None:
+    """Increment the version of every tournament the players are registered in (one UPDATE)"""
+    cache.touch(db, *(f"player:{pid}" for pid in player_ids))
+    await db.execute(
+        update(Tournament)
+        .where(Tournament.id.in_(
+            select(tournamentsPlayers.c.tournament_id).where(tournamentsPlayers.c.player_id.in_(player_ids))
+        ))
+        .values(version=Tournament.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def tournamentVersion(db: AsyncSession, tournament_id: int) -> Optional[int]:
+    return await db.scalar(select(Tournament.version).where(Tournament.id == tournament_id))
+
+
+def makeETag(tournament_id: int, version: int) -> str:
+    return f'W/"t{tournament_id}-v{version}"'
+
+
+def _matches(ifNoneMatch: Optional[str], etag: str) -> bool:
+    if not ifNoneMatch:
+        return False
+    tags: Iterable[str] = (t.strip() for t in ifNoneMatch.split(","))
+    # Comparación débil: se ignora el prefijo W/
+    return any(t == "*" or _opaque(t) == _opaque(etag) for t in tags)
+
+
+def _opaque(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def notModified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """Set the ETag on the response; return a 304 response when the client already has it"""
+    # no-cache: el navegador puede guardar la respuesta pero debe revalidarla
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    response.headers.update(headers)
+    if _matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return None
@@ -0,0 +1,23 @@
+import axios from "axios";
+
+// Filas por petición al recorrer un listado completo (máximo del backend: 1000)
+const PAGE_SIZE = 500;
+
+/**
+ * Fetch every row of a paginated list endpoint (GET /player, /tournament,
+ * /matches, /scores). The backend returns one page at a time and sends the
+ * cursor of the next page in the X-Next-Cursor header, absent on the last one.
+ */
+export async function fetchAllPages<T>(url: string): Promise<T[]> {
+  const rows: T[] = [];
+  let cursor: string | undefined;
+  do {
+    const res = await axios.get<T[]>(url, {
+      params: { limit: PAGE_SIZE, ...(cursor !== undefined ? { cursor } : {}) },
+    });
+    rows.push(...res.data);
+    const next = res.headers["x-next-cursor"];
+    cursor = typeof next === "string" && next !== "" ? next : undefined;
+  } while (cursor !== undefined);
+  return rows;
+}
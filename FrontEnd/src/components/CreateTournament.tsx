@@ -10,6 +10,7 @@ function CrearTorneo(props: CrearTorneoProps) {
   const [showModal, setShowModal] = useState(false);
   const [formData, setFormData] = useState("");
   const [selectedOption, setSelectedOption] = useState("elimination");
+  const [seeding, setSeeding] = useState("random");
 
   const handleInputChange = (e: ChangeEvent<HTMLInputElement>) => {
     setFormData(e.target.value);
@@ -19,16 +20,22 @@ function CrearTorneo(props: CrearTorneoProps) {
     setSelectedOption(e.target.value);
   };
 
+  const handleSeedingChange = (e: ChangeEvent<HTMLSelectElement>) => {
+    setSeeding(e.target.value);
+  };
+
   const handleSubmit = async (e: FormEvent) => {
     e.preventDefault();
     const res = await axios.post(`${import.meta.env.VITE_BACKEND_SERVER}/tournament`, {
       name: formData,
       type: selectedOption,
+      seeding: seeding,
     });
 
     console.log(res);
     setFormData("");
     setSelectedOption("elimination");
+    setSeeding("random");
     setShowModal(false);
     onSuccess();
   };
@@ -75,6 +82,18 @@ function CrearTorneo(props: CrearTorneoProps) {
                 >
                   <option value="elimination">Eliminatorias</option>
                   <option value="roundRobin">Round Robin</option>
+                  <option value="swiss">Suizo</option>
+                </select>
+              </div>
+              <div className="modal-body">
+                <select
+                  className="form-select"
+                  aria-label="Seleccionar siembra"
+                  value={seeding}
+                  onChange={handleSeedingChange}
+                >
+                  <option value="random">Siembra aleatoria</option>
+                  <option value="rating">Siembra por puntuación</option>
                 </select>
               </div>
 
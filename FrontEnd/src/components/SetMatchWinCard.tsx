@@ -1,4 +1,4 @@
-import { useState, ChangeEvent, FormEvent } from "react";
+import { useState, useRef, ChangeEvent, FormEvent } from "react";
 import axios from "axios";
 
 interface SetMatchWinCardProps {
@@ -24,6 +24,8 @@ function SetMatchWinCard({
   const [selectedDraw, setSelectedDraw] = useState("");
   const [isLoading, setIsLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
+  // Same key for every retry of one result, so a resend never counts twice
+  const idempotencyKey = useRef<string | null>(null);
 
   const handleSelectPlayerChange = (e: ChangeEvent<HTMLSelectElement>) => {
     setSelectedPlayer(e.target.value);
@@ -56,8 +58,14 @@ function SetMatchWinCard({
       setIsLoading(true);
       setError(null);
 
+      const result = `${selectedPlayer}/${selectedDraw}`;
+      if (!idempotencyKey.current?.startsWith(result + ":")) {
+        idempotencyKey.current = `${result}:${crypto.randomUUID()}`;
+      }
       const res = await axios.post(
-        `${import.meta.env.VITE_BACKEND_SERVER}/match/${matchId}/${selectedPlayer}/${selectedDraw}`
+        `${import.meta.env.VITE_BACKEND_SERVER}/match/${matchId}/${result}`,
+        null,
+        { headers: { "Idempotency-Key": idempotencyKey.current } }
       );
 
       if (res.status === 200) {
@@ -66,8 +74,15 @@ function SetMatchWinCard({
         // Reset form
         setSelectedPlayer("");
         setSelectedDraw("");
+        idempotencyKey.current = null;
       }
     } catch (err) {
+      if (axios.isAxiosError(err) && err.response?.status === 409) {
+        // Result already recorded (by someone else): reload the match
+        setError("El resultado de esta partida ya fue registrado.");
+        onSuccess(matchId);
+        return;
+      }
       setError("Error al guardar el resultado. Por favor intenta de nuevo.");
       console.error("Error setting match winner:", err);
     } finally {
@@ -80,6 +95,7 @@ function SetMatchWinCard({
     setError(null);
     setSelectedPlayer("");
     setSelectedDraw("");
+    idempotencyKey.current = null;
   };
 
   return (
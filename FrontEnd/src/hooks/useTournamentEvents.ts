@@ -0,0 +1,80 @@
+import { useEffect, useRef } from "react";
+
+// Eventos que publica GET /tournament/{id}/events
+export interface MatchDiff {
+  id: number;
+  phase: number;
+  status: boolean;
+  win: number | null;
+  draw: boolean;
+}
+
+// Asientos del cuadro de eliminación ocupados por los ganadores
+export interface SeatDiff {
+  id: number;
+  player1_id: number | null;
+  player2_id: number | null;
+}
+
+export interface StandingRow {
+  player_id: number;
+  score: number;
+  wins: number;
+  draws: number;
+  losses: number;
+  buchholz: number;
+  position: number | null;
+}
+
+export interface PhaseMatch extends MatchDiff, SeatDiff {}
+
+export interface TournamentEventHandlers {
+  onResults?: (matches: Array<MatchDiff | SeatDiff>) => void;
+  onStandings?: (scores: StandingRow[]) => void;
+  onPhase?: (phase: number, matches: PhaseMatch[]) => void;
+  // Cambios grandes (partidas generadas, torneo finalizado) o reconexión:
+  // lo más simple es volver a pedir el torneo
+  onReload?: () => void;
+}
+
+/**
+ * Subscribe to the live updates of a tournament instead of polling it.
+ * The handlers can change between renders without reopening the stream.
+ */
+function useTournamentEvents(
+  tournamentId: number | string | undefined,
+  handlers: TournamentEventHandlers
+) {
+  const handlersRef = useRef(handlers);
+  handlersRef.current = handlers;
+
+  useEffect(() => {
+    if (!tournamentId) return;
+    const source = new EventSource(
+      `${import.meta.env.VITE_BACKEND_SERVER}/tournament/${tournamentId}/events`
+    );
+    let opened = false;
+
+    source.onopen = () => {
+      // Tras una reconexión se pudieron perder eventos
+      if (opened) handlersRef.current.onReload?.();
+      opened = true;
+    };
+    source.addEventListener("results", (e) =>
+      handlersRef.current.onResults?.(JSON.parse((e as MessageEvent).data).matches)
+    );
+    source.addEventListener("standings", (e) =>
+      handlersRef.current.onStandings?.(JSON.parse((e as MessageEvent).data).scores)
+    );
+    source.addEventListener("phase", (e) => {
+      const data = JSON.parse((e as MessageEvent).data);
+      handlersRef.current.onPhase?.(data.phase, data.matches);
+    });
+    source.addEventListener("generated", () => handlersRef.current.onReload?.());
+    source.addEventListener("finished", () => handlersRef.current.onReload?.());
+
+    return () => source.close();
+  }, [tournamentId]);
+}
+
+export default useTournamentEvents;
@@ -1,5 +1,6 @@
 import { useEffect, useState } from "react";
 import axios from "axios";
+import { fetchAllPages } from "../api/fetchAllPages";
 import { Link } from "react-router-dom";
 
 interface Player {
@@ -26,12 +27,13 @@ function HomePage() {
       try {
         setIsLoading(true);
         const [playersRes, tournamentsRes] = await Promise.all([
-          axios.get(`${import.meta.env.VITE_BACKEND_SERVER}/player`),
-          axios.get(`${import.meta.env.VITE_BACKEND_SERVER}/tournament`),
+          fetchAllPages<Player>(`${import.meta.env.VITE_BACKEND_SERVER}/player`),
+          // Solo se muestran los tres primeros torneos
+          axios.get(`${import.meta.env.VITE_BACKEND_SERVER}/tournament`, { params: { limit: 3 } }),
         ]);
 
         setTopPlayers(
-          playersRes.data
+          playersRes
             .sort((a: Player, b: Player) => b.personalScore - a.personalScore)
             .slice(0, 5)
         );
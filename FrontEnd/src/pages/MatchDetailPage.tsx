@@ -1,12 +1,13 @@
 import { useParams } from "react-router-dom";
 import { useState, useEffect } from "react";
 import SetMatchWinCard from "../components/SetMatchWinCard";
+import useTournamentEvents from "../hooks/useTournamentEvents";
 import axios from "axios";
 
 type Match = {
   id: number;
   tournament_id: number;
-  player1_id: number;
+  player1_id: number | null;
   player2_id: number | null;
   win: number | null;
   status: boolean;
@@ -59,15 +60,17 @@ function MatchDetail() {
   };
 
   const fetchPlayerNames = async (
-    player1Id: number,
+    player1Id: number | null,
     player2Id: number | null
   ) => {
     try {
-      const player1Res = await axios.get<Player>(
-        `${import.meta.env.VITE_BACKEND_SERVER}/player/${player1Id}`
-      );
-      if (player1Res.data) {
-        setPlayer1Name(player1Res.data.name); // Updated from nombre to name
+      if (player1Id) {
+        const player1Res = await axios.get<Player>(
+          `${import.meta.env.VITE_BACKEND_SERVER}/player/${player1Id}`
+        );
+        if (player1Res.data) {
+          setPlayer1Name(player1Res.data.name); // Updated from nombre to name
+        }
       }
 
       if (player2Id) {
@@ -84,6 +87,17 @@ function MatchDetail() {
     }
   };
 
+  // El resultado puede registrarse desde otra pantalla
+  useTournamentEvents(match?.tournament_id, {
+    onResults: (diffs) => {
+      const diff = diffs.find((d) => d.id === match?.id);
+      if (!diff || !match) return;
+      // Un ganador del cuadro ocupa su asiento: hay que cargar su nombre
+      if ("player1_id" in diff) fetchMatch(match.id);
+      else setMatch((prev) => prev && { ...prev, ...diff });
+    },
+  });
+
   useEffect(() => {
     const matchId = parseInt(id || "0", 10);
     if (matchId > 0) {
@@ -157,7 +171,7 @@ function MatchDetail() {
                   </h4>
                   <div className="list-group">
                     <div className="list-group-item">
-                      <strong>Jugador 1:</strong> {player1Name}
+                      <strong>Jugador 1:</strong> {player1Name || "Por definir"}
                     </div>
                     <div className="list-group-item">
                       <strong>Jugador 2:</strong> {player2Name || "No asignado"}
@@ -193,7 +207,7 @@ function MatchDetail() {
                     )}
                   </div>
                   <div className="d-flex gap-2 mt-3">
-                    {!match.status && (
+                    {!match.status && match.player1_id && match.player2_id && (
                       <SetMatchWinCard
                         matchId={match.id}
                         player1Name={player1Name}
@@ -15,12 +15,25 @@ interface Player {
   name: string;
   creationDate: string;
   personalScore: number;
+  rating: number;
   tournament: Tournament[];
 }
 
+interface PlayerStats {
+  matches_played: number;
+  wins: number;
+  draws: number;
+  losses: number;
+  tournaments_played: number;
+  first_places: number;
+  second_places: number;
+  third_places: number;
+}
+
 function PlayerDetailPage() {
   const { id } = useParams();
   const [player, setPlayer] = useState<Player | null>(null);
+  const [stats, setStats] = useState<PlayerStats | null>(null);
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
 
@@ -28,10 +41,12 @@ function PlayerDetailPage() {
     const fetchPlayer = async () => {
       try {
         setIsLoading(true);
-        const response = await axios.get(
-          `${import.meta.env.VITE_BACKEND_SERVER}/player/${id}`
-        );
+        const [response, statsResponse] = await Promise.all([
+          axios.get(`${import.meta.env.VITE_BACKEND_SERVER}/player/${id}`),
+          axios.get(`${import.meta.env.VITE_BACKEND_SERVER}/player/${id}/stats`),
+        ]);
         setPlayer(response.data);
+        setStats(statsResponse.data);
         console.log("Player data:", response.data);
       } catch (error) {
         setError("Error al cargar el jugador");
@@ -87,6 +102,10 @@ function PlayerDetailPage() {
                     <h3 className="h5 mb-1">{player.personalScore}</h3>
                     <small className="text-muted">Puntos Totales</small>
                   </div>
+                  <div className="col">
+                    <h3 className="h5 mb-1">{Math.round(player.rating)}</h3>
+                    <small className="text-muted">Rating</small>
+                  </div>
                   <div className="col">
                     <h3 className="h5 mb-1">
                       {player.tournament?.length || 0}
@@ -95,6 +114,30 @@ function PlayerDetailPage() {
                   </div>
                 </div>
               </div>
+
+              {stats && (
+                <div className="border-top pt-3 mt-3">
+                  <div className="row text-center">
+                    <div className="col">
+                      <h3 className="h5 mb-1">
+                        {stats.wins}/{stats.draws}/{stats.losses}
+                      </h3>
+                      <small className="text-muted">V/E/D</small>
+                    </div>
+                    <div className="col">
+                      <h3 className="h5 mb-1">{stats.tournaments_played}</h3>
+                      <small className="text-muted">Finalizados</small>
+                    </div>
+                    <div className="col">
+                      <h3 className="h5 mb-1">
+                        {stats.first_places}/{stats.second_places}/
+                        {stats.third_places}
+                      </h3>
+                      <small className="text-muted">1º/2º/3º</small>
+                    </div>
+                  </div>
+                </div>
+              )}
             </div>
           </div>
         </div>
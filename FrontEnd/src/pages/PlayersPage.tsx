@@ -1,5 +1,5 @@
 import { useEffect, useState } from "react";
-import axios from "axios";
+import { fetchAllPages } from "../api/fetchAllPages";
 import CrearJugador from "../components/CreatePlayer";
 import DeletPlayer from "../components/DeletPlayer";
 import PlayerCard from "../components/PlayerCard";
@@ -31,8 +31,7 @@ function PlayersPage() {
       setIsLoading(true);
       setError(null);
       console.log(`${import.meta.env.VITE_BACKEND_SERVER}/player`)
-      const res = await axios.get(`${import.meta.env.VITE_BACKEND_SERVER}/player`);
-      setPlayers(res.data);
+      setPlayers(await fetchAllPages<Player>(`${import.meta.env.VITE_BACKEND_SERVER}/player`));
     } catch (error) {
       setError("Error al cargar los jugadores. Por favor, intente de nuevo.");
       console.error("Error fetching players:", error);
@@ -1,5 +1,5 @@
 import { useEffect, useState } from "react";
-import axios from "axios";
+import { fetchAllPages } from "../api/fetchAllPages";
 import TournamentCard from "../components/TournamentCard";
 import CrearTorneo from "../components/CreateTournament";
 
@@ -51,10 +51,9 @@ function TournamentPage() {
     setIsLoading(true);
     setError(null);
     try {
-      const res = await axios.get<Tournament[]>(
-          `${import.meta.env.VITE_BACKEND_SERVER}/tournament`
+      setTournaments(
+        await fetchAllPages<Tournament>(`${import.meta.env.VITE_BACKEND_SERVER}/tournament`)
       );
-      setTournaments(res.data);
     } catch (error) {
       setError("Error al cargar los torneos");
       console.error("Error fetching tournaments:", error);
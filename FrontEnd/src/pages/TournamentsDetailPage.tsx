@@ -6,6 +6,7 @@ import { Link } from "react-router-dom";
 import DeletCard from "../components/DeletCard";
 import AddPlayerTournament from "../components/AddPlayerTournament";
 import GenerateMatchButon from "../components/GenerateMatchButon";
+import useTournamentEvents from "../hooks/useTournamentEvents";
 
 interface Player {
   id: number;
@@ -15,8 +16,8 @@ interface Player {
 
 interface Match {
   id: number;
-  player1_id: number;
-  player2_id: number;
+  player1_id: number | null;
+  player2_id: number | null;
   status: boolean;
   draw: boolean;
   win: number | null;
@@ -95,6 +96,47 @@ function TournamentsDetailPage() {
     fetchTournament();
   }, [id]);
 
+  // Actualizaciones en vivo: se aplican los cambios sin recargar el torneo
+  useTournamentEvents(id, {
+    onResults: (diffs) =>
+      setTournament((prev) =>
+        prev && {
+          ...prev,
+          matches: prev.matches.map((match) => {
+            const diff = diffs.find((d) => d.id === match.id);
+            return diff ? { ...match, ...diff } : match;
+          }),
+        }
+      ),
+    onStandings: (rows) =>
+      setTournament((prev) =>
+        prev && {
+          ...prev,
+          scores: prev.scores.map((score) => {
+            const row = rows.find((r) => r.player_id === score.player_id);
+            return row ? { ...score, score: row.score } : score;
+          }),
+        }
+      ),
+    onPhase: (phase, matches) =>
+      setTournament((prev) =>
+        prev && {
+          ...prev,
+          currentPhase: phase,
+          // Con el cuadro precalculado las partidas de la fase ya existen
+          matches: [
+            ...prev.matches.map(
+              (match) => matches.find((m) => m.id === match.id) ?? match
+            ),
+            ...matches.filter(
+              (m) => !prev.matches.some((match) => match.id === m.id)
+            ),
+          ],
+        }
+      ),
+    onReload: fetchTournament,
+  });
+
   useEffect(() => {
     if (tournament) {
       const currentPhaseMatches = tournament.matches.filter(
@@ -127,7 +169,8 @@ function TournamentsDetailPage() {
     );
   }
 
-  const getPlayerName = (playerId: number) => {
+  const getPlayerName = (playerId: number | null) => {
+    if (playerId === null) return "Por definir";
     const player = tournament.players.find((p) => p.id === playerId);
     return player?.name || "Jugador desconocido";
   };
@@ -315,7 +358,9 @@ function TournamentsDetailPage() {
                                         : "text-light"
                                     }`}
                                   >
-                                    {getPlayerName(match.player2_id)}
+                                    {match.player2_id === null && match.status
+                                      ? "Pase libre"
+                                      : getPlayerName(match.player2_id)}
                                   </span>
                                 </div>
                               </div>
@@ -389,7 +434,7 @@ function TournamentsDetailPage() {
                   hasMatches={tournament.matches.length > 0} // Add this prop
                 />
                 <div className="d-flex gap-2">
-                  {type === "elimination" && !Status && (
+                  {(type === "elimination" || type === "swiss") && !Status && (
                     <button
                       className="btn btn-info text-white"
                       disabled={!isCurrentPhaseCompleted}